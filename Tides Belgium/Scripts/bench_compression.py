@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+bench_compression.py
+
+Compare the compressed output variants (see tide_compress.py) on real
+station-years: compressed size against the time a cold start spends
+turning the compressed bytes back into columns.
+
+Formats:
+  json-ENCODING  every JSON encoding in tide_encodings.py, decoded to t/h/k columns
+  tide           the columnar binary of tide_binary.py, decoded to arrays
+  days           the day index of tide_days.py, decoded to record tuples (needs numpy)
+
+Each format is compressed with every codec at a few levels. load ms is
+decompress plus decode, the part of a cold start that depends on the
+choice; rows marked * are on the size/load-time Pareto front of their
+format, i.e. nothing else is both smaller and faster to load.
+
+Usage:
+  python3 bench_compression.py                        # all ../Data/*/*.json
+  python3 bench_compression.py ../Data/2025/oostende_2025.json --repeat 50 --formats json-pretty tide
+"""
+
+import argparse
+import bz2
+import glob
+import gzip
+import lzma
+import time
+
+import tide_compress
+import tide_encodings
+from bench_encodings import best_time
+from tide_binary import decode_columns_binary, encode_columns, encode_columns_binary
+
+LEVELS = {
+    'gzip': (1, 6, 9),
+    'bz2': (1, 9),
+    'lzma': (0, 6, 9),
+}
+
+COMPRESSORS = {
+    'gzip': lambda data, level: gzip.compress(data, level, mtime=0),
+    'bz2': lambda data, level: bz2.compress(data, level),
+    'lzma': lambda data, level: lzma.compress(data, preset=level),
+}
+
+
+def _days_format():
+    import tide_days
+    return {
+        'encode': lambda tides, year: tide_days.encode_days(tides, year),
+        'decode': lambda data: list(tide_days.RECORD.iter_unpack(data[tide_days.HEADER.size:])),
+    }
+
+
+def formats():
+    """Return {name: {encode(tides, year) -> bytes, decode(bytes)}}"""
+    result = {f'json-{name}': {'encode': lambda tides, year, name=name: tide_encodings.encode(tides, name).encode(),
+                               'decode': tide_encodings.decode_columns}
+              for name in tide_encodings.ENCODINGS}
+    result['tide'] = {'encode': lambda tides, year: encode_columns_binary(*encode_columns(tides), year),
+                      'decode': decode_columns_binary}
+    result['days'] = _days_format()
+    return result
+
+
+def benchmark(paths, names, repeat):
+    """Return {(format, codec, level): totals} summed over all station-year files"""
+    available = formats()
+    results = {}
+    for path in paths:
+        tides = tide_encodings.load(path)
+        year = int(tides[len(tides) // 2]['date'][:4])
+        for name in names:
+            fmt = available[name]
+            plain = fmt['encode'](tides, year)
+            decode_ms = best_time(lambda: fmt['decode'](plain), repeat)
+            variants = [('none', 0, plain)] + [(codec, level, None) for codec in LEVELS for level in LEVELS[codec]]
+
+            for codec, level, data in variants:
+                compress_ms = 0.0
+                if data is None:
+                    start = time.perf_counter()
+                    data = COMPRESSORS[codec](plain, level)
+                    compress_ms = (time.perf_counter() - start) * 1000
+                    if tide_compress.decompress(data) != plain:
+                        raise SystemExit(f"{codec} -{level} does not round-trip {name} of {path}")
+                    decompress_ms = best_time(lambda: tide_compress.decompress(data), repeat)
+                    load_ms = best_time(lambda: fmt['decode'](tide_compress.decompress(data)), repeat)
+                else:
+                    decompress_ms, load_ms = 0.0, decode_ms
+
+                totals = results.setdefault((name, codec, level), {
+                    'plain': 0, 'bytes': 0, 'compress_ms': 0.0, 'decompress_ms': 0.0, 'load_ms': 0.0})
+                totals['plain'] += len(plain)
+                totals['bytes'] += len(data)
+                totals['compress_ms'] += compress_ms
+                totals['decompress_ms'] += decompress_ms
+                totals['load_ms'] += load_ms
+    return results
+
+
+def pareto(results):
+    """Return the keys not beaten on both size and load time by another variant of the same format"""
+    front = set()
+    for key, totals in results.items():
+        if not any(other[0] == key[0] and other != key
+                   and results[other]['bytes'] <= totals['bytes'] and results[other]['load_ms'] <= totals['load_ms']
+                   and (results[other]['bytes'], results[other]['load_ms']) != (totals['bytes'], totals['load_ms'])
+                   for other in results):
+            front.add(key)
+    return front
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compressed tide output variants")
+    parser.add_argument("paths", nargs='*', help="Station-year JSON files (default: ../Data/*/*.json)")
+    parser.add_argument("--formats", nargs='+', help="Formats to compare (default: all)")
+    parser.add_argument("--repeat", type=int, default=10, help="Timing repetitions per file (best is kept)")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob('../Data/*/*.json'))
+    if not paths:
+        raise SystemExit("No station-year JSON files found")
+    names = args.formats or list(formats())
+    unknown = set(names) - set(formats())
+    if unknown:
+        raise SystemExit(f"Unknown formats: {', '.join(sorted(unknown))}; choose from {', '.join(formats())}")
+
+    results = benchmark(paths, names, args.repeat)
+    front = pareto(results)
+
+    print(f"🗜️  COMPRESSION BENCHMARK ({len(paths)} files, best of {args.repeat})")
+    print("=" * 82)
+    print(f"  {'format':<15}{'codec':<6}{'level':>6}{'bytes':>10}{'ratio':>8}"
+          f"{'compress ms':>13}{'decomp ms':>11}{'load ms':>10}")
+    for (name, codec, level), totals in results.items():
+        mark = '*' if (name, codec, level) in front else ' '
+        print(f"{mark} {name:<15}{codec:<6}{level if codec != 'none' else '':>6}{totals['bytes']:>10}"
+              f"{totals['bytes'] / totals['plain']:>8.3f}{totals['compress_ms']:>13.1f}"
+              f"{totals['decompress_ms']:>11.2f}{totals['load_ms']:>10.2f}")
+    print()
+    print("ratio: compressed / uncompressed size; load ms: decompress + decode to columns, summed over the files")
+    print("*: Pareto front per format (no other variant is both smaller and faster to load)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+bench_encodings.py
+
+Compare the tide output encodings in tide_encodings.py on real station-years:
+on-disk size, gzip size and Python decode time, relative to the current
+pretty-printed format.
+
+Usage:
+  python3 bench_encodings.py                       # all ../Data/*/*.json
+  python3 bench_encodings.py ../Data/2025/oostende_2025.json --repeat 50
+"""
+
+import argparse
+import glob
+import gzip
+import time
+
+import tide_encodings
+
+
+def best_time(func, repeat):
+    """Best wall time of repeat calls, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark(paths, repeat):
+    """Return {encoding: totals} summed over all station-year files"""
+    results = {name: {'bytes': 0, 'gzip': 0, 'parse_ms': 0.0, 'columns_ms': 0.0, 'entries_ms': 0.0}
+               for name in tide_encodings.ENCODINGS}
+
+    for path in paths:
+        tides = tide_encodings.load(path)
+        for name in tide_encodings.ENCODINGS:
+            data = tide_encodings.encode(tides, name).encode()
+            if tide_encodings.decode(data) != tides:
+                raise SystemExit(f"{name} does not round-trip {path}")
+
+            totals = results[name]
+            totals['bytes'] += len(data)
+            totals['gzip'] += len(gzip.compress(data, 9))
+            totals['parse_ms'] += best_time(lambda: tide_encodings.parse(data), repeat)
+            totals['columns_ms'] += best_time(lambda: tide_encodings.decode_columns(data), repeat)
+            totals['entries_ms'] += best_time(lambda: tide_encodings.decode(data), repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tide output encodings")
+    parser.add_argument("paths", nargs='*', help="Station-year JSON files (default: ../Data/*/*.json)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions per file (best is kept)")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob('../Data/*/*.json'))
+    if not paths:
+        raise SystemExit("No station-year JSON files found")
+
+    results = benchmark(paths, args.repeat)
+    baseline = results['pretty']
+
+    print(f"📊 ENCODING BENCHMARK ({len(paths)} files, best of {args.repeat})")
+    print("=" * 78)
+    print(f"{'encoding':<10}{'bytes':>10}{'ratio':>8}{'gzip':>9}{'ratio':>8}"
+          f"{'json ms':>10}{'cols ms':>10}{'entries ms':>12}")
+    for name, totals in results.items():
+        print(f"{name:<10}{totals['bytes']:>10}{totals['bytes'] / baseline['bytes']:>8.2f}"
+              f"{totals['gzip']:>9}{totals['gzip'] / baseline['gzip']:>8.2f}"
+              f"{totals['parse_ms']:>10.2f}{totals['columns_ms']:>10.2f}{totals['entries_ms']:>12.2f}")
+    print()
+    print("json ms: JSON parsing only; cols ms: to parallel t/h/k lists; entries ms: to {date, time, height, type}")
+
+
+if __name__ == "__main__":
+    main()
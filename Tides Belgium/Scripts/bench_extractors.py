@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+bench_extractors.py
+
+Benchmark the tide extractors on synthetic workbooks (see synthetic_workbooks.py)
+so we can see how they scale with stations and years.
+
+Extractors:
+  year_data_fast       extract_year_data.extract_station_data, zip/XML reader
+  year_data_grid       extract_year_data.extract_station_data, cached cell-grid snapshot, built on first use
+  year_data_stream     extract_year_data.extract_station_data, openpyxl read-only stream
+  year_data_cell       extract_year_data.extract_station_data, openpyxl cell-by-cell
+  full_year            extract_2025_complete.extract_station_full_year
+  excel_to_json        excel_to_json.excel_to_json, column-wise (needs pandas, tabular input)
+  excel_to_json_rows   excel_to_json.excel_to_json, original iterrows() loop
+
+For each extractor it reports wall time, rows/sec (sheet data rows scanned),
+events/sec and the tracemalloc peak while extracting a single unit.
+
+Usage:
+  python3 bench_extractors.py --stations 4 --years 1
+  python3 bench_extractors.py --stations 50 --years 10 --extractors year_data_fast full_year
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+import synthetic_workbooks
+
+ROWS_PER_WORKBOOK = len(synthetic_workbooks.SHEETS) * synthetic_workbooks.DATA_ROWS_PER_SHEET
+
+
+def _year_data(mode, reader):
+    def run(station_name, year, path, out_dir):
+        import extract_year_data
+        return len(extract_year_data.extract_station_data(station_name, year, mode=mode, reader=reader,
+                                                          excel_path=path))
+    return run
+
+
+def _full_year(station_name, year, path, out_dir):
+    import extract_2025_complete
+    return len(extract_2025_complete.extract_station_full_year(path, station_name, year))
+
+
+def _excel_to_json(method):
+    def run(station_name, year, path, out_dir):
+        import json
+        import excel_to_json
+        out_path = excel_to_json.excel_to_json(path, station_name, year, out_dir, method=method)
+        with open(out_path) as f:
+            return len(json.load(f))
+    return run
+
+
+# name -> (runner, needs tabular input, required module)
+EXTRACTORS = {
+    'year_data_fast': (_year_data('stream', 'fast'), False, None),
+    'year_data_grid': (_year_data('stream', 'grid'), False, None),
+    'year_data_stream': (_year_data('stream', 'openpyxl'), False, None),
+    'year_data_cell': (_year_data('cell', 'openpyxl'), False, None),
+    'full_year': (_full_year, False, None),
+    'excel_to_json': (_excel_to_json('vectorized'), True, 'pandas'),
+    'excel_to_json_rows': (_excel_to_json('rows'), True, 'pandas'),
+}
+
+
+def run_extractor(runner, units, out_dir, trace_memory):
+    """Run one extractor over all units, returning (seconds, events, peak bytes)"""
+    events = 0
+    peak = 0
+    start = time.perf_counter()
+    for station_name, year, path in units:
+        if trace_memory:
+            tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            events += runner(station_name, year, path, out_dir)
+        if trace_memory:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return time.perf_counter() - start, events, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tide extractors on synthetic workbooks")
+    parser.add_argument("--stations", type=int, default=4, help="Number of synthetic stations")
+    parser.add_argument("--years", type=int, default=1, help="Number of synthetic years")
+    parser.add_argument("--start-year", type=int, default=2025, help="First synthetic year")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), 'tide_bench'),
+                        help="Where synthetic workbooks are generated and reused")
+    parser.add_argument("--extractors", nargs='+', choices=list(EXTRACTORS), default=list(EXTRACTORS),
+                        help="Extractors to benchmark (default: all)")
+    args = parser.parse_args()
+
+    print(f"📊 EXTRACTOR BENCHMARK: {args.stations} stations x {args.years} years")
+    print("=" * 86)
+    print(f"⚙️  Generating workbooks in {args.workdir} (reused on later runs)...")
+    layouts = {
+        False: synthetic_workbooks.generate_set(args.workdir, args.stations, args.years, args.start_year),
+        True: synthetic_workbooks.generate_set(args.workdir, args.stations, args.years, args.start_year,
+                                               tabular=True),
+    }
+    print()
+    print(f"{'extractor':<18}{'units':>6}{'rows':>9}{'events':>9}{'wall s':>9}"
+          f"{'rows/s':>10}{'events/s':>11}{'peak MB':>10}")
+
+    out_dir = os.path.join(args.workdir, 'json')
+    for name in args.extractors:
+        runner, tabular, requirement = EXTRACTORS[name]
+        if requirement:
+            try:
+                __import__(requirement)
+            except ImportError:
+                print(f"{name:<18}  skipped: {requirement} is not installed")
+                continue
+
+        units = layouts[tabular]
+        wall, events, _ = run_extractor(runner, units, out_dir, trace_memory=False)
+        _, _, peak = run_extractor(runner, units[:1], out_dir, trace_memory=True)
+        rows = events if tabular else len(units) * ROWS_PER_WORKBOOK
+        print(f"{name:<18}{len(units):>6}{rows:>9}{events:>9}{wall:>9.2f}"
+              f"{rows / wall:>10.0f}{events / wall:>11.0f}{peak / 1e6:>10.2f}")
+
+    print()
+    print("rows: sheet data rows scanned (table rows for excel_to_json); peak MB: tracemalloc peak for one unit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+build_cache.py
+
+Incremental rebuild manifest for the tide extractors.
+
+The manifest (../Data/build_manifest.json) records, per station-year unit:
+the content hash of the source workbook, the extractor version and the hash of
+every output file that was written (JSON plus any optional formats). A unit can
+be skipped when all of them still match what is on disk.
+"""
+
+import ast
+import hashlib
+import json
+import os
+
+MANIFEST_PATH = '../Data/build_manifest.json'
+MANIFEST_VERSION = 2
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Return the hex SHA-256 of a file, or None if it does not exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def local_imports(entry_path):
+    """Return the entry script plus every module next to it that it imports, directly or indirectly
+
+    Imports are read from the source, including those inside functions, so
+    lazily imported output modules count too.
+    """
+    script_dir = os.path.dirname(os.path.abspath(entry_path))
+    found = set()
+    pending = [os.path.abspath(entry_path)]
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module_path = os.path.join(script_dir, name.split('.')[0] + '.py')
+                if os.path.exists(module_path):
+                    pending.append(module_path)
+    return sorted(found)
+
+
+def extractor_version(source_paths, settings=None):
+    """Hash the extractor source files and output-affecting settings
+
+    Any code change, or a setting that changes the output content (such as
+    the JSON encoding), invalidates the cache.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(source_paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    if settings:
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def unit_key(station_name, year):
+    return f'{year}/{station_name}'
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the build manifest, returning an empty one if missing or outdated"""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'version': MANIFEST_VERSION, 'units': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'units': {}}
+    return manifest
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Write the manifest via a temp file so an interrupted run keeps the old one"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_up_to_date(manifest, key, source_hash, extractor, output_paths):
+    """True when the recorded source, extractor and every output hash still match
+
+    output_paths must all be recorded; every recorded output is re-hashed,
+    including files only known once written (such as the month shards an
+    index points at), so a deleted or edited one triggers a rebuild.
+    """
+    entry = manifest['units'].get(key)
+    if not entry or source_hash is None:
+        return False
+    if entry.get('source_sha256') != source_hash or entry.get('extractor') != extractor:
+        return False
+    outputs = entry.get('outputs', {})
+    if not all(path in outputs for path in output_paths):
+        return False
+    return all(file_sha256(path) == sha256 for path, sha256 in outputs.items())
+
+
+def record_unit(manifest, key, source_path, source_hash, extractor, output_paths, event_count):
+    """Record freshly written outputs in the manifest"""
+    manifest['units'][key] = {
+        'source': source_path,
+        'source_sha256': source_hash,
+        'extractor': extractor,
+        'outputs': {path: file_sha256(path) for path in output_paths},
+        'events': event_count,
+    }
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+excel_to_json.py
+
+Convert tabular tide exports (one table of events or water levels per file) to JSON files consumable by the app.
+
+Input: Excel (.xlsx) or CSV file with a table with columns Date, Time, Height, Type (or similar, see
+COLUMN_MAP), e.g. the Datum/Tijd/Hoogte/Type tables written by synthetic_workbooks.py --tabular. The
+table may span several years and may be a 10-minute water level series; Type is optional.
+Output: JSON array with entries: { "date": "YYYY-MM-DD", "time": "HH:MM", "height": Float, "type": "high|low" }
+in the app's pretty format, in table order.
+
+The conversion works column by column rather than row by row:
+  - the header is read first, so only the mapped columns are loaded (usecols), with dtype hints
+  - dates and times are parsed once per distinct value and broadcast back through pd.factorize codes;
+    a multi-year export repeats each date on every row of that day. Text is tried against
+    DATE_FORMATS in order with pd.to_datetime, Excel serial numbers and datetime cells are
+    converted directly, and anything left falls back to pandas' own parsing
+  - heights go through pd.to_numeric (a decimal comma is accepted), types through TYPE_MAP with
+    Series.map; a missing or unknown type is inferred from the height
+  - the JSON text is assembled with vectorised string operations
+Rows without a usable date, time or height are skipped. method='rows' is the original iterrows()
+conversion, kept for comparison (see --check).
+
+Usage (optional):
+  python3 excel_to_json.py path/to/Oostende2025_table.xlsx --station oostende --year 2025 --out ./GeneratedJSON
+  python3 excel_to_json.py levels_2020_2025.csv --sep ";" --station oostende --year 2025 --check
+
+Notes:
+- This script is provided as a helper; run it on your Mac, then copy the generated JSON into the app's Documents folder on Simulator or Device.
+- If column names differ, adjust COLUMN_MAP.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import time
+from datetime import datetime, time as time_of_day
+
+try:
+    import numpy as np
+    import pandas as pd
+except Exception as e:
+    raise SystemExit("pandas is required: pip install pandas openpyxl")
+
+COLUMN_MAP = {
+    # Possible variants -> normalized key
+    "date": ["date", "datum", "day", "dag"],
+    "time": ["time", "uur", "tijd", "tijdstip"],
+    "height": ["height", "mTAW", "m taw", "hoogte", "waterstand"],
+    "type": ["type", "tide", "soort", "hoog/laag", "opmerking"],
+}
+
+# Simple classifier if the file doesn't contain a type column
+# If a 'Type' is present with values like 'HW', 'LW', 'High', 'Low', we will map those.
+TYPE_MAP = {
+    "hw": "high",
+    "lw": "low",
+    "high": "high",
+    "low": "low",
+    "hoog": "high",
+    "laag": "low",
+}
+
+# Rows without a (recognised) type are high water from this height in m
+INFER_HIGH_FROM = 2.0
+
+TIME_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y", "%d.%m.%Y"]
+EXCEL_EPOCH = "1899-12-30"
+
+METHODS = ("vectorized", "rows")
+
+
+def normalize_columns(cols):
+    norm = {}
+    for c in cols:
+        lc = str(c).strip().lower()
+        for key, variants in COLUMN_MAP.items():
+            if any(lc == v for v in variants):
+                norm[key] = c
+                break
+    return norm
+
+
+def read_table(path, sep=",", **kwargs):
+    """Read an .xlsx/.xls or CSV table into a DataFrame"""
+    if path.lower().endswith((".csv", ".txt")):
+        return pd.read_csv(path, sep=sep, **kwargs)
+    return pd.read_excel(path, **kwargs)
+
+
+def read_columns(path, sep=","):
+    """Read only the mapped columns of a table, returning (DataFrame, {key: column name})
+
+    The header is read on its own first to find the columns. Type is read as text; in a CSV
+    date and time are too, so pandas does not infer (and later re-parse) them.
+    """
+    cols = normalize_columns(read_table(path, sep, nrows=0).columns)
+    if not {"date", "time", "height"}.issubset(cols.keys()):
+        raise SystemExit(
+            f"Couldn't find required columns in {path}. Found mapping: {cols}. Please adjust COLUMN_MAP."
+        )
+
+    text_keys = ["type"] if path.lower().endswith((".xlsx", ".xlsm", ".xls")) else ["date", "time", "type"]
+    dtype = {cols[key]: str for key in text_keys if key in cols}
+    return read_table(path, sep, usecols=list(cols.values()), dtype=dtype), cols
+
+
+# Row-by-row parsing, used by method='rows' and for values the column-wise parsers leave over
+
+def _date_or_none(stamp):
+    # pandas returns NaT, not an error, for empty cells
+    return None if pd.isna(stamp) else stamp.date()
+
+
+def parse_date(value):
+    if isinstance(value, (int, float)):
+        # Excel serial date; let pandas handle if present
+        try:
+            return _date_or_none(pd.to_datetime(value, unit="D", origin=EXCEL_EPOCH))
+        except Exception:
+            pass
+    if isinstance(value, datetime):
+        return value.date()
+    s = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(s, fmt).date()
+        except Exception:
+            continue
+    # Fallback: let pandas try
+    try:
+        return _date_or_none(pd.to_datetime(s))
+    except Exception:
+        return None
+
+
+def parse_time(value):
+    if isinstance(value, datetime):
+        return value.strftime("%H:%M")
+    s = str(value).strip()
+    m = TIME_RE.match(s)
+    if m:
+        h, mm = m.groups()
+        return f"{int(h):02d}:{int(mm):02d}"
+    # Try pandas
+    try:
+        t = pd.to_datetime(s)
+        return t.strftime("%H:%M")
+    except Exception:
+        return None
+
+
+def map_type(value, height=None):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        # Infer from relative height if needed
+        if height is not None:
+            try:
+                h = float(height)
+                return "high" if h >= INFER_HIGH_FROM else "low"
+            except Exception:
+                return "low"
+        return "low"
+    s = str(value).strip().lower()
+    s = s.replace(" ", "")
+    return TYPE_MAP.get(s, "high" if (height and float(height) >= INFER_HIGH_FROM) else "low")
+
+
+# Column-wise parsing
+
+def _broadcast(values, codes):
+    """Expand per-unique values back to rows via factorize codes; code -1 (missing) becomes None"""
+    values = np.append(np.asarray(values, dtype=object), None)
+    return values[np.where(codes < 0, len(values) - 1, codes)]
+
+
+def _factorize_floats(values):
+    """pd.factorize for finite floats by bit pattern, so -0.0 and 0.0 (formatted differently) stay apart"""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=float).view(np.int64))
+    return codes, np.asarray(uniques, dtype=np.int64).view(float)
+
+
+def _fallback(values, parse):
+    """Apply a row parser to the few distinct values the column-wise pass could not handle"""
+    return [parse(value) for value in values]
+
+
+def _parse_date_values(uniques):
+    """'YYYY-MM-DD' (or None) for an object array of distinct date cells"""
+    values = pd.Series(uniques, dtype=object)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+    serial = values.map(lambda value: isinstance(value, (int, float))).to_numpy(dtype=bool)
+    stamp = values.map(lambda value: isinstance(value, datetime)).to_numpy(dtype=bool)
+    if serial.any():
+        parsed[serial] = pd.to_datetime(values[serial].astype(float), unit="D", origin=EXCEL_EPOCH,
+                                        errors="coerce").to_numpy()
+    if stamp.any():
+        parsed[stamp] = pd.to_datetime(values[stamp]).to_numpy()
+
+    # Text in DATE_FORMATS order, each format only for what earlier formats left unparsed
+    text = values.astype(str).str.strip()
+    pending = ~serial & ~stamp
+    for fmt in DATE_FORMATS:
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors="coerce").to_numpy()
+        pending &= parsed.isna().to_numpy()
+
+    result = np.array(parsed.dt.strftime("%Y-%m-%d").astype(object).where(parsed.notna(), None), dtype=object)
+    if pending.any():
+        leftovers = _fallback(text[pending], parse_date)
+        result[pending] = [day.strftime("%Y-%m-%d") if day else None for day in leftovers]
+    return result
+
+
+def parse_dates(column):
+    """Column-wise parse_date: 'YYYY-MM-DD' strings, None where a cell is not a date"""
+    codes, uniques = pd.factorize(column)
+    if pd.api.types.is_datetime64_any_dtype(column):
+        days = pd.DatetimeIndex(uniques).strftime("%Y-%m-%d")
+    elif pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        days = pd.to_datetime(uniques, unit="D", origin=EXCEL_EPOCH, errors="coerce").strftime("%Y-%m-%d")
+    else:
+        days = _parse_date_values(np.asarray(uniques, dtype=object))
+    return _broadcast(pd.Series(days, dtype=object).where(pd.notna(days), None), codes)
+
+
+def _parse_time_values(uniques):
+    """'HH:MM' (or None) for an object array of distinct time cells"""
+    values = pd.Series(uniques, dtype=object)
+    result = pd.Series(None, index=values.index, dtype=object)
+
+    stamp = values.map(lambda value: isinstance(value, datetime)).to_numpy(dtype=bool)
+    clock = values.map(lambda value: isinstance(value, time_of_day)).to_numpy(dtype=bool)
+    if stamp.any():
+        result[stamp] = pd.to_datetime(values[stamp]).dt.strftime("%H:%M").to_numpy()
+    if clock.any():
+        # Excel time cells: pandas yields datetime.time, which the row parser formats the same way
+        result[clock] = [f"{value.hour:02d}:{value.minute:02d}" for value in values[clock]]
+
+    pending = ~stamp & ~clock
+    text = values[pending].astype(str).str.strip()
+    parts = text.str.extract(TIME_RE.pattern)
+    matched = parts[0].notna().to_numpy()
+    positions = np.flatnonzero(pending)
+    result.iloc[positions[matched]] = (parts[0][matched].str.zfill(2) + ":" + parts[1][matched]).to_numpy()
+    if not matched.all():
+        result.iloc[positions[~matched]] = _fallback(text[~matched], parse_time)
+    return result.to_numpy()
+
+
+def parse_times(column):
+    """Column-wise parse_time: 'HH:MM' strings, None where a cell is not a time"""
+    codes, uniques = pd.factorize(column)
+    if pd.api.types.is_datetime64_any_dtype(column):
+        times = pd.DatetimeIndex(uniques).strftime("%H:%M")
+        times = pd.Series(times, dtype=object).where(pd.notna(times), None)
+    else:
+        times = _parse_time_values(np.asarray(uniques, dtype=object))
+    return _broadcast(times, codes)
+
+
+def parse_heights(column):
+    """Heights in m as float64, NaN where a cell is not a finite number; accepts a decimal comma"""
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        heights = column.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        # Parse each distinct text once; code -1 (missing) picks the trailing NaN
+        codes, uniques = pd.factorize(column)
+        text = pd.Series(np.asarray(uniques, dtype=object)).astype(str).str.strip()
+        values = pd.to_numeric(text.str.replace(",", ".", regex=False), errors="coerce").to_numpy(dtype=float)
+        heights = np.append(values, np.nan)[codes]
+    return np.where(np.isfinite(heights), heights, np.nan)
+
+
+def round_heights(heights):
+    """round(h, 2) for every height, once per distinct value
+
+    Python's round() is correctly rounded from the decimal value, numpy's round() scales by 100
+    first and can differ on the last digit (e.g. 2.805), so the row conversion's result is kept.
+    """
+    codes, uniques = _factorize_floats(heights)
+    return np.array([round(h, 2) for h in uniques.tolist()], dtype=float)[codes]
+
+
+def map_types(column, heights):
+    """Column-wise map_type: TYPE_MAP for recognised types, otherwise inferred from the height"""
+    inferred = np.where(heights >= INFER_HIGH_FROM, "high", "low").astype(object)
+    if column is None:
+        return inferred
+    codes, uniques = pd.factorize(column)
+    keys = pd.Series(np.asarray(uniques, dtype=object)).astype(str).str.strip().str.lower()
+    mapped = _broadcast(keys.str.replace(" ", "", regex=False).map(TYPE_MAP).to_numpy(), codes)
+    return np.where(pd.isna(mapped), inferred, mapped)
+
+
+def format_records(dates, times, heights, types):
+    """The app's pretty JSON, as json.dump(records, indent=2) writes it, from column arrays"""
+    if not len(dates):
+        return "[]"
+    # numpy formats float64 as the shortest round-trip repr, like json
+    codes, uniques = _factorize_floats(heights)
+    height_text = uniques.astype(str)[codes]
+    records = ('  {\n    "date": "' + pd.Series(dates, dtype=object)
+               + '",\n    "time": "' + pd.Series(times, dtype=object)
+               + '",\n    "height": ' + pd.Series(height_text, dtype=object)
+               + ',\n    "type": "' + pd.Series(types, dtype=object) + '"\n  }')
+    return "[\n" + ",\n".join(records.tolist()) + "\n]"
+
+
+def convert_columns(df, cols):
+    """Convert a table column by column, returning (JSON text, record count)"""
+    dates = parse_dates(df[cols["date"]])
+    times = parse_times(df[cols["time"]])
+    heights = parse_heights(df[cols["height"]])
+
+    keep = pd.notna(dates) & pd.notna(times) & ~np.isnan(heights)
+    heights = heights[keep]
+    # Types are inferred from the unrounded height, as in the row conversion
+    types = map_types(df[cols["type"]][keep] if "type" in cols else None, heights)
+    return format_records(dates[keep], times[keep], round_heights(heights), types), int(keep.sum())
+
+
+def convert_rows(df, cols):
+    """The original row-by-row conversion, returning (JSON text, record count)"""
+    date_col = cols["date"]
+    time_col = cols["time"]
+    height_col = cols["height"]
+    type_col = cols.get("type")
+
+    records = []
+    for _, row in df.iterrows():
+        d = parse_date(row[date_col])
+        t = parse_time(row[time_col])
+        if not d or not t:
+            continue
+        try:
+            h = float(str(row[height_col]).replace(",", "."))
+        except Exception:
+            continue
+        if not math.isfinite(h):
+            continue
+        ty = map_type(row[type_col] if type_col in df.columns else None, height=h)
+        records.append({
+            "date": d.strftime("%Y-%m-%d"),
+            "time": t,
+            "height": round(h, 2),
+            "type": ty,
+        })
+    return json.dumps(records, ensure_ascii=False, indent=2), len(records)
+
+
+def convert(xlsx_path, method="vectorized", sep=","):
+    """Convert one table to the app's JSON text, returning (text, record count)"""
+    if method == "rows":
+        df = read_table(xlsx_path, sep)
+        return convert_rows(df, normalize_columns(df.columns))
+    return convert_columns(*read_columns(xlsx_path, sep))
+
+
+def excel_to_json(xlsx_path, station, year, out_dir, method="vectorized", sep=","):
+    text, _ = convert(xlsx_path, method, sep)
+
+    os.makedirs(out_dir, exist_ok=True)
+    out_name = f"{station}_{year}.json"
+    out_path = os.path.join(out_dir, out_name)
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return out_path
+
+
+def check_methods(xlsx_path, sep=","):
+    """Convert with both methods and report whether the output is identical, with timings"""
+    results = {}
+    for method in METHODS:
+        start = time.perf_counter()
+        results[method] = convert(xlsx_path, method, sep)
+        print(f"  {method:<11} {results[method][1]:>8} records in {time.perf_counter() - start:.2f}s")
+    match = results["vectorized"] == results["rows"]
+    print(f"  {'✅' if match else '❌'} outputs {'identical' if match else 'differ'}")
+    return match
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("xlsx", help="Path to Excel or CSV file, e.g., Oostende2025_mTAW.xlsx")
+    p.add_argument("--station", required=True, help="Station id: antwerpen|blankenberge|nieuwpoort|oostende|zeebrugge")
+    p.add_argument("--year", type=int, required=True, help="Year, e.g., 2025")
+    p.add_argument("--out", default="./GeneratedJSON", help="Output directory for JSON")
+    p.add_argument("--sep", default=",", help="CSV field separator")
+    p.add_argument("--method", choices=METHODS, default="vectorized",
+                   help="vectorized: column-wise (default); rows: the original iterrows() loop")
+    p.add_argument("--check", action="store_true",
+                   help="Convert with both methods and compare the output instead of writing it")
+    args = p.parse_args()
+
+    if args.check:
+        raise SystemExit(0 if check_methods(args.xlsx, args.sep) else 1)
+
+    out = excel_to_json(args.xlsx, args.station, args.year, args.out, args.method, args.sep)
+    print(out)
+
+
+if __name__ == "__main__":
+    main()
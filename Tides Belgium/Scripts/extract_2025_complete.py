@@ -145,36 +145,40 @@ def extract_station_full_year(excel_path, station_name, year):
     print(f"  Extracted {len(unique_tides)} unique tides")
     return unique_tides
 
-# Process 2025 data first
-stations = [
-    {'name': 'nieuwpoort', 'file': 'xlsx-getijtabellen-taw-2025/Nieuwpoort2025_mTAW.xlsx'},
-    {'name': 'oostende', 'file': 'xlsx-getijtabellen-taw-2025/Oostende2025_mTAW.xlsx'},
-    {'name': 'blankenberge', 'file': 'xlsx-getijtabellen-taw-2025/Blankenberge2025_mTAW.xlsx'},
-    {'name': 'zeebrugge', 'file': 'xlsx-getijtabellen-taw-2025/Zeebrugge2025_mTAW.xlsx'},
-    {'name': 'antwerpen', 'file': 'xlsx-getijtabellen-taw-2025/Antwerpen2025_mTAW.xlsx'},
-]
+def main():
+    # Process 2025 data first
+    stations = [
+        {'name': 'nieuwpoort', 'file': 'xlsx-getijtabellen-taw-2025/Nieuwpoort2025_mTAW.xlsx'},
+        {'name': 'oostende', 'file': 'xlsx-getijtabellen-taw-2025/Oostende2025_mTAW.xlsx'},
+        {'name': 'blankenberge', 'file': 'xlsx-getijtabellen-taw-2025/Blankenberge2025_mTAW.xlsx'},
+        {'name': 'zeebrugge', 'file': 'xlsx-getijtabellen-taw-2025/Zeebrugge2025_mTAW.xlsx'},
+        {'name': 'antwerpen', 'file': 'xlsx-getijtabellen-taw-2025/Antwerpen2025_mTAW.xlsx'},
+    ]
 
-print("PROCESSING YEAR 2025")
-print("=" * 50)
+    print("PROCESSING YEAR 2025")
+    print("=" * 50)
 
-for station in stations:
-    tides = extract_station_full_year(station['file'], station['name'], 2025)
-    
-    if tides:
-        output_file = f"{station['name']}_2025.json"
-        with open(output_file, 'w') as f:
-            json.dump(tides, f, indent=2)
-        
-        print(f"  Saved: {output_file}")
-        
-        # Show August data for testing
-        aug_tides = [t for t in tides if t['date'].startswith('2025-08-')]
-        if aug_tides:
-            print(f"  August 2025 tides: {len(aug_tides)} found")
-            for tide in aug_tides[:6]:
-                if tide['date'] in ['2025-08-11', '2025-08-12', '2025-08-13']:
-                    print(f"    {tide['date']} {tide['time']}: {tide['height']}m ({tide['type']})")
-        print()
+    for station in stations:
+        tides = extract_station_full_year(station['file'], station['name'], 2025)
+
+        if tides:
+            output_file = f"{station['name']}_2025.json"
+            with open(output_file, 'w') as f:
+                json.dump(tides, f, indent=2)
+
+            print(f"  Saved: {output_file}")
+
+            # Show August data for testing
+            aug_tides = [t for t in tides if t['date'].startswith('2025-08-')]
+            if aug_tides:
+                print(f"  August 2025 tides: {len(aug_tides)} found")
+                for tide in aug_tides[:6]:
+                    if tide['date'] in ['2025-08-11', '2025-08-12', '2025-08-13']:
+                        print(f"    {tide['date']} {tide['time']}: {tide['height']}m ({tide['type']})")
+            print()
+
+    print("EXTRACTION COMPLETE!")
+    print("Deploy these JSON files to your iOS app by copying to the Simulator Documents folder.")
 
-print("EXTRACTION COMPLETE!")
-print("Deploy these JSON files to your iOS app by copying to the Simulator Documents folder.")
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,30 @@
 #!/usr/bin/env python3
 
-import openpyxl
+import argparse
+import contextlib
+import functools
+import heapq
+import io
+import itertools
 import json
+import openpyxl
+import os
+import platform
 import sys
-from datetime import datetime, time
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
+from datetime import datetime, time, timezone
 from collections import defaultdict
 
+import build_cache
+import tide_binary
+import tide_compress
+import tide_encodings
+import tide_profile
+import tide_shards
+import xlsx_reader
+from tide_series import TideEvent, TideSeries
+
 def parse_time(time_val):
     """Parse time from various formats"""
     if isinstance(time_val, time):
@@ -21,6 +40,12 @@ def parse_time(time_val):
             pass
     return None
 
+def format_minutes(time_val):
+    """Format minutes since midnight from the fast reader, else parse as usual"""
+    if isinstance(time_val, int):
+        return f'{time_val // 60:02d}:{time_val % 60:02d}'
+    return parse_time(time_val)
+
 def parse_height(height_val):
     """Parse height from various formats"""
     if isinstance(height_val, (int, float)):
@@ -32,8 +57,38 @@ def parse_height(height_val):
             pass
     return None
 
-def extract_station_data(station_name, year):
-    """Extract data for one station with fixed column mapping"""
+# Sheets in a Belgian tide workbook, each covering two months
+SHEETS = ['jan-feb', 'mrt-apr', 'mei-jun', 'jul-aug', 'sept-okt', 'nov-dec']
+
+# Per month within a sheet: (day column, [(time column, height column), ...], valid days)
+DAY_COLUMN_MAPPINGS = [
+    [
+        (1, [(3, 4), (5, 6)], range(1, 16)),        # Days 1-15: day in col 1, data in cols 3-6
+        (8, [(10, 11), (12, 13)], range(16, 32)),   # Days 16-31: day in col 8, data in cols 10-13
+    ],
+    [
+        (8, [(17, 18), (19, 20)], range(1, 16)),    # Days 1-15: day in col 8, data in cols 17-20
+        (22, [(24, 25), (26, 27)], range(16, 32)),  # Days 16-31: day in col 22, data in cols 24-27
+    ],
+]
+
+EXTRACTION_MODES = ('stream', 'cell')
+CLASSIFIERS = ('threshold', 'alternation')
+READERS = ('fast', 'grid', 'openpyxl')
+
+# Default metrics file for --profile
+PROFILE_PATH = 'extract_profile.json'
+
+# Columns the fast reader needs to decode: day columns plus time/height pairs
+DATA_COLUMNS = sorted({col for mappings in DAY_COLUMN_MAPPINGS
+                       for day_col, pairs, _ in mappings
+                       for col in (day_col, 1, *(c for pair in pairs for c in pair))})
+TIME_COLUMNS = sorted({time_col for mappings in DAY_COLUMN_MAPPINGS
+                       for _, pairs, _ in mappings
+                       for time_col, _ in pairs})
+
+def get_excel_path(station_name, year):
+    """Return the source workbook path for a station and year"""
     
     # File name mapping
     name_map = {
@@ -48,170 +103,608 @@ def extract_station_data(station_name, year):
         excel_filename = f"{name_map[station_name]}{year}_mTAW.xlsx"
     else:
         excel_filename = f"{name_map[station_name]}_{year}_mTAW.xlsx"
-    excel_path = f'../SourceData/xlsx-getijtabellen-taw-{year}/{excel_filename}'
+    return f'../SourceData/xlsx-getijtabellen-taw-{year}/{excel_filename}'
+
+def make_tide(date_str, time_str, height):
+    """Build one tide event; to_entry() gives the output JSON schema"""
+    return TideEvent.from_parts(date_str, time_str, height, height >= 2.5)
+
+def cell_value(row, column):
+    """Return the value at a 1-based column of a row tuple"""
+    if column <= len(row):
+        return row[column - 1]
+    return None
+
+tide_sort_key = attrgetter('epoch')
+
+def row_tides(row, time_height_pairs, date_str, time_parser=parse_time):
+    """Yield the tides found in the time/height column pairs of one row"""
+    for time_col, height_col in time_height_pairs:
+        time_str = time_parser(cell_value(row, time_col))
+        height = parse_height(cell_value(row, height_col))
+
+        if time_str and height is not None:
+            yield make_tide(date_str, time_str, height)
+
+def sheet_events(rows, year, sheet_idx, time_parser=parse_time):
+    """Yield the tides of one sheet, applying every day/column mapping in a single pass over its rows"""
+    months = [(sheet_idx * 2) + 1, (sheet_idx * 2) + 2]
+    
+    rows = iter(rows)
+    row = next(rows, None)
+    while row is not None:
+        # One row of lookahead for the continuation row
+        next_row = next(rows, None)
+        continuation = next_row is not None and not isinstance(cell_value(next_row, 1), (int, float))
+        
+        for month_idx, month in enumerate(months):
+            if month > 12:
+                continue
+            
+            for day_col, time_height_pairs, valid_day_range in DAY_COLUMN_MAPPINGS[month_idx]:
+                day_val = cell_value(row, day_col)
+                
+                if not isinstance(day_val, (int, float)) or day_val <= 0 or day_val > 31:
+                    continue
+                
+                day = int(day_val)
+                if day not in valid_day_range:
+                    continue
+                
+                try:
+                    # Validate date exists
+                    datetime(year, month, day)
+                except ValueError:
+                    # Invalid date (e.g., Feb 30), continue
+                    continue
+                
+                date_str = f'{year}-{month:02d}-{day:02d}'
+                yield from row_tides(row, time_height_pairs, date_str, time_parser)
+                if continuation:
+                    yield from row_tides(next_row, time_height_pairs, date_str, time_parser)
+        
+        row = next_row
+
+def sheets_streaming(excel_path, year):
+    """Yield one event stream per sheet, reading each sheet once in read-only mode"""
+    profile = tide_profile.active()
+    with profile.phase('open'):
+        wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
     
     try:
+        for sheet_idx, sheet_name in enumerate(SHEETS):
+            if sheet_name not in wb.sheetnames:
+                continue
+            
+            print(f"    📅 Processing {sheet_name}")
+            rows = profile.wrap(wb[sheet_name].iter_rows(min_row=4, values_only=True), 'read')
+            yield profile.wrap(sheet_events(rows, year, sheet_idx), 'parse')
+    finally:
+        wb.close()
+
+def sheets_fast(excel_path, year, grid=False):
+    """Yield one event stream per sheet from the zip/XML reader, decoding only the mapped columns
+    
+    With grid, the rows come from the workbook's cached cell-grid snapshot
+    (see xlsx_grid.py) instead, which is built on first use.
+    """
+    profile = tide_profile.active()
+    with profile.phase('open'):
+        if grid:
+            import xlsx_grid
+            wb = xlsx_grid.open_workbook(excel_path)
+        else:
+            wb = xlsx_reader.XlsxReader(excel_path)
+    with wb:
+        for sheet_idx, sheet_name in enumerate(SHEETS):
+            if sheet_name not in wb.sheetnames:
+                continue
+            
+            print(f"    📅 Processing {sheet_name}")
+            rows = profile.wrap(wb.iter_rows(sheet_name, DATA_COLUMNS, TIME_COLUMNS, min_row=4), 'read')
+            yield profile.wrap(sheet_events(rows, year, sheet_idx, time_parser=format_minutes), 'parse')
+
+def sheets_by_cell(excel_path, year):
+    """Yield each sheet's tides from the legacy walk, cell by cell and once per mapping"""
+    profile = tide_profile.active()
+    with profile.phase('open'):
         wb = openpyxl.load_workbook(excel_path)
-    except FileNotFoundError:
-        print(f"  ❌ Excel file not found: {excel_filename}")
-        return []
     
+    for sheet_idx, sheet_name in enumerate(SHEETS):
+        if sheet_name in wb.sheetnames:
+            # Cell access and parsing are interleaved here, so all of it counts as 'read'
+            with profile.phase('read'):
+                tides = sheet_tides_by_cell(wb[sheet_name], sheet_idx, year)
+            yield tides
+
+def sheet_tides_by_cell(ws, sheet_idx, year):
+    """Return the tides of one sheet, walking it cell by cell"""
     all_tides = []
+    sheet_name = ws.title
+    months = [(sheet_idx * 2) + 1, (sheet_idx * 2) + 2]
     
-    # Process each sheet
-    sheets = ['jan-feb', 'mrt-apr', 'mei-jun', 'jul-aug', 'sept-okt', 'nov-dec']
-    
-    for sheet_idx, sheet_name in enumerate(sheets):
-        if sheet_name not in wb.sheetnames:
+    # Process both months in this sheet
+    for month_idx, month in enumerate(months):
+        if month > 12:
             continue
             
-        ws = wb[sheet_name]
-        months = [(sheet_idx * 2) + 1, (sheet_idx * 2) + 2]
+        print(f"    📅 Processing {sheet_name}, month {month}")
         
-        # Process both months in this sheet
-        for month_idx, month in enumerate(months):
-            if month > 12:
-                continue
+        # Process each day column mapping
+        for day_col, time_height_pairs, valid_day_range in DAY_COLUMN_MAPPINGS[month_idx]:
+            for row in range(4, ws.max_row + 1):
+                day_val = ws.cell(row=row, column=day_col).value
                 
-            print(f"    📅 Processing {sheet_name}, month {month}")
-            
-            # Define day columns and corresponding column sets for this month
-            if month_idx == 0:  # First month (e.g., July in jul-aug)
-                day_column_mappings = [
-                    (1, [(3, 4), (5, 6)], range(1, 16)),      # Days 1-15: day in col 1, data in cols 3-6
-                    (8, [(10, 11), (12, 13)], range(16, 32))  # Days 16-31: day in col 8, data in cols 10-13  
-                ]
-            else:  # Second month (e.g., August in jul-aug)
-                day_column_mappings = [
-                    (8, [(17, 18), (19, 20)], range(1, 16)),    # Days 1-15: day in col 8, data in cols 17-20
-                    (22, [(24, 25), (26, 27)], range(16, 32))   # Days 16-31: day in col 22, data in cols 24-27
-                ]
-            
-            # Process each day column mapping
-            for day_col, time_height_pairs, valid_day_range in day_column_mappings:
-                for row in range(4, ws.max_row + 1):
-                    day_val = ws.cell(row=row, column=day_col).value
+                if not isinstance(day_val, (int, float)) or day_val <= 0 or day_val > 31:
+                    continue
                     
-                    if not isinstance(day_val, (int, float)) or day_val <= 0 or day_val > 31:
-                        continue
-                        
-                    day = int(day_val)
+                day = int(day_val)
+                
+                # Only process days that are in the valid range for this column section
+                if day not in valid_day_range:
+                    continue
+                
+                try:
+                    # Validate date exists
+                    datetime(year, month, day)
+                    date_str = f'{year}-{month:02d}-{day:02d}'
+                    
+                    # Extract tides from main row
+                    for time_col, height_col in time_height_pairs:
+                        time_val = ws.cell(row=row, column=time_col).value
+                        height_val = ws.cell(row=row, column=height_col).value
+
+                        time_str = parse_time(time_val)
+                        height = parse_height(height_val)
+
+                        if time_str and height is not None:
+                            all_tides.append(make_tide(date_str, time_str, height))
                     
-                    # Only process days that are in the valid range for this column section
-                    if day not in valid_day_range:
-                        continue
+                    # Check continuation row
+                    next_row = row + 1
+                    if next_row <= ws.max_row:
+                        next_day_val = ws.cell(row=next_row, column=1).value
+                        if not isinstance(next_day_val, (int, float)):
+                            # Process continuation row
+                            for time_col, height_col in time_height_pairs:
+                                time_val = ws.cell(row=next_row, column=time_col).value
+                                height_val = ws.cell(row=next_row, column=height_col).value
+
+                                time_str = parse_time(time_val)
+                                height = parse_height(height_val)
+
+                                if time_str and height is not None:
+                                    all_tides.append(make_tide(date_str, time_str, height))
                     
-                    try:
-                        # Validate date exists
-                        datetime(year, month, day)
-                        date_str = f'{year}-{month:02d}-{day:02d}'
-                        
-                        # Extract tides from main row
-                        for time_col, height_col in time_height_pairs:
-                            time_val = ws.cell(row=row, column=time_col).value
-                            height_val = ws.cell(row=row, column=height_col).value
-
-                            time_str = parse_time(time_val)
-                            height = parse_height(height_val)
-
-                            if time_str and height is not None:
-                                tide_type = 'high' if height >= 2.5 else 'low'
-                                all_tides.append({
-                                    'date': date_str,
-                                    'time': time_str,
-                                    'height': round(height, 2),
-                                    'type': tide_type
-                                })
-                        
-                        # Check continuation row
-                        next_row = row + 1
-                        if next_row <= ws.max_row:
-                            next_day_val = ws.cell(row=next_row, column=1).value
-                            if not isinstance(next_day_val, (int, float)):
-                                # Process continuation row
-                                for time_col, height_col in time_height_pairs:
-                                    time_val = ws.cell(row=next_row, column=time_col).value
-                                    height_val = ws.cell(row=next_row, column=height_col).value
-
-                                    time_str = parse_time(time_val)
-                                    height = parse_height(height_val)
-
-                                    if time_str and height is not None:
-                                        tide_type = 'high' if height >= 2.5 else 'low'
-                                        all_tides.append({
-                                            'date': date_str,
-                                            'time': time_str,
-                                            'height': round(height, 2),
-                                            'type': tide_type
-                                        })
-                        
-                    except ValueError:
-                        # Invalid date (e.g., Feb 30), continue
-                        continue
-    
-    # Sort and remove exact duplicates only
-    all_tides.sort(key=lambda x: (x['date'], x['time']))
-    
-    unique_tides = []
-    for tide in all_tides:
-        if not unique_tides or unique_tides[-1] != tide:
-            unique_tides.append(tide)
+                except ValueError:
+                    # Invalid date (e.g., Feb 30), continue
+                    continue
+    
+    return all_tides
+
+def sorted_runs(sheets):
+    """Sort each sheet's events on its own; a sheet holds at most two months"""
+    profile = tide_profile.active()
+    for events in sheets:
+        with profile.phase('sort'):
+            series = TideSeries.from_events(events).sort()
+        yield series
+
+def merge_runs(runs):
+    """Merge sorted runs into one sorted stream (stable, so equal keys keep sheet order)"""
+    yield from heapq.merge(*runs, key=tide_sort_key)
+
+def dedupe_tides(tides):
+    """Drop exact duplicates of the previous tide in a sorted stream"""
+    previous = None
+    for tide in tides:
+        if tide != previous:
+            yield tide
+        previous = tide
+
+def iter_station_tides(station_name, year, mode='stream', reader='fast', excel_path=None):
+    """Yield one station-year's sorted, de-duplicated tides as a chain of generator stages
+
+    sheet rows -> per-sheet events -> per-sheet sorted runs -> heapq.merge -> dedupe.
+    Only the workbook being read is held in memory, however many units are run.
+    """
+    excel_path = excel_path or get_excel_path(station_name, year)
+    if reader in ('fast', 'grid'):
+        sheets = sheets_fast(excel_path, year, grid=reader == 'grid')
+    elif mode == 'cell':
+        sheets = sheets_by_cell(excel_path, year)
+    else:
+        sheets = sheets_streaming(excel_path, year)
+    return tide_profile.active().wrap(dedupe_tides(merge_runs(sorted_runs(sheets))), 'merge')
+
+def extract_station_data(station_name, year, mode='stream', reader='fast', excel_path=None,
+                         classify='threshold'):
+    """Extract data for one station with fixed column mapping
+    
+    reader 'fast' uses the zip/XML reader in xlsx_reader.py and 'grid' the
+    cached cell-grid snapshot of the workbook (xlsx_grid.py). With reader
+    'openpyxl', mode 'stream' reads each sheet once in read-only mode and
+    'cell' is the original cell-by-cell walk, kept for comparison.
+    excel_path overrides the SourceData lookup (e.g. for synthetic workbooks).
+    classify 'alternation' relabels high/low with tide_classify.py instead
+    of the fixed 2.5m threshold.
+    """
+    excel_path = excel_path or get_excel_path(station_name, year)
+    
+    profile = tide_profile.active()
+    try:
+        series = TideSeries.from_events(iter_station_tides(station_name, year, mode, reader, excel_path))
+    except FileNotFoundError:
+        print(f"  ❌ Excel file not found: {os.path.basename(excel_path)}")
+        return []
+    with profile.phase('convert'):
+        unique_tides = series.to_entries()
     
     print(f"  ✅ Extracted {len(unique_tides)} unique tides")
+    
+    if classify == 'alternation':
+        import tide_classify
+        with profile.phase('classify'):
+            unique_tides, result = tide_classify.classify_tides(unique_tides)
+        print(f"  🌊 Classified by alternation: {int(result['disagrees_threshold'].sum())} differ from threshold, "
+              f"{int(result['not_extremum'].sum())} not local extrema")
     return unique_tides
 
-def main():
-    # Get year from command line argument
-    if len(sys.argv) != 2:
-        print("Usage: python3 extract_year_data_fixed.py [YEAR]")
-        print("Example: python3 extract_year_data_fixed.py 2025")
-        sys.exit(1)
+# Station configurations
+STATIONS = [
+    {'name': 'blankenberge'},
+    {'name': 'nieuwpoort'},
+    {'name': 'oostende'}, 
+    {'name': 'zeebrugge'}
+]
+
+def extract_unit(unit):
+    """Extract one (station, year) work unit, capturing its log output
+    
+    Runs in a worker process when --jobs is above 1, so the log is
+    returned instead of printed and the parent prints it in unit order.
+    """
+    station_name, year, options = unit
+    log = io.StringIO()
+    tides = []
+    error = None
+    
+    with contextlib.redirect_stdout(log):
+        print(f"Processing {station_name.upper()} for year {year}...")
+        try:
+            tides = extract_station_data(station_name, year, **options)
+        except Exception as e:
+            error = e
+    
+    return tides, log.getvalue(), error
+
+def build_unit(unit, outputs, profile=False, cprofile_dir=None):
+    """Extract one work unit and write its outputs, capturing its log output
+    
+    Like extract_unit, but the worker writes the files itself and only a
+    (event count, paths written, first two tides) summary goes back to the
+    parent, so the parent never holds a whole series.
+    
+    With profile, the unit runs under tide_profile and its per-phase
+    metrics are returned as well (None otherwise); with cprofile_dir, a
+    cProfile dump {station}_{year}.prof is also written there.
+    """
+    station_name, year, options = unit
+    log = io.StringIO()
+    summary = (0, [], [])
+    metrics = None
+    error = None
+    
+    with contextlib.redirect_stdout(log):
+        print(f"Processing {station_name.upper()} for year {year}...")
+        try:
+            run = functools.partial(extract_and_save, station_name, year, options, outputs)
+            if profile or cprofile_dir:
+                cprofile_path = cprofile_dir and os.path.join(cprofile_dir, f"{station_name}_{year}.prof")
+                summary, metrics = tide_profile.profile_call(run, cprofile_path)
+                metrics = {'station': station_name, 'year': year, 'events': summary[0], **metrics}
+            else:
+                summary = run()
+        except Exception as e:
+            error = e
+    
+    return summary, log.getvalue(), error, metrics
+
+def run_units(units, jobs, worker=extract_unit):
+    """Yield (unit, result) pairs in the order of units, using a process pool for jobs > 1"""
+    if jobs > 1 and len(units) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(units))) as pool:
+            yield from zip(units, pool.map(worker, units))
+    else:
+        for unit in units:
+            yield unit, worker(unit)
+
+def get_output_path(station_name, year, extension='json'):
+    """Return the output path for a station and year"""
+    return f"../Data/{year}/{station_name}_{year}.{extension}"
+
+def get_output_paths(station_name, year, outputs):
+    """Return every output path a unit writes for the selected output formats"""
+    paths = [get_output_path(station_name, year)]
+    if outputs.get('binary'):
+        paths.append(get_output_path(station_name, year, 'tide'))
+    if outputs.get('shards'):
+        paths.append(tide_shards.get_index_path(station_name, year))
+    if outputs.get('charts'):
+        import tide_chart
+        paths += [tide_chart.get_index_path(station_name, year), tide_chart.get_chart_path(station_name, year)]
+    if outputs.get('days'):
+        paths.append(get_output_path(station_name, year, 'days'))
+    codecs = outputs.get('compress') or ()
+    return paths + [tide_compress.compressed_path(path, codec) for path in paths for codec in codecs]
+
+def save_station_json(tides, output_file, encoding='pretty'):
+    """Write one station-year to JSON, in the app's format unless another encoding is chosen
+    
+    tides may be any iterable; it is written incrementally to a temporary
+    file that replaces output_file once complete, or is removed if writing
+    fails. Returns the tide count.
+    """
+    tmp_file = output_file + '.tmp'
+    with tide_profile.active().phase('write'):
+        try:
+            with open(tmp_file, 'w') as f:
+                count = tide_encodings.write(tides, f, encoding)
+            os.replace(tmp_file, output_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+    return count
+
+def compress_outputs(paths, codecs):
+    """Write the compressed variants of outputs, returning their paths"""
+    if not codecs:
+        return []
+    with tide_profile.active().phase('compress'):
+        return [variant for path in paths for variant in tide_compress.write_variants(path, codecs)]
+
+def save_station_outputs(tides, station_name, year, outputs):
+    """Write the JSON plus any optional formats, returning the paths written"""
+    profile = tide_profile.active()
+    paths = get_output_paths(station_name, year, dict(outputs, compress=()))
+    save_station_json(tides, paths[0], outputs.get('encoding', 'pretty'))
+    if outputs.get('binary'):
+        with profile.phase('binary'):
+            tide_binary.write_tides_binary(tides, get_output_path(station_name, year, 'tide'), year)
+    if outputs.get('shards'):
+        # The index is already in paths; add the month shards it points to
+        with profile.phase('shards'):
+            paths += tide_shards.write_shards(tides, station_name, year)[1:]
+    if outputs.get('charts'):
+        import tide_chart
+        with profile.phase('charts'):
+            tide_chart.write_chart(tides, station_name, year)
+    if outputs.get('days'):
+        import tide_days
+        with profile.phase('days'):
+            tide_days.write_days(tides, get_output_path(station_name, year, 'days'), year)
+    return paths + compress_outputs(paths, outputs.get('compress'))
+
+def needs_whole_series(options, outputs):
+    """Whether a unit's options or outputs need the complete series rather than a stream"""
+    return (options.get('classify') == 'alternation'
+            or outputs.get('encoding', 'pretty') not in tide_encodings.STREAMING_ENCODINGS
+            or any(outputs.get(name) for name in ('binary', 'shards', 'charts', 'days')))
+
+def extract_and_save(station_name, year, options, outputs):
+    """Extract one station-year and write its outputs, returning (event count, paths written, first two tides)
     
+    With only a pretty, minified or ndjson JSON output the tides stream from
+    the workbook straight into the writer. Alternation classification,
+    soa/delta and the binary, shard, chart and day index outputs need the whole series,
+    so those collect it first.
+    """
+    if needs_whole_series(options, outputs):
+        tides = extract_station_data(station_name, year, **options)
+        if not tides:
+            return 0, [], []
+        return len(tides), save_station_outputs(tides, station_name, year, outputs), tides[:2]
+    
+    excel_path = get_excel_path(station_name, year)
+    tides = iter_station_tides(station_name, year, options.get('mode', 'stream'), options.get('reader', 'fast'),
+                               excel_path)
     try:
-        year = int(sys.argv[1])
-    except ValueError:
-        print("Error: Year must be a number")
-        sys.exit(1)
-    
-    # Station configurations
-    stations = [
-        {'name': 'blankenberge'},
-        {'name': 'nieuwpoort'},
-        {'name': 'oostende'}, 
-        {'name': 'zeebrugge'}
+        head = list(itertools.islice(tides, 2))
+    except FileNotFoundError:
+        print(f"  ❌ Excel file not found: {os.path.basename(excel_path)}")
+        return 0, [], []
+    
+    output_files = []
+    count = 0
+    if head:
+        output_files = get_output_paths(station_name, year, outputs)
+        entries = tide_profile.active().wrap(map(TideEvent.to_entry, itertools.chain(head, tides)), 'convert')
+        count = save_station_json(entries, output_files[0], outputs.get('encoding', 'pretty'))
+        compress_outputs(output_files[:1], outputs.get('compress'))
+    print(f"  ✅ Extracted {count} unique tides")
+    return count, output_files, [event.to_entry() for event in head]
+
+def check_readers(years, jobs):
+    """Check every reader/mode reproduces the current JSON outputs exactly"""
+    variants = [
+        {'reader': 'fast'},
+        {'reader': 'grid'},
+        {'reader': 'openpyxl', 'mode': 'stream'},
+        {'reader': 'openpyxl', 'mode': 'cell'},
     ]
+    units = [(station['name'], year, options) for year in years for station in STATIONS for options in variants]
+    
+    print("🔍 CHECKING READER EQUIVALENCE")
+    print("=" * 50)
+    all_match = True
+    for (station_name, year, options), (tides, _, error) in run_units(units, jobs):
+        label = '/'.join(options.values())
+        output_file = get_output_path(station_name, year)
+        try:
+            expected = tide_encodings.load(output_file)
+        except FileNotFoundError:
+            expected = None
+        
+        if error is None and tides and tides == expected:
+            print(f"  ✅ {station_name} {year} [{label}]: {len(tides)} tides match {output_file}")
+        else:
+            all_match = False
+            reason = error or f"{len(tides)} tides vs {'missing file' if expected is None else len(expected)}"
+            print(f"  ❌ {station_name} {year} [{label}]: {reason}")
+    
+    return all_match
+
+def save_profile(path, profiles, started, elapsed, jobs, options, outputs):
+    """Print the per-unit phase table and, with a path, write the metrics JSON"""
+    metrics = {
+        'created': started.isoformat(timespec='seconds'),
+        'command': sys.argv,
+        'python': platform.python_version(),
+        'jobs': jobs,
+        'options': options,
+        'outputs': outputs,
+        'units': profiles,
+        'totals': {
+            'wall_s': round(elapsed, 6),
+            'cpu_s': round(sum(unit['cpu_s'] for unit in profiles), 6),
+            'events': sum(unit['events'] for unit in profiles),
+            'phases': tide_profile.total_phases(profiles)
+        }
+    }
+    print("⏱️  PROFILE (exclusive wall ms per phase, under tracemalloc)")
+    for line in tide_profile.summarise(metrics):
+        print(f"  {line}")
+    if path:
+        with open(path, 'w') as f:
+            json.dump(metrics, f, indent=2)
+        print(f"📊 Metrics saved: {path}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract Belgian tide tables to JSON",
+        epilog="Example: python3 extract_year_data.py 2025 2026 --jobs 4")
+    parser.add_argument("years", metavar="year", type=int, nargs='+', help="Year(s) to extract, e.g. 2025")
+    parser.add_argument("--reader", choices=READERS, default='fast',
+                        help="fast: zip/XML reader (default); grid: cached cell-grid snapshot (xlsx_grid.py); "
+                             "openpyxl: openpyxl workbook, see --mode")
+    parser.add_argument("--mode", choices=EXTRACTION_MODES, default='stream',
+                        help="With --reader openpyxl: stream one read-only pass per sheet (default) or walk cell by cell")
+    parser.add_argument("--classify", choices=CLASSIFIERS, default='threshold',
+                        help="High/low labelling: fixed 2.5m threshold (default) or extremum alternation (needs numpy)")
+    parser.add_argument("--check-readers", action="store_true",
+                        help="Extract with every reader/mode and compare against the current JSON outputs, writing nothing")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes for (station, year) units (0 = one per CPU)")
+    parser.add_argument("--encoding", choices=tide_encodings.ENCODINGS, default='pretty',
+                        help="JSON encoding (see tide_encodings.py); the app reads pretty (default) and minified")
+    parser.add_argument("--binary", action="store_true",
+                        help="Also write a columnar binary {station}_{year}.tide file (see tide_binary.py)")
+    parser.add_argument("--shards", action="store_true",
+                        help="Also write one JSON shard per month plus an index under ../Data/{year}/shards/")
+    parser.add_argument("--charts", action="store_true",
+                        help="Also write LTTB chart points per zoom level under ../Data/{year}/charts/ (needs numpy)")
+    parser.add_argument("--days", action="store_true",
+                        help="Also write a per-day summary index {station}_{year}.days (see tide_days.py, needs numpy)")
+    parser.add_argument("--compress", nargs='+', choices=list(tide_compress.CODECS), default=[],
+                        help="Also write compressed variants of every output (see tide_compress.py)")
+    parser.add_argument("--timeline", action="store_true",
+                        help="Stitch every available year per station into ../Data/timeline/{station}.timeline "
+                             "afterwards (see tide_timeline.py)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every station even if its workbook and the extractor are unchanged")
+    parser.add_argument("--deploy", nargs='*', metavar="TARGET",
+                        help="Copy changed JSON outputs to the app folders afterwards (see tide_deploy.py; "
+                             "default target: app)")
+    parser.add_argument("--validate", action="store_true",
+                        help="Run the tide_validate.py checks on every station-year afterwards (needs numpy)")
+    parser.add_argument("--profile", nargs='?', const=PROFILE_PATH, metavar="PATH",
+                        help=f"Record wall/CPU time and tracemalloc peak per phase and unit to a metrics JSON "
+                             f"(default {PROFILE_PATH}); unchanged units are skipped, add --force to profile all")
+    parser.add_argument("--cprofile", metavar="DIR",
+                        help="Also write a cProfile dump {station}_{year}.prof per unit to DIR")
+    args = parser.parse_args()
+    years = args.years
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
     
-    print(f"🗓️  EXTRACTING TIDE DATA FOR {year}")
+    if args.check_readers:
+        sys.exit(0 if check_readers(years, jobs) else 1)
+    
+    print(f"🗓️  EXTRACTING TIDE DATA FOR {', '.join(str(year) for year in years)}")
     print("=" * 50)
-    print(f"📂 Looking for Excel files in: ../SourceData/xlsx-getijtabellen-taw-{year}/")
-    print(f"💾 Output will be saved to: ../Data/{year}/")
+    for year in years:
+        print(f"📂 Looking for Excel files in: ../SourceData/xlsx-getijtabellen-taw-{year}/")
+        print(f"💾 Output will be saved to: ../Data/{year}/")
+        
+        # Ensure output directory exists
+        os.makedirs(f"../Data/{year}/", exist_ok=True)
+    if jobs > 1:
+        print(f"⚙️  Using {jobs} worker processes")
     print()
     
-    # Ensure output directory exists
-    import os
-    output_dir = f"../Data/{year}/"
-    os.makedirs(output_dir, exist_ok=True)
+    if args.cprofile:
+        os.makedirs(args.cprofile, exist_ok=True)
     
-    success_count = 0
+    options = {'mode': args.mode, 'reader': args.reader, 'classify': args.classify}
+    outputs = {'encoding': args.encoding, 'binary': args.binary, 'shards': args.shards,
+               'charts': args.charts, 'days': args.days, 'compress': args.compress}
+    all_units = [(station['name'], year, options) for year in years for station in STATIONS]
     
-    for station in stations:
-        station_name = station['name']
-        print(f"Processing {station_name.upper()} for year {year}...")
+    # Skip units whose workbook, extractor and output are unchanged since the last build
+    manifest = build_cache.load_manifest()
+    # Every local module the extractor imports (lazily or not) can change the output bytes
+    extractor = build_cache.extractor_version(build_cache.local_imports(__file__),
+                                              {'encoding': args.encoding, 'classify': args.classify})
+    source_hashes = {}
+    units = []
+    skipped = []
+    for unit in all_units:
+        station_name, year, _ = unit
+        source_hash = build_cache.file_sha256(get_excel_path(station_name, year))
+        source_hashes[(station_name, year)] = source_hash
+        key = build_cache.unit_key(station_name, year)
+        output_files = get_output_paths(station_name, year, outputs)
+        if not args.force and build_cache.is_up_to_date(manifest, key, source_hash, extractor, output_files):
+            skipped.append(unit)
+        else:
+            units.append(unit)
+    
+    for station_name, year, _ in skipped:
+        print(f"⏭️  Skipping {station_name.upper()} for year {year} (unchanged)")
+    if skipped:
+        print()
+    
+    success_count = len(skipped)
+    rebuilt = []
+    profiles = []
+    started = datetime.now(timezone.utc)
+    worker = functools.partial(build_unit, outputs=outputs, profile=args.profile is not None,
+                               cprofile_dir=args.cprofile)
+    
+    for unit, ((count, output_files, sample), log, error, metrics) in run_units(units, jobs, worker):
+        station_name, year, _ = unit
+        print(log, end='')
+        if metrics:
+            profiles.append(metrics)
+        
+        if error is not None:
+            print(f"  ❌ Error processing {station_name}: {error}")
+            print()
+            continue
         
         try:
-            tides = extract_station_data(station_name, year)
-            
-            if tides:
-                # Save to JSON
-                output_file = f"{output_dir}{station_name}_{year}.json"
-                with open(output_file, 'w') as f:
-                    json.dump(tides, f, indent=2)
+            if count:
+                # The worker has already written the outputs
+                build_cache.record_unit(manifest, build_cache.unit_key(station_name, year),
+                                        get_excel_path(station_name, year), source_hashes[(station_name, year)],
+                                        extractor, output_files, count)
+                rebuilt.append(unit)
                 
-                print(f"  💾 Saved: {output_file}")
+                for output_file in output_files:
+                    print(f"  💾 Saved: {output_file}")
                 print(f"  📅 Sample data:")
-                if len(tides) >= 2:
-                    print(f"    {tides[0]['date']} {tides[0]['time']}: {tides[0]['height']}m ({tides[0]['type']})")
-                    print(f"    {tides[1]['date']} {tides[1]['time']}: {tides[1]['height']}m ({tides[1]['type']})")
+                for tide in sample:
+                    print(f"    {tide['date']} {tide['time']}: {tide['height']}m ({tide['type']})")
                 print()
                 success_count += 1
             else:
@@ -222,11 +715,46 @@ def main():
             print(f"  ❌ Error processing {station_name}: {e}")
             print()
     
+    if rebuilt:
+        build_cache.save_manifest(manifest)
+    
+    if profiles:
+        elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+        save_profile(args.profile, profiles, started, elapsed, jobs, options, outputs)
+    
+    if args.timeline:
+        import tide_timeline
+        results = tide_timeline.build_all(stations=[station['name'] for station in STATIONS])
+        print(f"🧵 Stitching {len(results)} stations across years")
+        tide_timeline.print_build(results)
+        compress_outputs([path for path, _, _ in results.values()], args.compress)
+        print()
+    
+    if args.validate:
+        import tide_validate
+        paths = [get_output_path(station_name, year) for station_name, year, _ in all_units]
+        paths = [path for path in paths if os.path.exists(path)]
+        print(f"🔎 Validating {len(paths)} station-years")
+        failed = tide_validate.print_report(tide_validate.validate_paths(paths, jobs))
+        print(f"{'✅' if not failed else '⚠️ '} {len(paths) - failed}/{len(paths)} clean "
+              f"(python3 tide_validate.py -v for details)")
+        print()
+    
+    if args.deploy is not None:
+        import tide_deploy
+        paths = [get_output_path(station_name, year) for station_name, year, _ in all_units]
+        print(f"🚚 Deploying {len(paths)} station-years")
+        tide_deploy.deploy_all([path for path in paths if os.path.exists(path)], args.deploy or ['app'])
+        print()
+    
     print("🎉 EXTRACTION COMPLETE!")
-    print(f"✅ Successfully processed {success_count}/{len(stations)} stations")
-    print(f"📱 Deploy the JSON files from ../Data/{year}/ to your iOS app")
+    print(f"✅ Successfully processed {success_count}/{len(all_units)} stations")
+    print(f"🔁 Rebuilt {len(rebuilt)}, ⏭️  skipped {len(skipped)} unchanged")
+    if args.deploy is None:
+        for year in years:
+            print(f"📱 Deploy the JSON files from ../Data/{year}/ to your iOS app: python3 tide_deploy.py --years {year}")
     
-    if success_count < len(stations):
+    if success_count < len(all_units):
         print()
         print("⚠️  Some extractions failed. Check that:")
         print("   1. Excel files exist in the correct folder")
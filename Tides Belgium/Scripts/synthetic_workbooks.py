@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+synthetic_workbooks.py
+
+Generate synthetic tide workbooks for benchmarking the extractors.
+
+write_belgian_workbook() reproduces the layout of the official
+xlsx-getijtabellen-taw files: six two-month sheets, three header rows, the
+first month's days 1-15/16-31 under day columns 1/8 and the second month's
+under 15/22, Hoogwater/Laagwater time+height pairs, a continuation row for the
+second tide of each kind and a blank separator row per day, then the footer.
+Tides come from a simple semidiurnal model with a spring-neap cycle, so every
+day has three or four events like the real tables.
+
+write_tabular_workbook() writes the same events as one Datum/Tijd/Hoogte/Type
+table, the input excel_to_json.py expects.
+
+write_format_workbook() is a Belgian workbook whose first days have their
+HW time in other number formats (General, elapsed [h]:mm, a date, text
+with a literal 'h', ...). --check-readers extracts it with every reader and
+fails unless the fast and grid readers agree with openpyxl on which of
+those cells are times.
+
+Usage:
+  python3 synthetic_workbooks.py --stations 50 --years 10 --out ../SourceData/synthetic
+  python3 synthetic_workbooks.py --check-readers
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+import openpyxl
+
+SHEETS = ['jan-feb', 'mrt-apr', 'mei-jun', 'jul-aug', 'sept-okt', 'nov-dec']
+MONTH_NAMES = ['januari', 'februari', 'maart', 'april', 'mei', 'juni',
+               'juli', 'augustus', 'september', 'oktober', 'november', 'december']
+WEEKDAYS = ['ma', 'di', 'wo', 'do', 'vr', 'za', 'zo']
+
+FIRST_DATA_ROW = 4
+ROWS_PER_DAY = 3            # main row, continuation row, blank separator
+DAY_SLOTS = 16              # days 1-15 beside days 16-31
+FOOTER_ROW = FIRST_DATA_ROW + DAY_SLOTS * ROWS_PER_DAY
+DATA_ROWS_PER_SHEET = FOOTER_ROW - FIRST_DATA_ROW + 1
+FOOTER = "Alle tijden worden in 'lokale tijd' uitgedrukt. Tijden op gekleurde achtergrond zijn in zomertijd."
+
+# Per month within a sheet: (day column for days 1-15, day column for days 16-31)
+DAY_COLUMNS = [(1, 8), (15, 22)]
+MONTH_LABEL_COLUMNS = [13, 27]
+
+# HW time cells of jan-feb days 1, 2, ... rewritten by write_format_workbook: (value, number format);
+# None keeps the generated time
+FORMAT_CASES = [
+    (0.5, 'General'),           # a number, not a time
+    (0, 'General'),
+    (0.25, '[h]:mm'),           # elapsed time: openpyxl gives a timedelta
+    (1.25, 'h:mm'),             # a date and time, not a time of day
+    (0.3125, 'hh"u"mm'),        # literal text around a time format
+    (0.5, '0.00" h"'),          # a number whose format only quotes an h
+    (None, 'mm:ss'),            # built-in format 45
+    (None, 'h:mm AM/PM'),       # built-in format 18
+    ('07:15', 'General'),       # text
+]
+
+M2_PERIOD = 12 * 60 + 25            # minutes between successive high waters
+SPRING_NEAP_PERIOD = 14.77 * 24 * 60
+
+
+def station_names(count):
+    return [f'station{i:02d}' for i in range(1, count + 1)]
+
+
+def workbook_path(out_dir, station_name, year):
+    return os.path.join(out_dir, str(year), f'{station_name.capitalize()}_{year}_mTAW.xlsx')
+
+
+def generate_tides(station_name, year):
+    """Model one year of HW/LW events as (datetime, height, is_high) tuples"""
+    seed = sum(ord(ch) for ch in station_name)
+    phase = (seed * 37) % M2_PERIOD
+    mean_high = 4.2 + (seed % 7) * 0.05
+    mean_low = 0.4 - (seed % 5) * 0.04
+
+    start = datetime(year, 1, 1)
+    minutes_in_year = (datetime(year + 1, 1, 1) - start).days * 24 * 60
+
+    events = []
+    minute = phase - M2_PERIOD
+    while minute < minutes_in_year:
+        spring = math.cos(2 * math.pi * minute / SPRING_NEAP_PERIOD)
+        for offset, is_high in ((0, True), (M2_PERIOD // 2 + 6, False)):
+            at = minute + offset
+            if 0 <= at < minutes_in_year:
+                height = mean_high + 0.4 * spring if is_high else mean_low - 0.3 * spring
+                events.append((start + timedelta(minutes=at), round(height, 2), is_high))
+        minute += M2_PERIOD
+    return events
+
+
+def _tides_by_day(events):
+    days = {}
+    for moment, height, is_high in events:
+        days.setdefault(moment.date(), ([], []))[0 if is_high else 1].append((moment.time(), height))
+    return days
+
+
+def write_belgian_workbook(path, station_name, year, events=None):
+    """Write one station-year in the official Belgian two-months-per-sheet layout"""
+    events = events if events is not None else generate_tides(station_name, year)
+    days = _tides_by_day(events)
+
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for sheet_idx, sheet_name in enumerate(SHEETS):
+        ws = wb.create_sheet(sheet_name)
+        for month_idx, (first_col, second_col) in enumerate(DAY_COLUMNS):
+            month = sheet_idx * 2 + month_idx + 1
+            ws.cell(row=1, column=first_col, value=station_name.upper())
+            ws.cell(row=1, column=MONTH_LABEL_COLUMNS[month_idx], value=f' {MONTH_NAMES[month - 1]} {year}')
+
+            for day_col in (first_col, second_col):
+                ws.cell(row=2, column=day_col + 2, value='Hoogwater')
+                ws.cell(row=2, column=day_col + 4, value='Laagwater')
+                ws.cell(row=3, column=day_col, value='Datum')
+                for col in (day_col + 2, day_col + 4):
+                    ws.cell(row=3, column=col, value='uu:mm')
+                    ws.cell(row=3, column=col + 1, value='m TAW')
+
+            for day in range(1, 32):
+                try:
+                    current = date(year, month, day)
+                except ValueError:
+                    continue
+                day_col = first_col if day <= 15 else second_col
+                row = FIRST_DATA_ROW + ((day - 1) if day <= 15 else (day - 16)) * ROWS_PER_DAY
+                ws.cell(row=row, column=day_col, value=day)
+                ws.cell(row=row, column=day_col + 1, value=WEEKDAYS[current.weekday()])
+
+                for kind, tides in enumerate(days.get(current, ([], []))):
+                    time_col = day_col + 2 + kind * 2
+                    for slot in range(2):
+                        if slot < len(tides):
+                            tide_time, height = tides[slot]
+                            time_cell = ws.cell(row=row + slot, column=time_col, value=tide_time)
+                            time_cell.number_format = 'h:mm'
+                            ws.cell(row=row + slot, column=time_col + 1, value=height)
+                        elif slot == 1:
+                            ws.cell(row=row + slot, column=time_col, value='-')
+                            ws.cell(row=row + slot, column=time_col + 1, value='-')
+
+            ws.cell(row=FOOTER_ROW, column=first_col, value=FOOTER)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    wb.save(path)
+    return path
+
+
+def write_tabular_workbook(path, station_name, year, events=None):
+    """Write one station-year as a single Datum/Tijd/Hoogte/Type table"""
+    events = events if events is not None else generate_tides(station_name, year)
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(['Datum', 'Tijd', 'Hoogte', 'Type'])
+    for moment, height, is_high in events:
+        ws.append([moment.strftime('%Y-%m-%d'), moment.strftime('%H:%M'), height, 'HW' if is_high else 'LW'])
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    wb.save(path)
+    return path
+
+
+def write_format_workbook(path, station_name='formats', year=2025):
+    """Write a Belgian workbook whose first HW time cells use the FORMAT_CASES number formats"""
+    write_belgian_workbook(path, station_name, year)
+    wb = openpyxl.load_workbook(path)
+    ws = wb[SHEETS[0]]
+    time_col = DAY_COLUMNS[0][0] + 2
+    for day, (value, number_format) in enumerate(FORMAT_CASES, start=1):
+        cell = ws.cell(row=FIRST_DATA_ROW + (day - 1) * ROWS_PER_DAY, column=time_col)
+        if value is not None:
+            cell.value = value
+        cell.number_format = number_format
+    wb.save(path)
+    return path
+
+
+def check_readers(year=2025):
+    """Extract write_format_workbook() with every reader, returning True if all match openpyxl"""
+    import extract_year_data
+
+    variants = [('openpyxl', 'stream'), ('openpyxl', 'cell'), ('fast', 'stream'), ('grid', 'stream')]
+    with tempfile.TemporaryDirectory() as workdir:
+        path = write_format_workbook(os.path.join(workdir, f'Formats_{year}_mTAW.xlsx'), year=year)
+        results = {}
+        for reader, mode in variants:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[reader, mode] = extract_year_data.extract_station_data('formats', year, mode, reader, path)
+
+    expected = results[variants[0]]
+    print(f"🔍 {len(FORMAT_CASES)} HW time cells in other number formats, {len(expected)} tides from openpyxl")
+    all_match = True
+    for (reader, mode), tides in results.items():
+        differ = [tide for tide in tides if tide not in expected] + [tide for tide in expected if tide not in tides]
+        all_match &= not differ
+        print(f"  {'✅' if not differ else '❌'} {reader}/{mode}: {len(tides)} tides, {len(differ)} differ")
+        for tide in differ[:5]:
+            print(f"      {tide['date']} {tide['time']}: {tide['height']}m ({tide['type']})")
+    return all_match
+
+
+def generate_set(out_dir, stations, years, start_year=2025, tabular=False):
+    """Generate (or reuse) workbooks for stations x years, returning [(station, year, path)]"""
+    units = []
+    for year in range(start_year, start_year + years):
+        for station_name in station_names(stations):
+            path = workbook_path(out_dir, station_name, year)
+            if tabular:
+                path = path.replace('_mTAW.xlsx', '_table.xlsx')
+            if not os.path.exists(path):
+                writer = write_tabular_workbook if tabular else write_belgian_workbook
+                writer(path, station_name, year)
+            units.append((station_name, year, path))
+    return units
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Belgian tide workbooks")
+    parser.add_argument("--stations", type=int, default=4, help="Number of stations")
+    parser.add_argument("--years", type=int, default=1, help="Number of consecutive years")
+    parser.add_argument("--start-year", type=int, default=2025, help="First year")
+    parser.add_argument("--out", default="../SourceData/synthetic", help="Output directory")
+    parser.add_argument("--tabular", action="store_true", help="Write Datum/Tijd/Hoogte/Type tables instead")
+    parser.add_argument("--check-readers", action="store_true",
+                        help="Check every extractor reader treats non-time number formats like openpyxl, writing nothing")
+    args = parser.parse_args()
+
+    if args.check_readers:
+        sys.exit(0 if check_readers(args.start_year) else 1)
+
+    units = generate_set(args.out, args.stations, args.years, args.start_year, args.tabular)
+    print(f"✅ {len(units)} workbooks in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
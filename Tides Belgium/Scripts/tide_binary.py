@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+tide_binary.py
+
+Fixed-width columnar binary format for one station-year of tides.
+
+Layout (little-endian):
+  header   16 bytes   magic b'TIDE', version u16, flags u16, count u32, year u16, reserved u16
+  epoch    4 * count  int32  minutes since 1970-01-01 00:00 (local tide-table time)
+  height   2 * count  int16  height in centimetres TAW
+  type     1 * count  uint8  bitmask, see TYPE_* below
+
+Each column starts at an offset aligned to its item size, so a reader can map
+the file and expose the columns as memoryviews without copying or parsing.
+
+Usage (optional):
+  python3 tide_binary.py ../Data/2025/oostende_2025.tide
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from datetime import date
+from functools import lru_cache
+
+MAGIC = b'TIDE'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHIHH')
+
+TYPE_HIGH = 0x01
+TYPE_LOW = 0x02
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MINUTES_PER_DAY = 24 * 60
+
+
+# A few events share each day, so the date conversions are cached per day
+@lru_cache(maxsize=4096)
+def _day_minutes(date_str):
+    days = date(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10])).toordinal() - EPOCH_ORDINAL
+    return days * MINUTES_PER_DAY
+
+
+@lru_cache(maxsize=4096)
+def _day_iso(days):
+    return date.fromordinal(EPOCH_ORDINAL + days).isoformat()
+
+
+def epoch_minutes(date_str, time_str):
+    """Convert 'YYYY-MM-DD' and 'HH:MM' to minutes since 1970-01-01 00:00"""
+    return _day_minutes(date_str) + int(time_str[0:2]) * 60 + int(time_str[3:5])
+
+
+def format_epoch_minutes(minutes):
+    """Convert minutes since the epoch back to ('YYYY-MM-DD', 'HH:MM')"""
+    days, minute_of_day = divmod(minutes, MINUTES_PER_DAY)
+    return _day_iso(days), f'{minute_of_day // 60:02d}:{minute_of_day % 60:02d}'
+
+
+def encode_columns(tides):
+    """Split JSON tide entries into (epoch, height_cm, type) arrays"""
+    epochs = array('i', (epoch_minutes(t['date'], t['time']) for t in tides))
+    heights = array('h', (int(round(t['height'] * 100)) for t in tides))
+    types = array('B', (TYPE_HIGH if t['type'] == 'high' else TYPE_LOW for t in tides))
+    return epochs, heights, types
+
+
+def _column_offsets(count):
+    epoch_offset = HEADER.size
+    height_offset = epoch_offset + 4 * count
+    type_offset = height_offset + 2 * count
+    return epoch_offset, height_offset, type_offset
+
+
+def write_tides_binary(tides, path, year=0):
+    """Write tide entries to a columnar binary file"""
+    write_columns_binary(*encode_columns(tides), path, year)
+
+
+def encode_columns_binary(epochs, heights, types, year=0):
+    """Encode epoch/height/type arrays (array('i'), array('h'), array('B')) as the columnar binary format"""
+    if sys.byteorder != 'little':
+        epochs = array('i', epochs)
+        heights = array('h', heights)
+        epochs.byteswap()
+        heights.byteswap()
+    return b''.join((HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(epochs), year, 0),
+                     epochs.tobytes(), heights.tobytes(), types.tobytes()))
+
+
+def write_columns_binary(epochs, heights, types, path, year=0):
+    """Write epoch/height/type arrays (array('i'), array('h'), array('B')) to a columnar binary file"""
+    with open(path, 'wb') as f:
+        f.write(encode_columns_binary(epochs, heights, types, year))
+
+
+def decode_columns_binary(data):
+    """Decode columnar binary bytes (e.g. a decompressed .tide) to (epochs, heights_cm, types, year) arrays"""
+    magic, version, _, count, year, _ = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a binary tide file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported format version {version}")
+    epoch_offset, height_offset, type_offset = _column_offsets(count)
+    epochs = array('i', data[epoch_offset:height_offset])
+    heights = array('h', data[height_offset:type_offset])
+    if sys.byteorder != 'little':
+        epochs.byteswap()
+        heights.byteswap()
+    return epochs, heights, array('B', data[type_offset:type_offset + count]), year
+
+
+class TideColumns:
+    """Memory-mapped columns of a binary tide file
+
+    epochs, heights_cm and types are memoryviews straight onto the mapped
+    file on little-endian hosts (arrays on big-endian ones). Call close(),
+    or use as a context manager, to release the mapping.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.flags, self.count, self.year, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a binary tide file")
+        if version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} has unsupported format version {version}")
+
+        epoch_offset, height_offset, type_offset = _column_offsets(self.count)
+        view = memoryview(self._mmap)
+        self._view = view
+        self.epochs = self._column(view[epoch_offset:height_offset], 'i')
+        self.heights_cm = self._column(view[height_offset:type_offset], 'h')
+        self.types = view[type_offset:type_offset + self.count]
+
+    @staticmethod
+    def _column(raw, fmt):
+        if sys.byteorder == 'little':
+            return raw.cast(fmt)
+        values = array(fmt, raw.tobytes())
+        values.byteswap()
+        return values
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for name in ('epochs', 'heights_cm', 'types', '_view'):
+            column = getattr(self, name, None)
+            if isinstance(column, memoryview):
+                column.release()
+        self._mmap.close()
+
+    def to_tides(self):
+        """Decode back to the JSON entry format"""
+        tides = []
+        for minutes, height_cm, tide_type in zip(self.epochs, self.heights_cm, self.types):
+            date_str, time_str = format_epoch_minutes(minutes)
+            tides.append({
+                'date': date_str,
+                'time': time_str,
+                'height': height_cm / 100,
+                'type': 'high' if tide_type & TYPE_HIGH else 'low'
+            })
+        return tides
+
+
+def read_tides_binary(path):
+    """Read a binary tide file back into JSON-format entries"""
+    with TideColumns(path) as columns:
+        return columns.to_tides()
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python3 tide_binary.py FILE.tide")
+        sys.exit(1)
+
+    with TideColumns(sys.argv[1]) as columns:
+        print(f"📦 {sys.argv[1]}: {len(columns)} tides for {columns.year}")
+        for i in range(min(4, len(columns))):
+            date_str, time_str = format_epoch_minutes(columns.epochs[i])
+            print(f"    {date_str} {time_str}: {columns.heights_cm[i] / 100}m (type {columns.types[i]:#04x})")
+
+
+if __name__ == "__main__":
+    main()
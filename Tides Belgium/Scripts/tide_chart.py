@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+tide_chart.py
+
+Precomputed multi-resolution chart points for one station-year.
+
+The water level is evaluated once on a dense 1-minute grid (cosine
+interpolation, see tide_heights.py) and cut into fixed tiles per zoom level:
+
+  day     1 day per tile    96 points
+  3day    3 days per tile  144 points
+  week    7 days per tile  168 points
+
+Tiles start at midnight on 1 January and include the next tile's first
+minute, so adjacent tiles join up. Each tile is downsampled to its point
+budget with Largest-Triangle-Three-Buckets, which keeps the HW/LW turning
+points a plain stride would cut off. LTTB is sequential within a tile, so
+it runs bucket by bucket with every tile of a level processed at once.
+
+Output, next to the other station-year files in ../Data/{year}/charts/:
+
+  {station}_{year}.chart        per level: uint16 minute-in-tile block, then int16 cm block,
+                                each tiles x points, little-endian
+  {station}_{year}_chart.json   index: first_epoch, and per level days, points, tiles and
+                                the byte offsets of both blocks
+
+Every tile at a level has the same size, so a chart lookup is one offset
+computation. Heights with no events nearby are stored as MISSING_CM.
+
+Usage (optional):
+  python3 tide_chart.py ../Data/2025/charts/oostende_2025_chart.json day 2025-07-11
+"""
+
+import json
+import os
+import sys
+import warnings
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit("numpy is required: pip install numpy")
+
+import tide_compress
+from tide_binary import EPOCH_ORDINAL, MINUTES_PER_DAY, epoch_minutes, format_epoch_minutes
+from tide_heights import HeightCurve
+
+INDEX_VERSION = 1
+STEP_MINUTES = 1
+MISSING_CM = -32768
+
+# name -> (days per tile, points per tile)
+LEVELS = {
+    'day': (1, 96),
+    '3day': (3, 144),
+    'week': (7, 168),
+}
+
+
+def get_chart_dir(year, data_dir='../Data'):
+    return os.path.join(data_dir, str(year), 'charts')
+
+
+def get_chart_path(station_name, year, data_dir='../Data'):
+    return os.path.join(get_chart_dir(year, data_dir), f'{station_name}_{year}.chart')
+
+
+def get_index_path(station_name, year, data_dir='../Data'):
+    return os.path.join(get_chart_dir(year, data_dir), f'{station_name}_{year}_chart.json')
+
+
+def lttb(x, y, points):
+    """Largest-Triangle-Three-Buckets over the rows of y, returning selected column indices
+
+    x has shape (n,) and is shared by all rows; y has shape (rows, n). The
+    first and last samples are always kept. NaN samples never win a bucket
+    unless the whole bucket is NaN.
+    """
+    rows, n = y.shape
+    if points >= n:
+        return np.broadcast_to(np.arange(n), (rows, n)).copy()
+
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    selected = np.empty((rows, points), dtype=np.int64)
+    selected[:, 0] = 0
+    selected[:, -1] = n - 1
+    row_index = np.arange(rows)
+
+    previous = np.zeros(rows, dtype=np.int64)
+    for b in range(points - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            next_lo, next_hi = edges[b + 1], edges[b + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)   # all-NaN next bucket
+            cx = x[next_lo:next_hi].mean()
+            cy = np.nanmean(y[:, next_lo:next_hi], axis=1)
+
+        ax = x[previous]
+        ay = y[row_index, previous]
+        bx = x[lo:hi]
+        by = y[:, lo:hi]
+        with np.errstate(invalid='ignore'):
+            area = np.abs((ax - cx)[:, None] * (by - ay[:, None]) - (ax[:, None] - bx) * (cy - ay)[:, None])
+        area[np.isnan(area)] = -1.0
+
+        previous = lo + np.argmax(area, axis=1)
+        selected[:, b + 1] = previous
+    return selected
+
+
+def build_levels(tides, year):
+    """Evaluate the dense curve and downsample every level, returning {name: (minutes, heights_cm)}"""
+    epochs = np.array([epoch_minutes(t['date'], t['time']) for t in tides], dtype=np.float64)
+    heights = np.array([t['height'] for t in tides], dtype=np.float64)
+    curve = HeightCurve(epochs, heights)
+
+    first_epoch = (date(year, 1, 1).toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY
+    year_days = date(year + 1, 1, 1).toordinal() - date(year, 1, 1).toordinal()
+    longest = max(days for days, _ in LEVELS.values())
+    padded_days = -(-year_days // longest) * longest
+    dense = curve.heights_at(first_epoch + np.arange(0, padded_days * MINUTES_PER_DAY + 1, STEP_MINUTES))
+
+    levels = {}
+    for name, (days, points) in LEVELS.items():
+        width = days * MINUTES_PER_DAY // STEP_MINUTES
+        tiles = -(-year_days // days)
+        # Overlapping (tiles, width + 1) view: each tile ends on the next one's first sample
+        windows = np.lib.stride_tricks.sliding_window_view(dense, width + 1)[::width][:tiles]
+        x = np.arange(width + 1, dtype=np.float64)
+        selected = lttb(x, windows, points)
+
+        picked = np.take_along_axis(windows, selected, axis=1)
+        heights_cm = np.where(np.isnan(picked), MISSING_CM, np.round(picked * 100)).astype('<i2')
+        levels[name] = ((selected * STEP_MINUTES).astype('<u2'), heights_cm)
+    return first_epoch, levels
+
+
+def write_chart(tides, station_name, year, data_dir='../Data'):
+    """Write the chart file and then its index, returning [index path, chart path]
+
+    Both go through a temporary file and os.replace, and the index is
+    replaced last, so a reader never maps a partial chart through it.
+    """
+    first_epoch, levels = build_levels(tides, year)
+    chart_path = get_chart_path(station_name, year, data_dir)
+    os.makedirs(os.path.dirname(chart_path), exist_ok=True)
+
+    index_levels = {}
+    offset = 0
+    tmp_path = chart_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        for name, (minutes, heights_cm) in levels.items():
+            days, points = LEVELS[name]
+            f.write(minutes.tobytes())
+            f.write(heights_cm.tobytes())
+            index_levels[name] = {
+                'days': days,
+                'points': points,
+                'tiles': len(minutes),
+                'minutes_offset': offset,
+                'heights_offset': offset + minutes.nbytes,
+            }
+            offset += minutes.nbytes + heights_cm.nbytes
+    os.replace(tmp_path, chart_path)
+
+    index = {
+        'version': INDEX_VERSION,
+        'station': station_name,
+        'year': year,
+        'path': os.path.basename(chart_path),
+        'first_epoch': first_epoch,
+        'missing_cm': MISSING_CM,
+        'levels': index_levels,
+    }
+    index_path = get_index_path(station_name, year, data_dir)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+    return [index_path, chart_path]
+
+
+class ChartPyramid:
+    """Read tiles of a chart file through its index without loading the whole file"""
+
+    def __init__(self, index_path):
+        self.index = json.loads(tide_compress.read_bytes(index_path))
+        if self.index.get('version') != INDEX_VERSION:
+            raise ValueError(f"{index_path} has unsupported index version {self.index.get('version')}")
+        self.path = os.path.join(os.path.dirname(index_path), self.index['path'])
+        # A compressed chart cannot be mapped, so it is decompressed into memory once
+        self._data = None if os.path.exists(self.path) else tide_compress.read_bytes(self.path)
+
+    def _column(self, dtype, offset, shape):
+        if self._data is None:
+            return np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=shape)
+        return np.frombuffer(self._data, dtype=dtype, count=shape[0] * shape[1], offset=offset).reshape(shape)
+
+    def tile(self, level, day):
+        """Return (epoch minutes, heights in m or NaN) of the tile containing day ('YYYY-MM-DD' or date)"""
+        info = self.index['levels'][level]
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        day_number = (day.toordinal() - EPOCH_ORDINAL) - self.index['first_epoch'] // MINUTES_PER_DAY
+        tile = day_number // info['days']
+        if not 0 <= tile < info['tiles']:
+            raise IndexError(f"{day} is outside this chart")
+
+        shape = (info['tiles'], info['points'])
+        minutes = self._column('<u2', info['minutes_offset'], shape)[tile]
+        heights = self._column('<i2', info['heights_offset'], shape)[tile]
+        start = self.index['first_epoch'] + tile * info['days'] * MINUTES_PER_DAY
+        values = np.where(heights == self.index['missing_cm'], np.nan, heights / 100)
+        return start + minutes.astype(np.int64), values
+
+
+def main():
+    if len(sys.argv) != 4:
+        print("Usage: python3 tide_chart.py INDEX.json LEVEL DATE")
+        print("Example: python3 tide_chart.py ../Data/2025/charts/oostende_2025_chart.json day 2025-07-11")
+        sys.exit(1)
+
+    index_path, level, day = sys.argv[1:]
+    epochs, heights = ChartPyramid(index_path).tile(level, day)
+    print(f"📈 {level} tile containing {day}: {len(epochs)} points")
+    for minutes, height in zip(epochs.tolist(), heights.tolist()):
+        date_str, time_str = format_epoch_minutes(minutes)
+        print(f"    {date_str} {time_str}: {height:.2f}m")
+
+
+if __name__ == "__main__":
+    main()
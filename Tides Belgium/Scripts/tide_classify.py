@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+tide_classify.py
+
+Classify high and low water by extremum alternation instead of a fixed height
+threshold.
+
+The extractors label a tide 'high' when height >= 2.5 m (2.0 m in
+excel_to_json), which mislabels weak high waters and strong low waters. Here
+the whole sorted station-year series is labelled in one vectorised pass:
+
+  1. The series is split into segments wherever two consecutive events are
+     more than max_gap minutes apart (a missing event or a gap in the table).
+  2. Within a segment HW and LW must alternate, so only the parity is open:
+     highs sit on the even or on the odd positions, whichever has the larger
+     mean height. Single-event segments fall back to the threshold.
+  3. Every event is flagged where its label disagrees with the old threshold,
+     and where it is not a local extremum relative to its in-segment
+     neighbours (a sign of a bad height or time in the source).
+
+Usage:
+  python3 tide_classify.py ../Data/2025/*.json            # report only
+  python3 tide_classify.py ../Data/2025/*.json --write    # rewrite types in place
+"""
+
+import argparse
+import json
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit("numpy is required: pip install numpy")
+
+from tide_binary import epoch_minutes
+
+DEFAULT_THRESHOLD = 2.5
+DEFAULT_MAX_GAP = 9 * 60   # HW->LW is ~6h12m; a longer gap means an event is missing
+
+
+def series_arrays(tides):
+    """Return (epoch minutes, heights) arrays for JSON tide entries"""
+    t = np.fromiter((epoch_minutes(tide['date'], tide['time']) for tide in tides), dtype=np.int64, count=len(tides))
+    h = np.fromiter((tide['height'] for tide in tides), dtype=np.float64, count=len(tides))
+    return t, h
+
+
+def classify_arrays(t, h, threshold=DEFAULT_THRESHOLD, max_gap=DEFAULT_MAX_GAP):
+    """Label a sorted series, returning a dict of boolean arrays
+
+    high                   True for high water
+    disagrees_threshold    label differs from height >= threshold
+    not_extremum           event is not above (HW) / below (LW) its in-segment neighbours
+    segment_start          first event of each gap-free segment
+    """
+    n = len(t)
+    if n == 0:
+        empty = np.zeros(0, dtype=bool)
+        return {'high': empty, 'disagrees_threshold': empty, 'not_extremum': empty, 'segment_start': empty}
+
+    # Segments of events close enough that HW/LW must alternate
+    breaks = np.diff(t) > max_gap
+    segment_start = np.concatenate(([True], breaks))
+    segment_id = np.cumsum(segment_start) - 1
+    starts = np.flatnonzero(segment_start)
+    lengths = np.diff(np.append(starts, n))
+    position = np.arange(n) - starts[segment_id]
+    odd = (position & 1).astype(bool)
+
+    # Mean height on even and odd positions per segment decides the parity of the highs
+    even_sum = np.bincount(segment_id, weights=np.where(odd, 0.0, h))
+    odd_sum = np.bincount(segment_id, weights=np.where(odd, h, 0.0))
+    even_count = np.bincount(segment_id, weights=~odd)
+    odd_count = np.bincount(segment_id, weights=odd)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        highs_on_odd = (odd_sum / odd_count) > (even_sum / even_count)
+
+    high = odd == highs_on_odd[segment_id]
+
+    # Isolated events have no neighbour to compare with
+    single = (lengths == 1)[segment_id]
+    high[single] = h[single] >= threshold
+
+    # Local-extremum check against in-segment neighbours
+    prev_h = np.concatenate(([np.nan], h[:-1]))
+    next_h = np.concatenate((h[1:], [np.nan]))
+    prev_h[segment_start] = np.nan
+    next_h[np.append(segment_start[1:], True)] = np.nan
+    with np.errstate(invalid='ignore'):
+        above = ~(h <= prev_h) & ~(h <= next_h)
+        below = ~(h >= prev_h) & ~(h >= next_h)
+    not_extremum = np.where(high, ~above, ~below) & ~single
+
+    return {
+        'high': high,
+        'disagrees_threshold': high != (h >= threshold),
+        'not_extremum': not_extremum,
+        'segment_start': segment_start,
+    }
+
+
+def classify_tides(tides, threshold=DEFAULT_THRESHOLD, max_gap=DEFAULT_MAX_GAP):
+    """Return relabelled copies of sorted JSON tide entries plus the classification flags"""
+    t, h = series_arrays(tides)
+    result = classify_arrays(t, h, threshold, max_gap)
+    labelled = [dict(tide, type='high' if is_high else 'low') for tide, is_high in zip(tides, result['high'].tolist())]
+    return labelled, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify HW/LW by extremum alternation")
+    parser.add_argument("paths", nargs='+', help="Station-year JSON files")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Old fixed threshold to compare against (m)")
+    parser.add_argument("--max-gap", type=int, default=DEFAULT_MAX_GAP,
+                        help="Minutes between events beyond which alternation is not enforced")
+    parser.add_argument("--write", action="store_true", help="Rewrite the type field in place")
+    parser.add_argument("--verbose", "-v", action="store_true", help="List every flagged event")
+    args = parser.parse_args()
+
+    total_flagged = 0
+    for path in args.paths:
+        with open(path) as f:
+            tides = json.load(f)
+        labelled, result = classify_tides(tides, args.threshold, args.max_gap)
+
+        relabelled = sum(1 for old, new in zip(tides, labelled) if old['type'] != new['type'])
+        disagrees = int(result['disagrees_threshold'].sum())
+        not_extremum = int(result['not_extremum'].sum())
+        segments = int(result['segment_start'].sum())
+        total_flagged += disagrees + not_extremum
+
+        status = '✅' if disagrees == 0 and not_extremum == 0 else '⚠️ '
+        print(f"{status} {path}: {len(tides)} events, {segments} segments, "
+              f"{disagrees} disagree with {args.threshold}m threshold, "
+              f"{not_extremum} not local extrema, {relabelled} relabelled")
+
+        if args.verbose:
+            for i in np.flatnonzero(result['disagrees_threshold'] | result['not_extremum']):
+                tide = labelled[i]
+                reasons = [name for name in ('disagrees_threshold', 'not_extremum') if result[name][i]]
+                print(f"    {tide['date']} {tide['time']}: {tide['height']}m -> {tide['type']} ({', '.join(reasons)})")
+
+        if args.write and relabelled:
+            with open(path, 'w') as f:
+                json.dump(labelled, f, indent=2)
+            print(f"  💾 Rewrote {path}")
+
+    sys.exit(0 if total_flagged == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+tide_compress.py
+
+Precompressed variants of the station-year outputs.
+
+The outputs are highly repetitive (the same keys, dates and a few hundred
+distinct heights over and over), so they compress well. With --compress
+the extractor writes {output}.gz, .bz2 and/or .xz next to every output it
+writes, JSON and binary alike. The variants are deterministic (no
+timestamps in the gzip header), so an unchanged output gives byte-identical
+variants and the build cache and deploy hashes stay stable.
+
+read_bytes() is the transparent loader: it accepts a plain or compressed
+path, recognises the codec by its magic bytes, and when the plain file is
+missing falls back to its compressed variants. tide_encodings.load,
+tide_store.load_columns, tide_shards, tide_days and tide_chart read through
+it. bench_compression.py measures ratio against decompress-plus-decode time.
+
+Usage (optional):
+  python3 tide_compress.py ../Data/2025/oostende_2025.json --codecs gzip lzma
+  python3 tide_compress.py ../Data/2025/*.json            # all codecs
+"""
+
+import argparse
+import bz2
+import gzip
+import lzma
+import os
+
+CODECS = {
+    'gzip': {'suffix': '.gz', 'magic': b'\x1f\x8b',
+             'compress': lambda data: gzip.compress(data, 9, mtime=0), 'decompress': gzip.decompress},
+    'bz2': {'suffix': '.bz2', 'magic': b'BZh',
+            'compress': lambda data: bz2.compress(data, 9), 'decompress': bz2.decompress},
+    'lzma': {'suffix': '.xz', 'magic': b'\xfd7zXZ\x00',
+             'compress': lambda data: lzma.compress(data, preset=9), 'decompress': lzma.decompress},
+}
+
+
+def compressed_path(path, codec):
+    return path + CODECS[codec]['suffix']
+
+
+def plain_path(path):
+    """Strip a codec suffix, if any"""
+    for codec in CODECS.values():
+        if path.endswith(codec['suffix']):
+            return path[:-len(codec['suffix'])]
+    return path
+
+
+def detect(data):
+    """Return the codec name of compressed data, or None for plain data"""
+    for name, codec in CODECS.items():
+        if data.startswith(codec['magic']):
+            return name
+    return None
+
+
+def compress(data, codec):
+    return CODECS[codec]['compress'](data)
+
+
+def decompress(data):
+    """Decompress data in any of the CODECS; plain data is returned as is"""
+    codec = detect(data)
+    return CODECS[codec]['decompress'](data) if codec else data
+
+
+def find_path(path):
+    """Return path if it exists, else its first existing compressed variant"""
+    if os.path.exists(path):
+        return path
+    for codec in CODECS:
+        variant = compressed_path(path, codec)
+        if os.path.exists(variant):
+            return variant
+    raise FileNotFoundError(path)
+
+
+def read_bytes(path):
+    """Read an output, plain or compressed, as its uncompressed bytes"""
+    with open(find_path(path), 'rb') as f:
+        return decompress(f.read())
+
+
+def write_variants(path, codecs):
+    """Write the compressed variants of one file, returning their paths"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    paths = []
+    for codec in codecs:
+        variant = compressed_path(path, codec)
+        tmp_path = variant + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(compress(data, codec))
+        os.replace(tmp_path, variant)
+        paths.append(variant)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write compressed variants of tide outputs")
+    parser.add_argument("paths", nargs='+', help="Output files to compress")
+    parser.add_argument("--codecs", nargs='+', choices=list(CODECS), default=list(CODECS),
+                        help="Codecs to write (default: all)")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        size = os.path.getsize(path)
+        sizes = ', '.join(f"{codec} {os.path.getsize(variant) / size:.1%}"
+                          for codec, variant in zip(args.codecs, write_variants(path, args.codecs)))
+        print(f"🗜️  {path}: {size / 1024:.0f} KiB -> {sizes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+tide_days.py
+
+Per-day summary index of one station-year, keyed by day of year.
+
+The Today/Tomorrow and table views only need per-day facts. Instead of
+filtering the whole year for them, {station}_{year}.days holds one
+fixed-width record per day of the year, so any day is one offset
+computation and one 28-byte read.
+
+Layout (little-endian):
+  header   12 bytes   magic b'TDAY', version u16, year u16, days u16 (366), record size u16
+  record   28 bytes   per day of year, 1 January first (day 366 is empty outside leap years)
+    count        u8       events that day (all of them, even beyond the four stored)
+    high_mask    u8       bit i (0-3) set when event i is high water, LAST_HIGH when the last event is
+    minutes      4 x u16  minute of day of the first four events in time order, NO_TIME if absent
+    heights      4 x i16  their heights in cm TAW
+    max_cm       i16      highest event that day
+    min_cm       i16      lowest event that day
+    range_cm     i16      max_cm - min_cm
+    last_minute  u16      minute of day of the last event (event count - 1)
+    last_cm      i16      its height in cm TAW
+
+HW/LW times and heights follow from the mask and the first event is event 0.
+The last event is stored separately, so it is right even on a day with
+more than four events, where only the first four are listed. Records are built from the sorted series
+in one vectorised pass (needs numpy); reading needs only the standard
+library.
+
+Usage (optional):
+  python3 tide_days.py ../Data/2025/oostende_2025.json            # write and verify the .days file
+  python3 tide_days.py ../Data/2025/oostende_2025.days 2025-07-11
+"""
+
+import os
+import struct
+import sys
+from datetime import date
+
+import tide_compress
+from tide_binary import EPOCH_ORDINAL, MINUTES_PER_DAY, TYPE_HIGH, encode_columns, format_epoch_minutes
+from tide_store import day_number
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b'TDAY'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sHHHH')
+RECORD = struct.Struct('<BB4H4hhhhHh')
+DAYS = 366
+EVENTS_PER_RECORD = 4
+NO_TIME = 0xFFFF
+LAST_HIGH = 0x80
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([
+        ('count', 'u1'),
+        ('high_mask', 'u1'),
+        ('minutes', '<u2', EVENTS_PER_RECORD),
+        ('heights', '<i2', EVENTS_PER_RECORD),
+        ('max_cm', '<i2'),
+        ('min_cm', '<i2'),
+        ('range_cm', '<i2'),
+        ('last_minute', '<u2'),
+        ('last_cm', '<i2'),
+    ])
+
+
+def get_days_path(station_name, year, data_dir='../Data'):
+    return f"{data_dir}/{year}/{station_name}_{year}.days"
+
+
+def build_records(epochs, heights_cm, types, year):
+    """Return the DAYS records of a sorted series as a structured numpy array"""
+    if np is None:
+        raise SystemExit("numpy is required: pip install numpy")
+    t = np.asarray(epochs, dtype=np.int64)
+    h = np.asarray(heights_cm, dtype=np.int16)
+    high = (np.asarray(types, dtype=np.uint8) & TYPE_HIGH) != 0
+
+    first_day = date(year, 1, 1).toordinal() - EPOCH_ORDINAL
+    day = t // MINUTES_PER_DAY - first_day
+    inside = (day >= 0) & (day < DAYS)
+    t, h, high, day = t[inside], h[inside], high[inside], day[inside]
+
+    records = np.zeros(DAYS, dtype=RECORD_DTYPE)
+    records['minutes'] = NO_TIME
+    records['last_minute'] = NO_TIME
+    counts = np.bincount(day, minlength=DAYS)
+    records['count'] = np.minimum(counts, 255)
+    if not len(t):
+        return records
+
+    # Position of each event within its day: sorted, so a day's events are contiguous
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(len(t)) - starts[day]
+    stored = rank < EVENTS_PER_RECORD
+    records['minutes'][day[stored], rank[stored]] = t[stored] % MINUTES_PER_DAY
+    records['heights'][day[stored], rank[stored]] = h[stored]
+    np.bitwise_or.at(records['high_mask'], day[stored], (high[stored].astype(np.uint8) << rank[stored]).astype(np.uint8))
+
+    busy = np.flatnonzero(counts)
+    records['max_cm'][busy] = np.maximum.reduceat(h, starts[busy])
+    records['min_cm'][busy] = np.minimum.reduceat(h, starts[busy])
+    records['range_cm'] = records['max_cm'] - records['min_cm']
+
+    last = starts[busy] + counts[busy] - 1
+    records['last_minute'][busy] = t[last] % MINUTES_PER_DAY
+    records['last_cm'][busy] = h[last]
+    records['high_mask'][busy] |= np.where(high[last], LAST_HIGH, 0).astype(np.uint8)
+    return records
+
+
+def encode_days(tides, year):
+    """Encode the day index of sorted JSON tide entries"""
+    records = build_records(*encode_columns(tides), year)
+    return HEADER.pack(MAGIC, FORMAT_VERSION, year, DAYS, RECORD.size) + records.tobytes()
+
+
+def write_days(tides, path, year):
+    """Write the day index of sorted JSON tide entries"""
+    data = encode_days(tides, year)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class DailyIndex:
+    """O(1) per-day summaries from a .days file (or its bytes, as returned by encode_days)"""
+
+    def __init__(self, path=None, data=None):
+        self._data = tide_compress.read_bytes(path) if data is None else data
+        path = path or 'data'
+        magic, version, self.year, self.days, record_size = HEADER.unpack_from(self._data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a day index")
+        if version != FORMAT_VERSION or record_size != RECORD.size:
+            raise ValueError(f"{path} has unsupported format version {version}")
+        self.first_day = date(self.year, 1, 1).toordinal() - EPOCH_ORDINAL
+        self.year_days = date(self.year + 1, 1, 1).toordinal() - EPOCH_ORDINAL - self.first_day
+
+    def record(self, day_of_year):
+        """Raw record tuple for a 1-based day of the year"""
+        if not 1 <= day_of_year <= min(self.days, self.year_days):
+            raise IndexError(f"day {day_of_year} is outside {self.year}")
+        return RECORD.unpack_from(self._data, HEADER.size + (day_of_year - 1) * RECORD.size)
+
+    def day(self, value):
+        """Summary of one day (date, datetime, ISO string or epoch minutes), or None without events
+
+        Raises IndexError for a day outside the index's year.
+        """
+        days = day_number(value)
+        if date.fromordinal(days + EPOCH_ORDINAL).year != self.year:
+            raise IndexError(f"{format_epoch_minutes(days * MINUTES_PER_DAY)[0]} is outside {self.year}")
+        fields = self.record(days - self.first_day + 1)
+        count, high_mask = fields[0], fields[1]
+        if not count:
+            return None
+        minutes = fields[2:2 + EVENTS_PER_RECORD]
+        heights = fields[2 + EVENTS_PER_RECORD:2 + 2 * EVENTS_PER_RECORD]
+        max_cm, min_cm, range_cm, last_minute, last_cm = fields[-5:]
+
+        date_str = format_epoch_minutes(days * MINUTES_PER_DAY)[0]
+
+        def event(minute, height_cm, high):
+            return {
+                'date': date_str,
+                'time': f'{minute // 60:02d}:{minute % 60:02d}',
+                'height': height_cm / 100,
+                'type': 'high' if high else 'low'
+            }
+
+        events = [event(minutes[i], heights[i], high_mask >> i & 1) for i in range(min(count, EVENTS_PER_RECORD))]
+        return {
+            'date': date_str,
+            'count': count,
+            'events': events,
+            'high_water': [event for event in events if event['type'] == 'high'],
+            'low_water': [event for event in events if event['type'] == 'low'],
+            'max': max_cm / 100,
+            'min': min_cm / 100,
+            'range': range_cm / 100,
+            'first': events[0],
+            'last': event(last_minute, last_cm, high_mask & LAST_HIGH),
+        }
+
+
+def _mismatched_days(index, tides):
+    """Count the days whose summary differs from filtering the JSON entries"""
+    mismatched = 0
+    for day_of_year in range(1, index.year_days + 1):
+        day = index.first_day + day_of_year - 1
+        date_str = format_epoch_minutes(day * MINUTES_PER_DAY)[0]
+        expected = [tide for tide in tides if tide['date'] == date_str]
+        summary = index.day(day * MINUTES_PER_DAY)
+        if summary is None:
+            mismatched += bool(expected)
+            continue
+        mismatched += (summary['events'] != expected[:EVENTS_PER_RECORD] or summary['count'] != len(expected)
+                       or summary['first'] != expected[0] or summary['last'] != expected[-1])
+    return mismatched
+
+
+def _busy_day(tides):
+    """Copy of tides with a fifth event added to the first day that has four"""
+    dates = [tide['date'] for tide in tides]
+    for i, tide in enumerate(tides):
+        if dates.count(tide['date']) == EVENTS_PER_RECORD and tide['time'] < '23:59':
+            last = max(j for j, date_str in enumerate(dates) if date_str == tide['date'])
+            extra = {'date': tide['date'], 'time': '23:59', 'height': 1.23,
+                     'type': 'low' if tides[last]['type'] == 'high' else 'high'}
+            return tides[:last + 1] + [extra] + tides[last + 1:]
+    return None
+
+
+def main():
+    import json
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 tide_days.py FILE.json | FILE.days [DATE ...]")
+        sys.exit(1)
+
+    path = sys.argv[1]
+    if path.endswith('.json'):
+        with open(path) as f:
+            tides = json.load(f)
+        year = int(tides[len(tides) // 2]['date'][:4])
+        days_path = path[:-len('.json')] + '.days'
+        write_days(tides, days_path, year)
+
+        start = time.perf_counter()
+        mismatched = _mismatched_days(DailyIndex(days_path), tides)
+        print(f"📅 {days_path}: {DAYS} days, {mismatched} differ from the JSON "
+              f"(checked in {time.perf_counter() - start:.2f}s)")
+
+        # Real tables have at most four events a day; check a fifth is counted and is the last
+        busy = _busy_day(tides)
+        if busy is not None:
+            busy_mismatched = _mismatched_days(DailyIndex(data=encode_days(busy, year)), busy)
+            print(f"📅 with a five-event day added: {busy_mismatched} days differ")
+            mismatched += busy_mismatched
+        sys.exit(1 if mismatched else 0)
+
+    index = DailyIndex(path)
+    for value in sys.argv[2:]:
+        summary = index.day(value)
+        if summary is None:
+            print(f"  {value}: no events")
+            continue
+        print(f"  {summary['date']}: {summary['count']} events, max {summary['max']}m, "
+              f"min {summary['min']}m, range {summary['range']}m")
+        for event in summary['events']:
+            print(f"    {event['time']}: {event['height']}m ({event['type']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+tide_deploy.py
+
+Copy the station-year JSON outputs to the places the app reads them from.
+
+The extractor writes ../Data/{year}/{station}_{year}.json; the app bundles
+the same files from ../Tides Belgium/ and also picks them up from the
+Simulator's Documents folder. For every target folder the SHA-256 of each
+output is compared with the file already there (sizes first, so a changed
+file is usually spotted without hashing it), and only missing or changed
+files are copied. Each copy is written to a temporary file in the target
+folder and renamed over the old one, so the app or Xcode never reads a
+half-written file. The report lists what was copied and the bytes saved by
+skipping unchanged files.
+
+Targets:
+  app         ../Tides Belgium (bundled with the app)
+  simulator   Documents of the app on the booted Simulator (needs xcrun)
+  any path    a folder of your own, e.g. a device export
+
+Usage:
+  python3 tide_deploy.py                            # every year, to the app folder
+  python3 tide_deploy.py --years 2026 --targets app simulator
+  python3 tide_deploy.py --targets app ~/Desktop/tides --dry-run
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import build_cache
+from tide_store import find_outputs, parse_output_name
+
+APP_DIR = '../Tides Belgium'
+BUNDLE_ID = 'ngc.TidesBE'
+
+
+def simulator_documents(bundle_id=BUNDLE_ID):
+    """Return the Documents folder of the app on the booted Simulator, or None"""
+    try:
+        result = subprocess.run(['xcrun', 'simctl', 'get_app_container', 'booted', bundle_id, 'data'],
+                                capture_output=True, text=True, check=True)
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    return os.path.join(result.stdout.strip(), 'Documents')
+
+
+def resolve_target(name):
+    """Map a target name to a folder; None if it is not available here"""
+    if name == 'app':
+        return APP_DIR
+    if name == 'simulator':
+        return simulator_documents()
+    return os.path.expanduser(name)
+
+
+def collect_outputs(years=None, data_dir='../Data'):
+    """Return the station-year JSON outputs, optionally only for some years"""
+    return [path for paths in find_outputs(data_dir).values() for path in paths
+            if not years or parse_output_name(path)[1] in years]
+
+
+def is_current(source, target, source_hash):
+    """Whether target already holds the same content as source"""
+    try:
+        if os.path.getsize(target) != os.path.getsize(source):
+            return False
+    except FileNotFoundError:
+        return False
+    return build_cache.file_sha256(target) == source_hash
+
+
+def copy_atomic(source, target):
+    """Copy via a temporary file in the target folder and an atomic rename"""
+    tmp_path = os.path.join(os.path.dirname(target), f'.{os.path.basename(target)}.tmp')
+    try:
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def deploy(paths, target_dir, dry_run=False, hashes=None):
+    """Sync outputs into one folder, returning (copied paths, bytes copied, bytes saved)
+
+    hashes caches source SHA-256s across targets.
+    """
+    hashes = {} if hashes is None else hashes
+    copied = []
+    bytes_copied = bytes_saved = 0
+    if not dry_run:
+        os.makedirs(target_dir, exist_ok=True)
+    for path in paths:
+        if path not in hashes:
+            hashes[path] = build_cache.file_sha256(path)
+        target = os.path.join(target_dir, os.path.basename(path))
+        size = os.path.getsize(path)
+        if is_current(path, target, hashes[path]):
+            bytes_saved += size
+            continue
+        if not dry_run:
+            copy_atomic(path, target)
+        copied.append(target)
+        bytes_copied += size
+    return copied, bytes_copied, bytes_saved
+
+
+def deploy_all(paths, targets, dry_run=False):
+    """Deploy to every named target, printing a summary per target; returns the number of files copied"""
+    hashes = {}
+    total = 0
+    for name in targets:
+        target_dir = resolve_target(name)
+        if target_dir is None:
+            print(f"  ⏭️  {name}: not available (no booted Simulator with {BUNDLE_ID}?)")
+            continue
+        start = time.perf_counter()
+        copied, bytes_copied, bytes_saved = deploy(paths, target_dir, dry_run, hashes)
+        elapsed = time.perf_counter() - start
+        verb = "would copy" if dry_run else "copied"
+        label = name if name == target_dir else f"{name} ({target_dir})"
+        print(f"  📱 {label}: {verb} {len(copied)}/{len(paths)} files, "
+              f"{bytes_copied / 1024:.0f} KiB; {bytes_saved / 1024:.0f} KiB unchanged in {elapsed * 1000:.0f} ms")
+        for target in copied:
+            print(f"      {target}")
+        total += len(copied)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy changed station-year JSON outputs to the app folders")
+    parser.add_argument("--years", nargs='+', type=int, help="Years to deploy (default: all in ../Data)")
+    parser.add_argument("--targets", nargs='+', default=['app'],
+                        help="app, simulator or folder paths (default: app)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be copied")
+    args = parser.parse_args()
+
+    paths = collect_outputs(args.years)
+    if not paths:
+        print("❌ No outputs found under ../Data; run extract_year_data.py first")
+        sys.exit(1)
+    print(f"🚚 DEPLOYING {len(paths)} STATION-YEARS")
+    deploy_all(paths, args.targets, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
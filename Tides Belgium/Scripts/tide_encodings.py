@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+tide_encodings.py
+
+Alternative JSON encodings for station-year tide outputs.
+
+  pretty    the current app format: an array of {date, time, height, type}, indent=2
+  minified  the same array without whitespace
+  soa       struct-of-arrays: {"format": "soa", "t": [...], "h": [...], "k": [...]}
+  delta     like soa, but "t" holds the first time followed by successive differences
+  ndjson    one compact {date, time, height, type} object per line
+
+In soa/delta, t is minutes since 1970-01-01 00:00 (tide-table local time), h is
+the height in centimetres and k is 1 for high water, 0 for low water. Only
+pretty and minified are readable by the current app's JSONTideParser.
+
+write() serialises an iterable of entries chunk by chunk, so pretty,
+minified and ndjson output never needs the whole series in memory; soa and
+delta collect the columns first.
+"""
+
+import json
+
+import tide_compress
+from tide_binary import epoch_minutes, format_epoch_minutes
+
+ENCODINGS = ('pretty', 'minified', 'soa', 'delta', 'ndjson')
+STREAMING_ENCODINGS = ('pretty', 'minified', 'ndjson')
+
+
+def _columns(tides):
+    t = [epoch_minutes(tide['date'], tide['time']) for tide in tides]
+    h = [int(round(tide['height'] * 100)) for tide in tides]
+    k = [1 if tide['type'] == 'high' else 0 for tide in tides]
+    return t, h, k
+
+
+def encode(tides, encoding='pretty'):
+    """Serialise tide entries with the given encoding"""
+    if encoding == 'pretty':
+        return json.dumps(tides, indent=2)
+    if encoding == 'minified':
+        return json.dumps(tides, separators=(',', ':'))
+    if encoding == 'ndjson':
+        return ''.join(iter_encode(tides, encoding))
+
+    t, h, k = _columns(tides)
+    if encoding == 'delta':
+        t = t[:1] + [b - a for a, b in zip(t, t[1:])]
+    elif encoding != 'soa':
+        raise ValueError(f"Unknown encoding: {encoding}")
+    return json.dumps({'format': encoding, 't': t, 'h': h, 'k': k}, separators=(',', ':'))
+
+
+def iter_encode(tides, encoding='pretty'):
+    """Yield the encoding of an iterable of entries in chunks, byte-identical to encode()"""
+    if encoding not in STREAMING_ENCODINGS:
+        yield encode(list(tides), encoding)
+        return
+    if encoding == 'ndjson':
+        for tide in tides:
+            yield json.dumps(tide, separators=(',', ':')) + '\n'
+        return
+
+    # Entries hold no newlines, so nesting the indent=2 form under the array is a plain replace
+    separator, opening, closing = (',\n  ', '[\n  ', '\n]') if encoding == 'pretty' else (',', '[', ']')
+    prefix = opening
+    for tide in tides:
+        if encoding == 'pretty':
+            yield prefix + json.dumps(tide, indent=2).replace('\n', '\n  ')
+        else:
+            yield prefix + json.dumps(tide, separators=(',', ':'))
+        prefix = separator
+    yield '[]' if prefix is opening else closing
+
+
+def write(tides, f, encoding='pretty'):
+    """Stream an iterable of entries to a text file, returning the number written"""
+    count = 0
+
+    def counted():
+        nonlocal count
+        for tide in tides:
+            count += 1
+            yield tide
+
+    for chunk in iter_encode(counted(), encoding):
+        f.write(chunk)
+    return count
+
+
+def parse(data):
+    """Parse encoded text to its JSON structure: a list of entries, or the soa/delta object"""
+    if isinstance(data, bytes):
+        data = data.decode()
+    text = data.lstrip()
+    # ndjson lines are entries; the soa/delta object always starts with its format key
+    if text.startswith('{') and not text.startswith('{"format"'):
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return json.loads(text)
+
+
+def decode_columns(data):
+    """Decode any encoding to parallel (t, h, k) lists without building entries"""
+    if isinstance(data, (str, bytes)):
+        data = parse(data)
+    if isinstance(data, list):
+        return _columns(data)
+
+    t = data['t']
+    if data.get('format') == 'delta':
+        total = 0
+        t = [total := total + dt for dt in t]
+    return t, data['h'], data['k']
+
+
+def decode(data):
+    """Decode any encoding back to the list of {date, time, height, type} entries"""
+    if isinstance(data, (str, bytes)):
+        data = parse(data)
+    if isinstance(data, list):
+        return data
+
+    tides = []
+    for minutes, height_cm, kind in zip(*decode_columns(data)):
+        date_str, time_str = format_epoch_minutes(minutes)
+        tides.append({
+            'date': date_str,
+            'time': time_str,
+            'height': height_cm / 100,
+            'type': 'high' if kind else 'low'
+        })
+    return tides
+
+
+def load(path):
+    """Load a tide output file written in any encoding, plain or compressed (see tide_compress.py)"""
+    return decode(tide_compress.read_bytes(path))
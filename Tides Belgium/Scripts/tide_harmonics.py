@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+tide_harmonics.py
+
+Fit tidal constituents to the extracted HW/LW series and predict future years.
+
+Only high and low waters are published, so the water level is never sampled
+directly. Each extreme gives two linear equations in the constituent
+coefficients: the curve passes through the published height, and its slope is
+zero at the published time. Both are solved together with NumPy least squares,
+including the standard nodal corrections (f, u) so a fit stays valid for other
+years of the 18.6-year cycle.
+
+Times in the tables are Belgian local time (CET, CEST in summer). They are
+converted to UTC for fitting and back to local time for the predicted tables,
+which use the same JSON schema as ../Data/{year}/{station}_{year}.json.
+
+Usage:
+  python3 tide_harmonics.py fit --years 2025                  # writes ../Data/harmonics/{station}.json
+  python3 tide_harmonics.py predict --years 2027 2036         # writes ../Data/predicted/{year}/...
+  python3 tide_harmonics.py report --train 2025 --test 2026   # accuracy against held-out tables
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit("numpy is required: pip install numpy")
+
+from tide_binary import epoch_minutes, format_epoch_minutes, EPOCH_ORDINAL, MINUTES_PER_DAY
+from tide_encodings import encode
+
+STATIONS = ['blankenberge', 'nieuwpoort', 'oostende', 'zeebrugge']
+MODEL_DIR = '../Data/harmonics'
+PREDICTED_DIR = '../Data/predicted'
+MODEL_VERSION = 1
+
+# Constituent speeds in degrees per hour and the nodal correction they follow
+CONSTITUENTS = {
+    'SA': (0.0410686, None),
+    'SSA': (0.0821373, None),
+    'MM': (0.5443747, None),
+    'MSF': (1.0158958, 'M2'),
+    'Q1': (13.3986609, 'O1'),
+    'O1': (13.9430356, 'O1'),
+    'P1': (14.9589314, None),
+    'K1': (15.0410686, 'K1'),
+    '2N2': (27.8953548, 'M2'),
+    'MU2': (27.9682084, 'M2'),
+    'N2': (28.4397295, 'M2'),
+    'NU2': (28.5125831, 'M2'),
+    'M2': (28.9841042, 'M2'),
+    'L2': (29.5284789, 'M2'),
+    'S2': (30.0000000, None),
+    'K2': (30.0821373, 'K2'),
+    'M3': (43.4761563, 'M3'),
+    'MK3': (44.0251729, 'MK3'),
+    'MN4': (57.4238337, 'M2^2'),
+    'M4': (57.9682084, 'M2^2'),
+    'MS4': (58.9841042, 'M2'),
+    'MK4': (59.0662415, 'MK3'),
+    'S4': (60.0000000, None),
+    '2MN6': (86.4079380, 'M2^3'),
+    'M6': (86.9523127, 'M2^3'),
+    '2MS6': (87.9682084, 'M2^2'),
+    'M8': (115.9364166, 'M2^4'),
+}
+
+# Local time: CET (UTC+1), CEST (UTC+2) from the last Sunday of March to the
+# last Sunday of October, switching at 01:00 UTC
+CET_OFFSET = 60
+
+
+def _last_sunday_epoch(year, month):
+    last_day = date(year, month + 1, 1).toordinal() - 1
+    last_sunday = last_day - (date.fromordinal(last_day).weekday() + 1) % 7
+    return (last_sunday - EPOCH_ORDINAL) * MINUTES_PER_DAY + 60
+
+
+def _dst_bounds(years):
+    years = np.asarray(years)
+    starts = np.array([_last_sunday_epoch(int(y), 3) for y in years.ravel()]).reshape(years.shape)
+    ends = np.array([_last_sunday_epoch(int(y), 10) for y in years.ravel()]).reshape(years.shape)
+    return starts, ends
+
+
+def _years_of(minutes):
+    days = np.asarray(minutes) // MINUTES_PER_DAY
+    return (days.astype('datetime64[D]').astype('datetime64[Y]').astype(int) + 1970)
+
+
+def local_to_utc(minutes):
+    """Convert local Belgian epoch minutes to UTC epoch minutes"""
+    minutes = np.asarray(minutes, dtype=np.int64)
+    starts, ends = _cached_dst_bounds(_years_of(minutes))
+    utc = minutes - CET_OFFSET
+    dst = (utc - 60 >= starts) & (utc - 60 < ends)
+    return np.where(dst, utc - 60, utc)
+
+
+def utc_to_local(minutes):
+    """Convert UTC epoch minutes to local Belgian epoch minutes"""
+    minutes = np.asarray(minutes, dtype=np.int64)
+    starts, ends = _cached_dst_bounds(_years_of(minutes))
+    dst = (minutes >= starts) & (minutes < ends)
+    return minutes + CET_OFFSET + np.where(dst, 60, 0)
+
+
+def _cached_dst_bounds(years):
+    unique, inverse = np.unique(years, return_inverse=True)
+    starts, ends = _dst_bounds(unique)
+    return starts[inverse].reshape(years.shape), ends[inverse].reshape(years.shape)
+
+
+def nodal_corrections(hours):
+    """Return {correction: (f, u radians)} arrays for times in hours since the epoch"""
+    # Julian centuries since J2000 (2000-01-01 12:00 UTC = epoch hour 262980)
+    T = (np.asarray(hours) - 262980.0) / (24 * 36525.0)
+    N = np.radians(125.04452 - 1934.136261 * T)
+
+    f_m2 = 1.0004 - 0.0373 * np.cos(N) + 0.0002 * np.cos(2 * N)
+    u_m2 = np.radians(-2.14 * np.sin(N))
+    f_k1 = 1.0060 + 0.1150 * np.cos(N) - 0.0088 * np.cos(2 * N) + 0.0006 * np.cos(3 * N)
+    u_k1 = np.radians(-8.86 * np.sin(N) + 0.68 * np.sin(2 * N) - 0.07 * np.sin(3 * N))
+    f_o1 = 1.0089 + 0.1871 * np.cos(N) - 0.0147 * np.cos(2 * N) + 0.0014 * np.cos(3 * N)
+    u_o1 = np.radians(10.80 * np.sin(N) - 1.34 * np.sin(2 * N) + 0.19 * np.sin(3 * N))
+    f_k2 = 1.0241 + 0.2863 * np.cos(N) + 0.0083 * np.cos(2 * N) - 0.0015 * np.cos(3 * N)
+    u_k2 = np.radians(-17.74 * np.sin(N) + 0.68 * np.sin(2 * N) - 0.04 * np.sin(3 * N))
+
+    return {
+        'M2': (f_m2, u_m2),
+        'M2^2': (f_m2 ** 2, 2 * u_m2),
+        'M2^3': (f_m2 ** 3, 3 * u_m2),
+        'M2^4': (f_m2 ** 4, 4 * u_m2),
+        'M3': (f_m2 ** 1.5, 1.5 * u_m2),
+        'MK3': (f_m2 * f_k1, u_m2 + u_k1),
+        'K1': (f_k1, u_k1),
+        'O1': (f_o1, u_o1),
+        'K2': (f_k2, u_k2),
+    }
+
+
+def _nodal_factors(names, hours):
+    """Return (f, u) with shape hours.shape + (len(names),)"""
+    hours = np.asarray(hours, dtype=np.float64)
+    corrections = nodal_corrections(hours)
+    f = np.ones(hours.shape + (len(names),))
+    u = np.zeros(hours.shape + (len(names),))
+    for j, name in enumerate(names):
+        correction = CONSTITUENTS[name][1]
+        if correction:
+            f[..., j], u[..., j] = corrections[correction]
+    return f, u
+
+
+def _phases(hours, names, nodal_hour=None):
+    """Return (f, theta, omega) for times in hours and the given constituents
+
+    theta has shape (len(hours), len(names)). Nodal corrections are evaluated
+    per time, or once at nodal_hour when given (they change by well under a
+    degree over a year), in which case f has shape (len(names),).
+    """
+    hours = np.asarray(hours, dtype=np.float64)
+    omega = np.radians([CONSTITUENTS[name][0] for name in names])
+    f, u = _nodal_factors(names, hours if nodal_hour is None else nodal_hour)
+    theta = np.outer(hours, omega) + u
+    return f, theta, omega
+
+
+def fit(tides, names=None, slope_weight=1.0):
+    """Fit constituents to JSON HW/LW entries, returning a model dict"""
+    names = list(names or CONSTITUENTS)
+    local = np.fromiter((epoch_minutes(t['date'], t['time']) for t in tides), dtype=np.int64, count=len(tides))
+    heights = np.fromiter((t['height'] for t in tides), dtype=np.float64, count=len(tides))
+    hours = local_to_utc(local) / 60.0
+
+    f, theta, omega = _phases(hours, names)
+    cos, sin = f * np.cos(theta), f * np.sin(theta)
+    n, m = len(hours), len(names)
+
+    # Rows 0..n-1: height equations; rows n..2n-1: zero slope at each extreme
+    A = np.zeros((2 * n, 1 + 2 * m))
+    A[:n, 0] = 1.0
+    A[:n, 1::2] = cos
+    A[:n, 2::2] = sin
+    A[n:, 1::2] = -sin * omega * slope_weight
+    A[n:, 2::2] = cos * omega * slope_weight
+    b = np.concatenate((heights, np.zeros(n)))
+
+    coef, *_ = np.linalg.lstsq(A, b, rcond=None)
+    residual = A[:n] @ coef - heights
+    a, bs = coef[1::2], coef[2::2]
+    return {
+        'version': MODEL_VERSION,
+        'z0': float(coef[0]),
+        'constituents': {name: {'amplitude': float(np.hypot(a[j], bs[j])),
+                                'phase': float(np.degrees(np.arctan2(bs[j], a[j])) % 360)}
+                         for j, name in enumerate(names)},
+        'fit_events': n,
+        'fit_rms_m': float(np.sqrt(np.mean(residual ** 2))),
+    }
+
+
+def _model_arrays(model):
+    names = list(model['constituents'])
+    amplitude = np.array([model['constituents'][n]['amplitude'] for n in names])
+    phase = np.radians([model['constituents'][n]['phase'] for n in names])
+    return names, amplitude, phase
+
+
+def _level(model, hours, names, amplitude, phase, order=0, nodal_hour=None):
+    """Water level (order 0) or its derivatives (orders 1, 2) at UTC hours"""
+    f, theta, omega = _phases(hours, names, nodal_hour)
+    arg = theta - phase
+    if order == 0:
+        return model['z0'] + (f * np.cos(arg)) @ amplitude
+    if order == 1:
+        return -(f * np.sin(arg)) @ (amplitude * omega)
+    return -(f * np.cos(arg)) @ (amplitude * omega ** 2)
+
+
+def _slope_grid(start_hour, hours_per_block, blocks, step_hours, names, amplitude, phase, nodal_hour):
+    """Slope of the water level on a regular grid, evaluated block-separably
+
+    Each constituent is Re(C_j * exp(i w_j t)); writing t = block start + tau
+    turns the whole grid into one small complex matrix product of per-block
+    and per-tau phasors, instead of a trig call per grid point and constituent.
+    """
+    omega = np.radians([CONSTITUENTS[name][0] for name in names])
+    f, u = _nodal_factors(names, nodal_hour)
+    coefficient = 1j * omega * amplitude * f * np.exp(1j * (u - phase))
+
+    block_starts = start_hour + hours_per_block * np.arange(blocks)
+    tau = step_hours * np.arange(int(round(hours_per_block / step_hours)))
+    per_block = np.exp(1j * np.outer(block_starts, omega)) * coefficient
+    per_tau = np.exp(1j * np.outer(tau, omega))
+    return (per_block @ per_tau.T).real.ravel()
+
+
+def predict_extremes(model, start_minutes, end_minutes, step_minutes=10):
+    """Predict HW/LW between two UTC epoch minutes, returning (utc minutes, heights, is_high)
+
+    Extremes are bracketed by slope sign changes on a regular grid and
+    refined with Newton steps on the analytic slope.
+    """
+    names, amplitude, phase = _model_arrays(model)
+    nodal_hour = (start_minutes + end_minutes) / 120.0
+
+    def level(hours, order=0):
+        return _level(model, hours, names, amplitude, phase, order, nodal_hour)
+
+    # Sign changes of the slope bracket every extreme on the grid (one-day blocks)
+    blocks = -(-(end_minutes - start_minutes) // MINUTES_PER_DAY) + 1
+    step_hours = step_minutes / 60.0
+    slope = _slope_grid(start_minutes / 60.0, 24.0, blocks, step_hours, names, amplitude, phase, nodal_hour)
+    grid = start_minutes / 60.0 + step_hours * np.arange(len(slope))
+    idx = np.flatnonzero(np.signbit(slope[:-1]) != np.signbit(slope[1:]))
+
+    # Refine within each bracket with Newton steps on the slope
+    hours = grid[idx] + (grid[idx + 1] - grid[idx]) * slope[idx] / (slope[idx] - slope[idx + 1])
+    for _ in range(3):
+        hours = np.clip(hours - level(hours, 1) / level(hours, 2), grid[idx], grid[idx + 1])
+
+    heights = level(hours)
+    curvature = level(hours, order=2)
+    minutes = np.rint(hours * 60).astype(np.int64)
+    keep = (minutes >= start_minutes) & (minutes <= end_minutes)
+    return minutes[keep], heights[keep], (curvature < 0)[keep]
+
+
+def predict_year(model, year):
+    """Predict one local calendar year as JSON tide entries"""
+    start = (date(year, 1, 1).toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY
+    end = (date(year + 1, 1, 1).toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY - 1
+    # Pad by a few hours so extremes near the local year boundary are found
+    utc, heights, is_high = predict_extremes(model, start - 240, end + 240)
+    local = utc_to_local(utc)
+    keep = (local >= start) & (local <= end)
+
+    tides = []
+    for minutes, height, high in zip(local[keep].tolist(), heights[keep].tolist(), is_high[keep].tolist()):
+        date_str, time_str = format_epoch_minutes(minutes)
+        tides.append({'date': date_str, 'time': time_str, 'height': round(height, 2),
+                      'type': 'high' if high else 'low'})
+    return tides
+
+
+def load_series(station_name, years, data_dir='../Data'):
+    tides = []
+    for year in years:
+        path = os.path.join(data_dir, str(year), f'{station_name}_{year}.json')
+        with open(path) as f:
+            tides.extend(json.load(f))
+    return tides
+
+
+def model_path(station_name):
+    return os.path.join(MODEL_DIR, f'{station_name}.json')
+
+
+def accuracy(predicted, actual, window=180):
+    """Match each actual event to the nearest predicted event of the same type
+
+    Returns a dict of matched count, time errors (minutes) and height errors (cm).
+    """
+    result = {'events': len(actual), 'matched': 0}
+    time_errors, height_errors = [], []
+    for kind in ('high', 'low'):
+        p = [t for t in predicted if t['type'] == kind]
+        a = [t for t in actual if t['type'] == kind]
+        if not p or not a:
+            continue
+        pt = np.array([epoch_minutes(t['date'], t['time']) for t in p])
+        ph = np.array([t['height'] for t in p])
+        at = np.array([epoch_minutes(t['date'], t['time']) for t in a])
+        ah = np.array([t['height'] for t in a])
+
+        pos = np.clip(np.searchsorted(pt, at), 1, len(pt) - 1)
+        nearest = np.where(np.abs(pt[pos - 1] - at) <= np.abs(pt[pos] - at), pos - 1, pos)
+        dt = pt[nearest] - at
+        ok = np.abs(dt) <= window
+        time_errors.append(dt[ok])
+        height_errors.append((ph[nearest] - ah)[ok] * 100)
+        result['matched'] += int(ok.sum())
+
+    if time_errors:
+        dt = np.abs(np.concatenate(time_errors))
+        dh = np.abs(np.concatenate(height_errors))
+        result.update({
+            'time_mean_min': float(dt.mean()), 'time_p95_min': float(np.percentile(dt, 95)),
+            'height_mean_cm': float(dh.mean()), 'height_p95_cm': float(np.percentile(dh, 95)),
+        })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Harmonic fitting and prediction of Belgian tides")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    fit_parser = sub.add_parser('fit', help="Fit constituents from ../Data/{year} tables")
+    fit_parser.add_argument("--years", type=int, nargs='+', default=[2025])
+    fit_parser.add_argument("--stations", nargs='+', default=STATIONS)
+
+    predict_parser = sub.add_parser('predict', help="Predict HW/LW tables from fitted models")
+    predict_parser.add_argument("--years", type=int, nargs=2, metavar=('FIRST', 'LAST'), required=True)
+    predict_parser.add_argument("--stations", nargs='+', default=STATIONS)
+    predict_parser.add_argument("--out", default=PREDICTED_DIR)
+
+    report_parser = sub.add_parser('report', help="Fit on some years and compare with held-out tables")
+    report_parser.add_argument("--train", type=int, nargs='+', default=[2025])
+    report_parser.add_argument("--test", type=int, nargs='+', default=[2026])
+    report_parser.add_argument("--stations", nargs='+', default=STATIONS)
+    args = parser.parse_args()
+
+    if args.command == 'fit':
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        for station_name in args.stations:
+            model = fit(load_series(station_name, args.years))
+            model.update({'station': station_name, 'years': args.years})
+            with open(model_path(station_name), 'w') as f:
+                json.dump(model, f, indent=2)
+            m2 = model['constituents']['M2']
+            print(f"✅ {station_name}: {model['fit_events']} events, rms {model['fit_rms_m'] * 100:.1f}cm, "
+                  f"M2 {m2['amplitude']:.2f}m @ {m2['phase']:.0f}° -> {model_path(station_name)}")
+
+    elif args.command == 'predict':
+        first, last = args.years
+        for station_name in args.stations:
+            with open(model_path(station_name)) as f:
+                model = json.load(f)
+            start = time.perf_counter()
+            tables = {year: predict_year(model, year) for year in range(first, last + 1)}
+            elapsed = time.perf_counter() - start
+            for year, tides in tables.items():
+                out_dir = os.path.join(args.out, str(year))
+                os.makedirs(out_dir, exist_ok=True)
+                with open(os.path.join(out_dir, f'{station_name}_{year}.json'), 'w') as f:
+                    f.write(encode(tides))
+            print(f"✅ {station_name}: {sum(map(len, tables.values()))} events for {first}-{last} "
+                  f"in {elapsed:.2f}s -> {args.out}")
+
+    else:
+        print(f"📊 ACCURACY: fit on {args.train}, compared with {args.test}")
+        print("=" * 78)
+        for station_name in args.stations:
+            model = fit(load_series(station_name, args.train))
+            actual = load_series(station_name, args.test)
+            predicted = [t for year in args.test for t in predict_year(model, year)]
+            r = accuracy(predicted, actual)
+            print(f"{station_name:<14} matched {r['matched']}/{r['events']}  "
+                  f"time mean {r.get('time_mean_min', float('nan')):.1f} min, p95 {r.get('time_p95_min', float('nan')):.0f} min  "
+                  f"height mean {r.get('height_mean_cm', float('nan')):.1f} cm, p95 {r.get('height_p95_cm', float('nan')):.0f} cm")
+
+
+if __name__ == "__main__":
+    main()
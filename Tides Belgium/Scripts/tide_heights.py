@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+tide_heights.py
+
+Vectorised water level at arbitrary times from the extracted HW/LW series.
+
+Between two consecutive events the level follows a fixed shape from the
+first height to the second:
+
+  cosine     h0 + (h1 - h0) * (1 - cos(pi * x)) / 2
+  twelfths   rule of twelfths: 1, 2, 3, 3, 2, 1 twelfths of the range per sixth
+
+where x is the fraction of the interval elapsed. The per-interval start
+time, inverse duration, start height and height change are computed once;
+each query is one np.searchsorted over all timestamps plus a few array
+operations, so millions of evaluations take milliseconds.
+
+Times outside the series, or inside an interval longer than max_gap minutes
+(a missing event, where no shape is meaningful), evaluate to NaN.
+
+Usage (optional):
+  python3 tide_heights.py oostende 2025 --at 2025-07-11T14:30 2025-07-11T18:00
+  python3 tide_heights.py oostende 2025 --grid 2025-01-01 2025-12-31 --step 1
+"""
+
+import argparse
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit("numpy is required: pip install numpy")
+
+from tide_classify import DEFAULT_MAX_GAP
+from tide_shards import to_epoch
+from tide_store import TideStore
+
+METHODS = ('cosine', 'twelfths')
+
+# Cumulative fraction of the range covered after each sixth of the interval
+TWELFTHS_X = np.linspace(0.0, 1.0, 7)
+TWELFTHS_F = np.array([0, 1, 3, 6, 9, 11, 12]) / 12
+
+
+def to_epoch_array(times):
+    """Epoch minutes (float64) from numbers, datetime64 values or ISO strings"""
+    times = np.asarray(times)
+    if times.dtype.kind in 'US':
+        times = times.astype('datetime64[m]')
+    if times.dtype.kind == 'M':
+        return times.astype('datetime64[m]').astype(np.int64).astype(np.float64)
+    return times.astype(np.float64)
+
+
+class HeightCurve:
+    """Per-interval interpolation coefficients for one sorted HW/LW series"""
+
+    def __init__(self, epochs, heights_m, max_gap=DEFAULT_MAX_GAP):
+        t = np.asarray(epochs, dtype=np.float64)
+        h = np.asarray(heights_m, dtype=np.float64)
+        if len(t) != len(h):
+            raise ValueError("epochs and heights must have the same length")
+        duration = np.diff(t)
+        self.epochs = t
+        self.start = t[:-1]
+        self.h0 = h[:-1]
+        self.dh = np.diff(h)
+        with np.errstate(divide='ignore'):
+            self.inv_duration = np.where((duration > 0) & (duration <= max_gap), 1.0 / duration, np.nan)
+
+    @classmethod
+    def from_store(cls, store, max_gap=DEFAULT_MAX_GAP):
+        """Build from a TideStore without copying its epoch column"""
+        epochs = np.frombuffer(store.epochs, dtype=np.int32)
+        heights = np.frombuffer(store.heights_cm, dtype=np.int16) / 100
+        return cls(epochs, heights, max_gap)
+
+    def heights_at(self, times, method='cosine'):
+        """Water level in m at each time (epoch minutes, datetime64 or ISO strings)
+
+        Returns an array shaped like times, or a float for a single time.
+        """
+        epochs = to_epoch_array(times)
+        t = np.atleast_1d(epochs).ravel()
+        out = np.full(t.shape, np.nan)
+        if len(self.start):
+            self._fill(t, out, method)
+        return float(out[0]) if epochs.ndim == 0 else out.reshape(epochs.shape)
+
+    def _fill(self, t, out, method):
+        """Evaluate a 1-D array of epoch minutes into out"""
+        # Interval i covers [epochs[i], epochs[i + 1]]; the last event itself belongs to the last interval
+        i = np.searchsorted(self.epochs, t, side='right') - 1
+        i[t == self.epochs[-1]] = len(self.start) - 1
+        inside = (i >= 0) & (i < len(self.start))
+        i = i[inside]
+
+        x = (t[inside] - self.start[i]) * self.inv_duration[i]
+        if method == 'cosine':
+            fraction = 0.5 - 0.5 * np.cos(np.pi * x)
+        elif method == 'twelfths':
+            fraction = np.interp(x, TWELFTHS_X, TWELFTHS_F)
+            fraction[np.isnan(x)] = np.nan
+        else:
+            raise ValueError(f"Unknown method: {method}")
+        out[inside] = self.h0[i] + self.dh[i] * fraction
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate water levels between extracted HW/LW events")
+    parser.add_argument("station", help="Station name, e.g. oostende")
+    parser.add_argument("years", nargs='+', type=int, help="Years to load")
+    parser.add_argument("--method", choices=METHODS, default='cosine', help="Interpolation shape")
+    parser.add_argument("--at", nargs='+', default=[], help="Times to evaluate (YYYY-MM-DDTHH:MM)")
+    parser.add_argument("--grid", nargs=2, metavar=("START", "END"), help="Evaluate a regular grid instead")
+    parser.add_argument("--step", type=float, default=10, help="Grid step in minutes")
+    args = parser.parse_args()
+
+    curve = HeightCurve.from_store(TideStore.load(args.station, args.years))
+
+    for moment, height in zip(args.at, curve.heights_at(args.at, args.method)):
+        print(f"  {moment}: {height:.2f}m")
+
+    if args.grid:
+        grid = np.arange(to_epoch(args.grid[0]), to_epoch(args.grid[1], end_of_day=True), args.step)
+        start = time.perf_counter()
+        heights = curve.heights_at(grid, args.method)
+        elapsed = time.perf_counter() - start
+        valid = ~np.isnan(heights)
+        print(f"📈 {len(grid)} points in {elapsed * 1000:.1f} ms ({len(grid) / elapsed / 1e6:.1f} M/s), "
+              f"{valid.sum()} defined, range {np.nanmin(heights):.2f}-{np.nanmax(heights):.2f}m")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+tide_profile.py
+
+Per-phase wall time, CPU time and memory for the extraction pipeline.
+
+The extractor's stages are chained generators, so a phase like 'read' runs
+in short slices interleaved with 'parse', 'sort' and 'write'. PhaseProfiler
+keeps a stack of active phases and charges every slice of time to the phase
+on top, i.e. each phase reports its own (exclusive) time: 'write' does not
+include the reading it pulls through the pipeline. With tracemalloc
+running, the traced-memory peak is sampled and reset at each switch, so
+every phase also gets the highest traced memory seen while it was on top.
+
+Instrumented code asks for active() and wraps blocks in phase(name) or
+iterators in wrap(iterable, name). Outside activate() the active profiler
+is a no-op. profile_call() runs one unit of work under a fresh profiler,
+optionally with a cProfile dump, and returns its metrics.
+
+Usage (optional):
+  python3 tide_profile.py extract_profile.json      # summarise a metrics file
+"""
+
+import contextlib
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+
+
+class PhaseProfiler:
+    """Exclusive wall/CPU time and tracemalloc peak per named phase
+
+    Time spent outside every phase is charged to 'other'.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._stack = ['other']
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def _switch(self):
+        """Charge the time since the last switch to the phase on top of the stack"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        stats = self.phases.get(self._stack[-1])
+        if stats is None:
+            stats = self.phases[self._stack[-1]] = {'wall_s': 0.0, 'cpu_s': 0.0, 'peak_kib': 0.0, 'calls': 0}
+        stats['wall_s'] += wall - self._wall
+        stats['cpu_s'] += cpu - self._cpu
+        if tracemalloc.is_tracing():
+            stats['peak_kib'] = max(stats['peak_kib'], tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.reset_peak()
+        self._wall, self._cpu = wall, cpu
+        return stats
+
+    def enter(self, name):
+        self._switch()
+        self._stack.append(name)
+
+    def exit(self):
+        self._switch()['calls'] += 1
+        self._stack.pop()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def wrap(self, iterable, name):
+        """Yield from iterable, charging the time spent producing each item to name"""
+        iterator = iter(iterable)
+        while True:
+            self.enter(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.exit()
+            yield item
+
+    def metrics(self):
+        """Return {phase: {wall_s, cpu_s, peak_kib, calls}}, charging the time up to now"""
+        self._switch()
+        return {name: {key: round(value, 6) if isinstance(value, float) else value
+                       for key, value in stats.items()}
+                for name, stats in self.phases.items()}
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off"""
+
+    def phase(self, name):
+        return contextlib.nullcontext()
+
+    def wrap(self, iterable, name):
+        return iterable
+
+
+_active = NullProfiler()
+
+
+def active():
+    """Return the profiler instrumented code should report to"""
+    return _active
+
+
+@contextlib.contextmanager
+def activate(profiler):
+    """Make profiler the active one for the duration of the block"""
+    global _active
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+def profile_call(run, cprofile_path=None):
+    """Call run() under a PhaseProfiler with tracemalloc, returning (its result, metrics)
+
+    metrics holds the call's wall_s, cpu_s and peak_kib plus the per-phase
+    breakdown. tracemalloc slows the call down, so compare phases within
+    one profile rather than against unprofiled timings. With cprofile_path,
+    a cProfile dump of the call is written there as well (for pstats or
+    snakeviz).
+    """
+    profiler = PhaseProfiler()
+    cprofiler = cProfile.Profile() if cprofile_path else None
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        with activate(profiler):
+            if cprofiler:
+                result = cprofiler.runcall(run)
+            else:
+                result = run()
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        phases = profiler.metrics()
+        if started_tracing:
+            tracemalloc.stop()
+        if cprofiler:
+            cprofiler.dump_stats(cprofile_path)
+    return result, {
+        'wall_s': round(wall, 6),
+        'cpu_s': round(cpu, 6),
+        'peak_kib': max((stats['peak_kib'] for stats in phases.values()), default=0),
+        'phases': phases
+    }
+
+
+def total_phases(units):
+    """Sum the per-phase metrics of several units; peak_kib is the highest of any unit"""
+    totals = {}
+    for unit in units:
+        for name, stats in unit['phases'].items():
+            total = totals.setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0, 'peak_kib': 0.0, 'calls': 0})
+            total['wall_s'] = round(total['wall_s'] + stats['wall_s'], 6)
+            total['cpu_s'] = round(total['cpu_s'] + stats['cpu_s'], 6)
+            total['peak_kib'] = max(total['peak_kib'], stats['peak_kib'])
+            total['calls'] += stats['calls']
+    return totals
+
+
+def summarise(metrics):
+    """Return printable lines: one row per unit with each phase's wall time in ms"""
+    phases = []
+    for unit in metrics['units']:
+        phases += [name for name in unit['phases'] if name not in phases]
+    lines = [f"{'unit':<20}{'wall ms':>9}{'cpu ms':>9}{'peak KiB':>10}"
+             + ''.join(f"{name:>10}" for name in phases)]
+    for unit in metrics['units']:
+        label = f"{unit['station']} {unit['year']}"
+        lines.append(f"{label:<20}{unit['wall_s'] * 1000:>9.1f}{unit['cpu_s'] * 1000:>9.1f}{unit['peak_kib']:>10.0f}"
+                     + ''.join(f"{unit['phases'].get(name, {}).get('wall_s', 0) * 1000:>10.1f}"
+                               for name in phases))
+    return lines
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python3 tide_profile.py METRICS.json")
+        sys.exit(1)
+
+    with open(sys.argv[1]) as f:
+        metrics = json.load(f)
+    print(f"📊 {sys.argv[1]} ({metrics['created']}), phase columns are exclusive wall ms")
+    for line in summarise(metrics):
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
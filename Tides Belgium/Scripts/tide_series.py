@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+tide_series.py
+
+Compact in-memory tide records shared by the scripts.
+
+TideEvent is one HW/LW event in three slots: epoch minutes, height in cm and
+a TYPE_* flag (see tide_binary.py). It replaces the four-key dict with two
+string values while processing; to_entry() gives the JSON dict back.
+
+TideSeries holds many events as three parallel arrays: int32 epoch minutes,
+int16 cm and uint8 type, 7 bytes per event against several hundred for a
+list of dicts. Sorting, de-duplication and conversion to JSON entries,
+encoded text or the binary format are methods on the series. With numpy
+installed, sort() and dedupe() run as array operations on the buffers;
+without it they fall back to the standard library.
+
+Usage (optional):
+  python3 tide_series.py ../Data/2025/oostende_2025.json
+"""
+
+import json
+import sys
+import tracemalloc
+from array import array
+
+import tide_encodings
+from tide_binary import (TYPE_HIGH, TYPE_LOW, TideColumns, epoch_minutes, format_epoch_minutes,
+                         write_columns_binary)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TideEvent:
+    """One tide event: epoch minutes, height in cm and a TYPE_* flag"""
+
+    __slots__ = ('epoch', 'height_cm', 'type')
+
+    def __init__(self, epoch, height_cm, tide_type):
+        self.epoch = epoch
+        self.height_cm = height_cm
+        self.type = tide_type
+
+    @classmethod
+    def from_parts(cls, date_str, time_str, height, high):
+        """Build from 'YYYY-MM-DD', 'HH:MM', a height in m and whether it is high water"""
+        return cls(epoch_minutes(date_str, time_str), int(round(height * 100)), TYPE_HIGH if high else TYPE_LOW)
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls.from_parts(entry['date'], entry['time'], entry['height'], entry['type'] == 'high')
+
+    @property
+    def height(self):
+        return self.height_cm / 100
+
+    @property
+    def is_high(self):
+        return bool(self.type & TYPE_HIGH)
+
+    def to_entry(self):
+        """Return the JSON entry {date, time, height, type}"""
+        date_str, time_str = format_epoch_minutes(self.epoch)
+        return {
+            'date': date_str,
+            'time': time_str,
+            'height': self.height_cm / 100,
+            'type': 'high' if self.type & TYPE_HIGH else 'low'
+        }
+
+    def _key(self):
+        return (self.epoch, self.height_cm, self.type)
+
+    def __eq__(self, other):
+        if not isinstance(other, TideEvent):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        date_str, time_str = format_epoch_minutes(self.epoch)
+        return f"TideEvent({date_str} {time_str}, {self.height_cm / 100}m, {'high' if self.is_high else 'low'})"
+
+
+class TideSeries:
+    """Parallel int32 epoch / int16 cm / uint8 type arrays"""
+
+    def __init__(self, epochs=(), heights_cm=(), types=()):
+        self.epochs = array('i', epochs)
+        self.heights_cm = array('h', heights_cm)
+        self.types = array('B', types)
+        if not len(self.epochs) == len(self.heights_cm) == len(self.types):
+            raise ValueError("epochs, heights_cm and types must have the same length")
+
+    @classmethod
+    def from_events(cls, events):
+        series = cls()
+        for event in events:
+            series.append(event)
+        return series
+
+    @classmethod
+    def from_entries(cls, tides):
+        """Build from JSON entries ({date, time, height, type})"""
+        return cls.from_events(TideEvent.from_entry(tide) for tide in tides)
+
+    @classmethod
+    def from_binary(cls, path):
+        """Load a .tide file (see tide_binary.py)"""
+        with TideColumns(path) as columns:
+            return cls(columns.epochs, columns.heights_cm, columns.types)
+
+    def append(self, event):
+        self.epochs.append(event.epoch)
+        self.heights_cm.append(event.height_cm)
+        self.types.append(event.type)
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __getitem__(self, i):
+        return TideEvent(self.epochs[i], self.heights_cm[i], self.types[i])
+
+    def __iter__(self):
+        return map(TideEvent, self.epochs, self.heights_cm, self.types)
+
+    @property
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (self.epochs, self.heights_cm, self.types))
+
+    def _take(self, order):
+        """Reorder or filter all three columns by a sequence of positions"""
+        if np is not None:
+            order = np.asarray(order, dtype=np.intp)
+            self.epochs = array('i', np.frombuffer(self.epochs, dtype=np.int32)[order].tobytes())
+            self.heights_cm = array('h', np.frombuffer(self.heights_cm, dtype=np.int16)[order].tobytes())
+            self.types = array('B', np.frombuffer(self.types, dtype=np.uint8)[order].tobytes())
+        else:
+            self.epochs = array('i', [self.epochs[i] for i in order])
+            self.heights_cm = array('h', [self.heights_cm[i] for i in order])
+            self.types = array('B', [self.types[i] for i in order])
+
+    def sort(self):
+        """Sort by time in place; stable, so events at the same minute keep their order"""
+        if np is not None:
+            order = np.argsort(np.frombuffer(self.epochs, dtype=np.int32), kind='stable')
+        else:
+            order = sorted(range(len(self)), key=self.epochs.__getitem__)
+        self._take(order)
+        return self
+
+    def dedupe(self):
+        """Drop repeats of an (epoch, height, type) already seen, keeping the first; returns the count removed"""
+        count = len(self)
+        if np is not None:
+            keys = (np.frombuffer(self.epochs, dtype=np.int32).astype(np.int64) << 24
+                    | (np.frombuffer(self.heights_cm, dtype=np.int16).astype(np.int64) + 32768) << 8
+                    | np.frombuffer(self.types, dtype=np.uint8))
+            _, first = np.unique(keys, return_index=True)
+            keep = np.sort(first)
+        else:
+            seen = set()
+            keep = []
+            for i, key in enumerate(zip(self.epochs, self.heights_cm, self.types)):
+                if key not in seen:
+                    seen.add(key)
+                    keep.append(i)
+        if len(keep) < count:
+            self._take(keep)
+        return count - len(self)
+
+    def iter_entries(self):
+        return (event.to_entry() for event in self)
+
+    def to_entries(self):
+        """Return the list of JSON entries"""
+        return list(self.iter_entries())
+
+    def to_json(self, encoding='pretty'):
+        """Encode with any tide_encodings encoding"""
+        return ''.join(tide_encodings.iter_encode(self.iter_entries(), encoding))
+
+    def write_json(self, f, encoding='pretty'):
+        """Stream to a text file with any tide_encodings encoding, returning the count"""
+        return tide_encodings.write(self.iter_entries(), f, encoding)
+
+    def write_binary(self, path, year=0):
+        """Write a .tide file (see tide_binary.py)"""
+        write_columns_binary(self.epochs, self.heights_cm, self.types, path, year)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python3 tide_series.py FILE.json")
+        sys.exit(1)
+
+    tracemalloc.start()
+    tides = tide_encodings.load(sys.argv[1])
+    entries_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    series = TideSeries.from_entries(tides)
+    removed = series.sort().dedupe()
+    print(f"📦 {sys.argv[1]}: {len(series)} events ({removed} duplicates removed)")
+    print(f"    list of dicts ~{entries_bytes / 1024:.0f} KiB, TideSeries {series.nbytes / 1024:.1f} KiB")
+    print(f"    round-trips: {series.to_entries() == tides and series.to_json() == json.dumps(tides, indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+tide_server.py
+
+Local read-only HTTP/JSON service over the extracted ../Data/{year} outputs,
+built on asyncio and the standard library only.
+
+Endpoints (GET, times as YYYY-MM-DD[THH:MM], local tide-table time):
+
+  /stations                                   stations and the years loaded for each
+  /day?station=oostende&date=2025-07-11       tides on one day
+  /next?station=oostende&at=2025-07-11T14:30  first tide at or after a time
+  /height?station=oostende&at=...             cosine-interpolated water level (null across gaps)
+  /range?station=oostende&start=...&end=...   tides in [start, end]
+  /stats                                      per-endpoint request counts and latency percentiles
+
+Each station's years are loaded into a TideStore (see tide_store.py).
+Responses are kept in an LRU keyed by the request target; a watcher task
+polls the output files' mtimes and reloads a changed station, dropping the
+cache. Connections are kept alive, so a load test measures the handler
+rather than TCP setup.
+
+Usage:
+  python3 tide_server.py serve --port 8765
+  python3 tide_server.py bench --port 8765 --clients 50 --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import time
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict, deque
+from urllib.parse import parse_qs, urlsplit
+
+from tide_binary import format_epoch_minutes
+from tide_shards import to_epoch
+from tide_store import TideStore, find_outputs
+
+DATA_DIR = '../Data'
+MAX_GAP = 9 * 60        # as tide_classify.DEFAULT_MAX_GAP: longer intervals mean a missing event
+LATENCY_SAMPLES = 10000
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _mtimes(paths):
+    return tuple(os.stat(path).st_mtime_ns for path in paths)
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class TideService:
+    """Stores, cache and latency stats behind the HTTP handlers"""
+
+    def __init__(self, data_dir=DATA_DIR, cache_size=4096):
+        self.data_dir = data_dir
+        self.cache = LRUCache(cache_size)
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_SAMPLES))
+        self.counts = defaultdict(int)
+        self.stores = {}
+        self.sources = {}
+        self.reload()
+
+    def reload(self):
+        """(Re)load every station whose output files changed; return the stations reloaded"""
+        outputs = find_outputs(self.data_dir)
+        changed = []
+        for station, paths in outputs.items():
+            signature = (tuple(paths), _mtimes(paths))
+            if self.sources.get(station) != signature:
+                self.stores[station] = TideStore.from_paths(paths, station=station)
+                self.sources[station] = signature
+                changed.append(station)
+        for station in set(self.stores) - set(outputs):
+            del self.stores[station], self.sources[station]
+            changed.append(station)
+        if changed:
+            self.cache.clear()
+        return changed
+
+    async def watch(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                changed = self.reload()
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Reload failed: {e}")
+                continue
+            if changed:
+                print(f"🔄 Reloaded {', '.join(sorted(changed))}")
+
+    def _store(self, query):
+        station = query.get('station')
+        if station is None:
+            raise HTTPError(400, "missing parameter: station")
+        store = self.stores.get(station)
+        if store is None:
+            raise HTTPError(404, f"unknown station: {station}")
+        return store
+
+    @staticmethod
+    def _param(query, name, end_of_day=False):
+        value = query.get(name)
+        if value is None:
+            raise HTTPError(400, f"missing parameter: {name}")
+        try:
+            return to_epoch(value, end_of_day)
+        except ValueError:
+            raise HTTPError(400, f"invalid time for {name}: {value}")
+
+    def stations(self, query):
+        return {station: sorted({int(os.path.basename(path)[-9:-5]) for path in self.sources[station][0]})
+                for station in sorted(self.stores)}
+
+    def day(self, query):
+        store = self._store(query)
+        if 'date' not in query:
+            raise HTTPError(400, "missing parameter: date")
+        try:
+            return store.day(query['date'])
+        except ValueError:
+            raise HTTPError(400, f"invalid date: {query['date']}")
+
+    def next(self, query):
+        return self._store(query).next_tide(self._param(query, 'at'))
+
+    def height(self, query):
+        store = self._store(query)
+        t = self._param(query, 'at')
+        i = bisect_left(store.epochs, t)
+        height = None
+        if i < len(store.epochs) and store.epochs[i] == t:
+            height = store.heights_cm[i] / 100
+        elif 0 < i < len(store.epochs) and store.epochs[i] - store.epochs[i - 1] <= MAX_GAP:
+            t0, t1 = store.epochs[i - 1], store.epochs[i]
+            h0, h1 = store.heights_cm[i - 1] / 100, store.heights_cm[i] / 100
+            height = round(h0 + (h1 - h0) * (1 - math.cos(math.pi * (t - t0) / (t1 - t0))) / 2, 3)
+        date_str, time_str = format_epoch_minutes(t)
+        return {'date': date_str, 'time': time_str, 'height': height}
+
+    def range(self, query):
+        store = self._store(query)
+        return store.range(self._param(query, 'start'), self._param(query, 'end', end_of_day=True))
+
+    def stats(self, query):
+        report = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            report[endpoint] = {
+                'requests': self.counts[endpoint],
+                **{f'p{p}_ms': round(ordered[min(len(ordered) - 1, len(ordered) * p // 100)] * 1000, 3)
+                   for p in (50, 95, 99)},
+            }
+        return {'endpoints': report, 'cache': {'entries': len(self.cache.entries),
+                                               'hits': self.cache.hits, 'misses': self.cache.misses}}
+
+    ENDPOINTS = {'/stations': 'stations', '/day': 'day', '/next': 'next', '/height': 'height', '/range': 'range'}
+
+    def respond(self, target):
+        """Return (status, body bytes, cache state) for a request target"""
+        url = urlsplit(target)
+        if url.path == '/stats':
+            return 200, json.dumps(self.stats(None)).encode(), 'bypass'
+        handler = self.ENDPOINTS.get(url.path)
+        if handler is None:
+            return 404, json.dumps({'error': f"unknown endpoint: {url.path}"}).encode(), 'bypass'
+
+        body = self.cache.get(target)
+        if body is not None:
+            return 200, body, 'hit'
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            body = json.dumps(getattr(self, handler)(query), separators=(',', ':')).encode()
+        except HTTPError as e:
+            return e.status, json.dumps({'error': str(e)}).encode(), 'bypass'
+        self.cache.put(target, body)
+        return 200, body, 'miss'
+
+    def record(self, target, seconds):
+        endpoint = urlsplit(target).path
+        if endpoint in self.ENDPOINTS or endpoint == '/stats':
+            self.counts[endpoint] += 1
+            self.latencies[endpoint].append(seconds)
+
+
+async def handle_connection(service, reader, writer):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            start = time.perf_counter()
+            lines = head.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ')
+            except ValueError:
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip().lower()
+            keep_alive = headers.get('connection') != 'close' and version == 'HTTP/1.1'
+
+            if method == 'GET':
+                status, body, cache_state = service.respond(target)
+            else:
+                status, body, cache_state = 405, b'{"error":"only GET is supported"}', 'bypass'
+            writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                         f"Content-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n"
+                         f"X-Cache: {cache_state}\r\n"
+                         f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+            await writer.drain()
+            service.record(target, time.perf_counter() - start)
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(host, port, data_dir, cache_size, watch_interval):
+    service = TideService(data_dir, cache_size)
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+    total = sum(len(store) for store in service.stores.values())
+    print(f"🌊 Serving {len(service.stores)} stations ({total} tides) on http://{host}:{port}")
+    watcher = asyncio.create_task(service.watch(watch_interval))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+def sample_targets(data_dir, count, seed=0):
+    """Random but repeatable request targets across every endpoint and station"""
+    rng = random.Random(seed)
+    outputs = find_outputs(data_dir)
+    years = sorted({int(os.path.basename(path)[-9:-5]) for paths in outputs.values() for path in paths})
+    targets = []
+    for _ in range(count):
+        station = rng.choice(sorted(outputs))
+        day = f"{rng.choice(years)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        at = f"{day}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+        targets.append(rng.choice([
+            f"/day?station={station}&date={day}",
+            f"/next?station={station}&at={at}",
+            f"/height?station={station}&at={at}",
+            f"/range?station={station}&start={day}&end={day[:8]}28",
+        ]))
+    return targets
+
+
+async def _client(host, port, targets, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(re.search(rb'Content-Length: (\d+)', head).group(1))
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b'HTTP/1.1 200'):
+                errors.append(target)
+    finally:
+        writer.close()
+
+
+async def load_test(host, port, clients, requests, data_dir):
+    targets = sample_targets(data_dir, requests)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, targets[i::clients], latencies, errors) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    percentiles = ', '.join(f"p{p} {latencies[min(len(latencies) - 1, len(latencies) * p // 100)] * 1000:.2f} ms"
+                            for p in (50, 95, 99))
+    print(f"📊 {len(latencies)} requests from {clients} clients in {elapsed:.2f}s: "
+          f"{len(latencies) / elapsed:.0f} req/s, {percentiles}, {len(errors)} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON service over the extracted tide data")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = sub.add_parser('serve', help="Run the server")
+    serve_parser.add_argument("--cache-size", type=int, default=4096, help="LRU response cache entries")
+    serve_parser.add_argument("--watch-interval", type=float, default=2.0,
+                              help="Seconds between checks for changed output files")
+
+    bench_parser = sub.add_parser('bench', help="Load-test a running server with concurrent keep-alive clients")
+    bench_parser.add_argument("--clients", type=int, default=50)
+    bench_parser.add_argument("--requests", type=int, default=20000)
+
+    for sub_parser in (serve_parser, bench_parser):
+        sub_parser.add_argument("--host", default='127.0.0.1')
+        sub_parser.add_argument("--port", type=int, default=8765)
+        sub_parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'serve':
+            asyncio.run(serve(args.host, args.port, args.data_dir, args.cache_size, args.watch_interval))
+        else:
+            asyncio.run(load_test(args.host, args.port, args.clients, args.requests, args.data_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
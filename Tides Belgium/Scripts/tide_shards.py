@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+tide_shards.py
+
+Month-sharded station-year outputs with an index manifest.
+
+For each station-year the extractor can write one JSON shard per month to
+../Data/{year}/shards/{station}_{year}_{MM}.json and an index
+{station}_{year}_index.json next to them listing every shard's path, event
+count, first/last timestamps and SHA-256. Readers consult the index and open
+only the shards that overlap the requested window.
+
+Usage (optional):
+  python3 tide_shards.py ../Data/2025/shards/oostende_2025_index.json 2025-07-11 2025-07-12
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+
+import tide_compress
+from tide_binary import epoch_minutes, EPOCH_ORDINAL, MINUTES_PER_DAY
+
+INDEX_VERSION = 1
+
+
+def get_shard_dir(year, data_dir='../Data'):
+    return os.path.join(data_dir, str(year), 'shards')
+
+
+def get_index_path(station_name, year, data_dir='../Data'):
+    return os.path.join(get_shard_dir(year, data_dir), f'{station_name}_{year}_index.json')
+
+
+def _write_atomic(path, data):
+    """Write bytes via a temporary file that replaces path once complete"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_shards(tides, station_name, year, data_dir='../Data'):
+    """Write one JSON shard per month plus the index, returning all paths written
+
+    Every file is replaced atomically and the index is written last, so a
+    reader never sees a partial shard or an index pointing at shards that
+    are not there yet.
+    """
+    shard_dir = get_shard_dir(year, data_dir)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    # Tides are sorted, so each month is one contiguous run
+    months = {}
+    for tide in tides:
+        months.setdefault(tide['date'][:7], []).append(tide)
+
+    shards = []
+    paths = []
+    for month_key, month_tides in months.items():
+        filename = f"{station_name}_{year}_{month_key[5:7]}.json"
+        data = json.dumps(month_tides, indent=2).encode()
+        shard_path = os.path.join(shard_dir, filename)
+        _write_atomic(shard_path, data)
+        paths.append(shard_path)
+
+        first, last = month_tides[0], month_tides[-1]
+        shards.append({
+            'month': int(month_key[5:7]),
+            'path': filename,
+            'count': len(month_tides),
+            'first': f"{first['date']}T{first['time']}",
+            'last': f"{last['date']}T{last['time']}",
+            'first_epoch': epoch_minutes(first['date'], first['time']),
+            'last_epoch': epoch_minutes(last['date'], last['time']),
+            'sha256': hashlib.sha256(data).hexdigest(),
+        })
+
+    index = {
+        'version': INDEX_VERSION,
+        'station': station_name,
+        'year': year,
+        'count': len(tides),
+        'shards': shards,
+    }
+    index_path = get_index_path(station_name, year, data_dir)
+    _write_atomic(index_path, json.dumps(index, indent=2).encode())
+    return [index_path] + paths
+
+
+def load_index(index_path):
+    index = json.loads(tide_compress.read_bytes(index_path))
+    if index.get('version') != INDEX_VERSION:
+        raise ValueError(f"{index_path} has unsupported index version {index.get('version')}")
+    return index
+
+
+def to_epoch(value, end_of_day=False):
+    """Accept a datetime, date or 'YYYY-MM-DD[THH:MM]' string as epoch minutes
+
+    With end_of_day=True a date without a time maps to 23:59 of that day.
+    """
+    if isinstance(value, str):
+        has_time = 'T' in value or ' ' in value
+        value = datetime.fromisoformat(value)
+    else:
+        has_time = isinstance(value, datetime)
+        if not has_time:
+            value = datetime(value.year, value.month, value.day)
+    minutes = (value.toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY + value.hour * 60 + value.minute
+    if end_of_day and not has_time:
+        minutes += MINUTES_PER_DAY - 1
+    return minutes
+
+
+def shards_for_range(index, start, end):
+    """Return the index entries of the shards overlapping [start, end]"""
+    start_epoch, end_epoch = to_epoch(start), to_epoch(end, end_of_day=True)
+    return [shard for shard in index['shards']
+            if shard['last_epoch'] >= start_epoch and shard['first_epoch'] <= end_epoch]
+
+
+def read_range(index_path, start, end, verify=False):
+    """Load only the tides between start and end (inclusive) via the shard index
+
+    A date-only end covers that whole day. With verify=True each opened
+    shard is checked against the SHA-256 recorded in the index.
+    """
+    index = load_index(index_path)
+    shard_dir = os.path.dirname(index_path)
+    start_epoch, end_epoch = to_epoch(start), to_epoch(end, end_of_day=True)
+
+    tides = []
+    for shard in shards_for_range(index, start, end):
+        data = tide_compress.read_bytes(os.path.join(shard_dir, shard['path']))
+        if verify and hashlib.sha256(data).hexdigest() != shard['sha256']:
+            raise ValueError(f"Shard {shard['path']} does not match its index hash")
+        for tide in json.loads(data):
+            if start_epoch <= epoch_minutes(tide['date'], tide['time']) <= end_epoch:
+                tides.append(tide)
+    return tides
+
+
+def main():
+    if len(sys.argv) != 4:
+        print("Usage: python3 tide_shards.py INDEX.json START END")
+        print("Example: python3 tide_shards.py ../Data/2025/shards/oostende_2025_index.json 2025-07-11 2025-07-12")
+        sys.exit(1)
+
+    index_path, start, end = sys.argv[1:]
+    index = load_index(index_path)
+    opened = shards_for_range(index, start, end)
+    tides = read_range(index_path, start, end, verify=True)
+
+    print(f"📂 Opened {len(opened)}/{len(index['shards'])} shards: {', '.join(s['path'] for s in opened)}")
+    for tide in tides:
+        print(f"    {tide['date']} {tide['time']}: {tide['height']}m ({tide['type']})")
+
+
+if __name__ == "__main__":
+    main()
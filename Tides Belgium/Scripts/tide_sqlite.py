@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+tide_sqlite.py
+
+Consolidate every station-year output into one SQLite database.
+
+Tables:
+  tides     (station, epoch) primary key, WITHOUT ROWID, so rows are stored
+            clustered by station then time; height_cm, high (1/0)
+  days      per-day summary: (station, day) key, date, events, highs, lows,
+            max_cm, min_cm
+  sources   the station-year files loaded, with their SHA-256, event count and the
+            number of rows dropped because their (station, epoch) was already loaded
+
+epoch is minutes since 1970-01-01 in tide-table local time and day is
+epoch // 1440, as elsewhere in these scripts. The database is bulk-loaded
+with executemany inside a single transaction into a temporary file, which
+then replaces the old database, so readers never see a half-built file.
+
+Queries use fixed SQL text with parameters, so sqlite3's statement cache
+prepares each one once per connection: range, next event and daily extremes.
+
+Usage:
+  python3 tide_sqlite.py build                                   # ../Data/{year}/*.json
+  python3 tide_sqlite.py build --include "../TidesBelgium.xcarchive/Products/Applications/Tides Belgium.app"
+  python3 tide_sqlite.py query oostende --next 2025-07-11T14:30
+  python3 tide_sqlite.py bench --queries 2000
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import time
+
+from tide_binary import MINUTES_PER_DAY, format_epoch_minutes
+from tide_shards import to_epoch
+from tide_store import find_outputs, load_columns, parse_output_name
+
+DB_PATH = '../Data/tides.sqlite'
+
+SCHEMA = """
+CREATE TABLE sources (
+    station TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    events INTEGER NOT NULL,
+    dropped INTEGER NOT NULL,
+    PRIMARY KEY (station, year)
+);
+CREATE TABLE tides (
+    station TEXT NOT NULL,
+    epoch INTEGER NOT NULL,
+    height_cm INTEGER NOT NULL,
+    high INTEGER NOT NULL,
+    PRIMARY KEY (station, epoch)
+) WITHOUT ROWID;
+CREATE TABLE days (
+    station TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    events INTEGER NOT NULL,
+    highs INTEGER NOT NULL,
+    lows INTEGER NOT NULL,
+    max_cm INTEGER NOT NULL,
+    min_cm INTEGER NOT NULL,
+    PRIMARY KEY (station, day)
+) WITHOUT ROWID;
+"""
+
+SUMMARISE_DAYS = f"""
+INSERT INTO days
+SELECT station, epoch / {MINUTES_PER_DAY} AS day, date(epoch / {MINUTES_PER_DAY} * 86400, 'unixepoch'),
+       count(*), sum(high), sum(1 - high), max(height_cm), min(height_cm)
+FROM tides GROUP BY station, day
+"""
+
+RANGE_SQL = "SELECT epoch, height_cm, high FROM tides WHERE station = ? AND epoch BETWEEN ? AND ? ORDER BY epoch"
+NEXT_SQL = "SELECT epoch, height_cm, high FROM tides WHERE station = ? AND epoch >= ? ORDER BY epoch LIMIT 1"
+DAILY_SQL = ("SELECT date, events, highs, lows, max_cm, min_cm FROM days "
+             "WHERE station = ? AND day BETWEEN ? AND ? ORDER BY day")
+
+
+def collect_sources(data_dir='../Data', include_dirs=()):
+    """Return {(station, year): path}, ../Data/{year} first, then flat folders of {station}_{year}.json
+
+    A station-year already found is not loaded again from a later folder.
+    """
+    sources = {}
+    for station, paths in find_outputs(data_dir).items():
+        for path in paths:
+            sources[parse_output_name(path)] = path
+    for folder in include_dirs:
+        for path in sorted(glob.glob(os.path.join(folder, '*.json'))):
+            name = parse_output_name(path)
+            if name and name not in sources:
+                sources[name] = path
+    return dict(sorted(sources.items()))
+
+
+def _rows(station, path):
+    t, h, k = load_columns(path)
+    return ((station, epoch, height_cm, high) for epoch, height_cm, high in zip(t, h, k))
+
+
+def build_database(sources, db_path=DB_PATH):
+    """Bulk-load the given {(station, year): path} sources, returning (events, {(station, year): rows dropped})
+
+    A source may repeat a timestamp (tide_validate.py reports these as
+    duplicates); the first event at a (station, epoch) is kept and the rest
+    are counted as dropped instead of failing the build.
+    """
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.executescript(SCHEMA)
+        conn.execute('BEGIN')
+        total = 0
+        dropped = {}
+        for (station, year), path in sources.items():
+            with open(path, 'rb') as f:
+                sha256 = hashlib.sha256(f.read()).hexdigest()
+            rows = list(_rows(station, path))
+            before = conn.total_changes
+            conn.executemany('INSERT OR IGNORE INTO tides VALUES (?, ?, ?, ?)', rows)
+            events = conn.total_changes - before
+            conn.execute('INSERT INTO sources VALUES (?, ?, ?, ?, ?, ?)',
+                         (station, year, path, sha256, events, len(rows) - events))
+            total += events
+            if len(rows) > events:
+                dropped[(station, year)] = len(rows) - events
+        conn.execute(SUMMARISE_DAYS)
+        conn.execute('COMMIT')
+        conn.execute('ANALYZE')
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return total, dropped
+
+
+def _entry(row):
+    epoch, height_cm, high = row
+    date_str, time_str = format_epoch_minutes(epoch)
+    return {'date': date_str, 'time': time_str, 'height': height_cm / 100, 'type': 'high' if high else 'low'}
+
+
+class TideDatabase:
+    """Read-only queries against a consolidated tide database"""
+
+    def __init__(self, db_path=DB_PATH):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"{db_path} not found, run: python3 tide_sqlite.py build")
+        self.conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def stations(self):
+        return [row[0] for row in self.conn.execute('SELECT DISTINCT station FROM sources ORDER BY station')]
+
+    def range(self, station, start, end):
+        """Tides between start and end, inclusive (a date-only end covers that day)"""
+        rows = self.conn.execute(RANGE_SQL, (station, to_epoch(start), to_epoch(end, end_of_day=True)))
+        return [_entry(row) for row in rows]
+
+    def next_tide(self, station, at):
+        """First tide at or after a time, or None"""
+        row = self.conn.execute(NEXT_SQL, (station, to_epoch(at))).fetchone()
+        return _entry(row) if row else None
+
+    def daily_extremes(self, station, start, end):
+        """Per-day event counts and highest/lowest water between two dates"""
+        rows = self.conn.execute(DAILY_SQL, (station, to_epoch(start) // MINUTES_PER_DAY,
+                                             to_epoch(end) // MINUTES_PER_DAY))
+        return [{'date': day, 'events': events, 'highs': highs, 'lows': lows,
+                 'max': max_cm / 100, 'min': min_cm / 100}
+                for day, events, highs, lows, max_cm, min_cm in rows]
+
+
+def _scan_range(path, start, end):
+    """What the JSON consumers do today: load the whole file and filter every entry"""
+    with open(path) as f:
+        tides = json.load(f)
+    start_key, end_key = start, end + 'T23:59'
+    return [tide for tide in tides if start_key <= f"{tide['date']}T{tide['time']}" <= end_key]
+
+
+def benchmark(db_path, sources, queries, seed=0):
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(queries):
+        (station, year), path = rng.choice(list(sources.items()))
+        month = rng.randint(1, 12)
+        start = f"{year}-{month:02d}-{rng.randint(1, 20):02d}"
+        cases.append((station, path, start, start[:8] + f"{int(start[8:]) + rng.randint(0, 7):02d}"))
+
+    start_time = time.perf_counter()
+    expected = [_scan_range(path, start, end) for _, path, start, end in cases]
+    json_seconds = time.perf_counter() - start_time
+
+    with TideDatabase(db_path) as db:
+        start_time = time.perf_counter()
+        results = [db.range(station, start, end) for station, _, start, end in cases]
+        sqlite_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for station, _, start, _ in cases:
+            db.next_tide(station, start)
+        next_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for station, _, start, end in cases:
+            db.daily_extremes(station, start, end)
+        daily_seconds = time.perf_counter() - start_time
+
+    if results != expected:
+        raise SystemExit("SQLite range results differ from the JSON scan")
+
+    def per_query(seconds):
+        return seconds / queries * 1e6
+
+    print(f"📊 {queries} range queries over {len(sources)} station-years")
+    print(f"  JSON load + scan     {per_query(json_seconds):>9.1f} µs/query")
+    print(f"  SQLite range         {per_query(sqlite_seconds):>9.1f} µs/query "
+          f"({json_seconds / sqlite_seconds:.0f}x faster)")
+    print(f"  SQLite next event    {per_query(next_seconds):>9.1f} µs/query")
+    print(f"  SQLite daily summary {per_query(daily_seconds):>9.1f} µs/query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consolidated SQLite database of all station-years")
+    parser.add_argument("--db", default=DB_PATH, help="Database path")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = sub.add_parser('build', help="Bulk-load every station-year output")
+    build_parser.add_argument("--data-dir", default='../Data')
+    build_parser.add_argument("--include", nargs='+', default=[],
+                              help="Extra folders of {station}_{year}.json files (e.g. the app bundle)")
+
+    query_parser = sub.add_parser('query', help="Run a lookup")
+    query_parser.add_argument("station")
+    query_parser.add_argument("--range", nargs=2, metavar=("START", "END"))
+    query_parser.add_argument("--next", dest="next_at", metavar="AT")
+    query_parser.add_argument("--daily", nargs=2, metavar=("START", "END"))
+
+    bench_parser = sub.add_parser('bench', help="Compare range queries against scanning the JSON files")
+    bench_parser.add_argument("--data-dir", default='../Data')
+    bench_parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        sources = collect_sources(args.data_dir, args.include)
+        start = time.perf_counter()
+        total, dropped = build_database(sources, args.db)
+        print(f"✅ Loaded {total} tides from {len(sources)} station-years into {args.db} "
+              f"in {time.perf_counter() - start:.2f}s ({os.path.getsize(args.db) / 1024:.0f} KiB)")
+        for (station, year), count in dropped.items():
+            print(f"  ⚠️  {station} {year}: dropped {count} events at an already loaded time "
+                  f"(python3 tide_validate.py {sources[(station, year)]} -v)")
+
+    elif args.command == 'query':
+        with TideDatabase(args.db) as db:
+            if args.next_at:
+                print(json.dumps(db.next_tide(args.station, args.next_at)))
+            if args.range:
+                for tide in db.range(args.station, *args.range):
+                    print(json.dumps(tide))
+            if args.daily:
+                for day in db.daily_extremes(args.station, *args.daily):
+                    print(json.dumps(day))
+
+    else:
+        benchmark(args.db, collect_sources(args.data_dir), args.queries)
+
+
+if __name__ == "__main__":
+    main()
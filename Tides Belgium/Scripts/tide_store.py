@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+tide_store.py
+
+Indexed, read-only store of one station's tides for fast lookups.
+
+The station-year outputs are loaded once into sorted parallel arrays (epoch
+minutes, height in cm, high/low flag) and queried by bisection instead of
+scanning every entry:
+
+  next_tide(t)        first tide at or after t                 O(log n)
+  previous_tide(t)    last tide strictly before t              O(log n)
+  surrounding(t)      (previous_tide(t), next_tide(t))          O(log n)
+  range(start, end)   tides between start and end, inclusive   O(log n + k)
+  day(d)              tides on one calendar day                O(1 + k)
+
+day() uses a per-day offset index: day_offsets[i] is the position of the
+first tide on first_day + i, so a day is the slice between two offsets.
+Times are epoch minutes, datetimes, dates or 'YYYY-MM-DD[THH:MM]' strings;
+a date-only end of range covers that whole day.
+
+Usage (optional):
+  python3 tide_store.py oostende 2025 --next 2025-07-11T14:30
+  python3 tide_store.py oostende 2025 2026 --day 2025-12-31
+"""
+
+import argparse
+import glob
+import numbers
+import operator
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+import tide_compress
+import tide_encodings
+from tide_binary import (TideColumns, TYPE_HIGH, EPOCH_ORDINAL, MINUTES_PER_DAY, decode_columns_binary,
+                         format_epoch_minutes)
+from tide_shards import to_epoch
+
+OUTPUT_PATTERN = re.compile(r'^([a-z]+)_(\d{4})\.(json|tide)(\.gz|\.bz2|\.xz)?$')
+
+
+def parse_output_name(path):
+    """Return (station, year) for a {station}_{year}.json/.tide file name (or a compressed variant), else None"""
+    match = OUTPUT_PATTERN.match(os.path.basename(path))
+    return (match.group(1), int(match.group(2))) if match else None
+
+
+def find_outputs(data_dir='../Data'):
+    """Return {station: [JSON paths by year]} for every {data_dir}/{year}/{station}_{year}.json"""
+    outputs = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '[0-9]' * 4, '*.json'))):
+        name = parse_output_name(path)
+        if name and str(name[1]) == os.path.basename(os.path.dirname(path)):
+            outputs.setdefault(name[0], []).append(path)
+    return outputs
+
+
+def as_epoch(value, end_of_day=False):
+    """Epoch minutes for epoch minutes (any integer, NumPy included), a date, datetime or ISO string"""
+    if isinstance(value, numbers.Integral):
+        return operator.index(value)
+    return to_epoch(value, end_of_day)
+
+
+def day_number(value):
+    """Days since 1970-01-01 for a date, datetime, ISO string or epoch minutes (any integer)"""
+    if isinstance(value, numbers.Integral):
+        return operator.index(value) // MINUTES_PER_DAY
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def load_columns(path):
+    """Load (epochs, heights_cm, high flags) from a .tide file or JSON in any encoding, plain or compressed"""
+    if path.endswith('.tide') and os.path.exists(path):
+        with TideColumns(path) as columns:
+            return (list(columns.epochs), list(columns.heights_cm),
+                    [1 if tide_type & TYPE_HIGH else 0 for tide_type in columns.types])
+    data = tide_compress.read_bytes(path)
+    if tide_compress.plain_path(path).endswith('.tide'):
+        epochs, heights_cm, types, _ = decode_columns_binary(data)
+        return list(epochs), list(heights_cm), [1 if tide_type & TYPE_HIGH else 0 for tide_type in types]
+    return tide_encodings.decode_columns(data)
+
+
+class TideStore:
+    """Sorted epoch/height/type arrays of one station with bisection lookups"""
+
+    def __init__(self, epochs, heights_cm, highs, station=None):
+        order = sorted(range(len(epochs)), key=epochs.__getitem__)
+        self.station = station
+        self.epochs = array('i', (epochs[i] for i in order))
+        self.heights_cm = array('h', (heights_cm[i] for i in order))
+        self.highs = array('B', (highs[i] for i in order))
+        self._build_day_index()
+
+    @classmethod
+    def from_tides(cls, tides, station=None):
+        """Build a store from JSON entries ({date, time, height, type})"""
+        return cls(*tide_encodings.decode_columns(tides), station=station)
+
+    @classmethod
+    def from_paths(cls, paths, station=None):
+        """Build a store from several station-year files, e.g. consecutive years"""
+        epochs, heights_cm, highs = [], [], []
+        for path in paths:
+            t, h, k = load_columns(path)
+            epochs.extend(t)
+            heights_cm.extend(h)
+            highs.extend(k)
+        return cls(epochs, heights_cm, highs, station=station)
+
+    @classmethod
+    def load(cls, station_name, years, data_dir='../Data'):
+        """Load the extractor outputs ../Data/{year}/{station}_{year}.json for the given years"""
+        paths = [os.path.join(data_dir, str(year), f'{station_name}_{year}.json') for year in years]
+        return cls.from_paths(paths, station=station_name)
+
+    def _build_day_index(self):
+        if not self.epochs:
+            self.first_day = 0
+            self.day_offsets = array('I', [0])
+            return
+        self.first_day = self.epochs[0] // MINUTES_PER_DAY
+        days = self.epochs[-1] // MINUTES_PER_DAY - self.first_day + 1
+        offsets = array('I', bytes(4 * (days + 1)))
+        # Count tides per day, then turn the counts into running start offsets
+        for minutes in self.epochs:
+            offsets[minutes // MINUTES_PER_DAY - self.first_day + 1] += 1
+        for i in range(1, days + 1):
+            offsets[i] += offsets[i - 1]
+        self.day_offsets = offsets
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def tide(self, i):
+        """Return tide i as a JSON entry"""
+        date_str, time_str = format_epoch_minutes(self.epochs[i])
+        return {
+            'date': date_str,
+            'time': time_str,
+            'height': self.heights_cm[i] / 100,
+            'type': 'high' if self.highs[i] else 'low'
+        }
+
+    def _slice(self, lo, hi):
+        return [self.tide(i) for i in range(lo, hi)]
+
+    def next_tide(self, t):
+        """First tide at or after t, or None"""
+        i = bisect_left(self.epochs, as_epoch(t))
+        return self.tide(i) if i < len(self.epochs) else None
+
+    def previous_tide(self, t):
+        """Last tide strictly before t, or None"""
+        i = bisect_left(self.epochs, as_epoch(t))
+        return self.tide(i - 1) if i > 0 else None
+
+    def surrounding(self, t):
+        """(previous_tide(t), next_tide(t)), the pair to interpolate the height at t between"""
+        return self.previous_tide(t), self.next_tide(t)
+
+    def range(self, start, end):
+        """Tides between start and end, inclusive"""
+        lo = bisect_left(self.epochs, as_epoch(start))
+        hi = bisect_right(self.epochs, as_epoch(end, end_of_day=True))
+        return self._slice(lo, hi)
+
+    def day_bounds(self, day):
+        """(lo, hi) positions of the tides on one day"""
+        i = day_number(day) - self.first_day
+        if i < 0 or i >= len(self.day_offsets) - 1:
+            return 0, 0
+        return self.day_offsets[i], self.day_offsets[i + 1]
+
+    def day(self, day):
+        """Tides on one calendar day"""
+        return self._slice(*self.day_bounds(day))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a station's tides via the indexed store")
+    parser.add_argument("station", help="Station name, e.g. oostende")
+    parser.add_argument("years", nargs='+', type=int, help="Years to load")
+    parser.add_argument("--next", dest="next_at", help="Show the next tide at or after this time")
+    parser.add_argument("--previous", help="Show the last tide before this time")
+    parser.add_argument("--day", help="Show all tides on this date")
+    parser.add_argument("--range", nargs=2, metavar=("START", "END"), help="Show tides in [START, END]")
+    args = parser.parse_args()
+
+    store = TideStore.load(args.station, args.years)
+    print(f"📚 {args.station}: {len(store)} tides over {len(store.day_offsets) - 1} days")
+
+    results = []
+    if args.next_at:
+        results.append((f"next after {args.next_at}", [store.next_tide(args.next_at)]))
+    if args.previous:
+        results.append((f"previous before {args.previous}", [store.previous_tide(args.previous)]))
+    if args.day:
+        results.append((f"on {args.day}", store.day(args.day)))
+    if args.range:
+        results.append((f"from {args.range[0]} to {args.range[1]}", store.range(*args.range)))
+
+    for label, tides in results:
+        print(f"  {label}:")
+        for tide in tides:
+            if tide is None:
+                print("    (none)")
+            else:
+                print(f"    {tide['date']} {tide['time']}: {tide['height']}m ({tide['type']})")
+
+
+if __name__ == "__main__":
+    main()
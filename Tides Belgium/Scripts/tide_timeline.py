@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+tide_timeline.py
+
+One continuous multi-year series per station, stitched from the station-year outputs.
+
+The outputs are split per year, so a window that crosses 31 Dec -> 1 Jan
+needs two files, and the last tide of a year has no neighbour to
+interpolate towards. This stitches every available year of a station into
+../Data/timeline/{station}.timeline: events sorted across years, duplicates
+between year files dropped, and a per-day offset index over the whole span,
+so a range read across New Year is the same two index lookups and one
+contiguous slice as any other range.
+
+Stitching checks every year boundary:
+  overlap     events a year file holds from the neighbouring year
+  duplicates  identical events in both files (one is kept)
+  conflicts   events at the same minute with a different height or type; the
+              file of the event's calendar year wins
+  gap         minutes from the last event of the old year to the first of the
+              new, which must lie within MIN_GAP..MAX_GAP
+  alternation the events either side of the boundary must be one HW, one LW
+A year missing between two others is reported as a boundary problem too.
+
+Layout (little-endian):
+  header   24 bytes      magic b'TLIN', version u16, flags u16, count u32, first day i32
+                         (days since 1970-01-01), days u32, first year u16, last year u16
+  offsets  4 * (days+1)  uint32  position of the first event on first day + i; the last is count
+  epoch    4 * count     int32   minutes since 1970-01-01 00:00 (local tide-table time)
+  height   2 * count     int16   height in centimetres TAW
+  type     1 * count     uint8   bitmask, TYPE_* of tide_binary.py
+
+Every column is aligned to its item size; Timeline maps the file and reads
+the columns as memoryviews, like TideColumns.
+
+Usage (optional):
+  python3 tide_timeline.py build                          # every station in ../Data
+  python3 tide_timeline.py query oostende --range 2025-12-31 2026-01-01
+  python3 tide_timeline.py query oostende --surrounding 2026-01-01T02:00
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+import tide_compress
+from tide_binary import EPOCH_ORDINAL, MINUTES_PER_DAY, TYPE_HIGH, TYPE_LOW, format_epoch_minutes
+from tide_store import as_epoch, day_number, find_outputs, load_columns, parse_output_name
+
+MAGIC = b'TLIN'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHIiIHH')
+
+TIMELINE_DIR = '../Data/timeline'
+
+MIN_GAP = 3 * 60   # same bounds as tide_validate.py
+MAX_GAP = 9 * 60
+
+
+def get_timeline_path(station_name, timeline_dir=TIMELINE_DIR):
+    return os.path.join(timeline_dir, f'{station_name}.timeline')
+
+
+def _year_start(year):
+    return (date(year, 1, 1).toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY
+
+
+def stitch(year_columns):
+    """Merge {year: (epochs, heights_cm, highs)} into one series, checking each year boundary
+
+    Returns ((epochs, heights_cm, types) arrays, [boundary report, ...]).
+    """
+    years = sorted(year_columns)
+    events = []
+    for year in years:
+        start, end = _year_start(year), _year_start(year + 1)
+        for t, h, high in zip(*year_columns[year]):
+            # Sort key: time, then the file whose calendar year holds the event first
+            events.append((t, not start <= t < end, year, h, TYPE_HIGH if high else TYPE_LOW))
+    events.sort()
+
+    reports = {}
+
+    def report(old_year, new_year):
+        key = f'{old_year}/{new_year}'
+        if key not in reports:
+            reports[key] = {'boundary': key, 'overlap': 0, 'duplicates': 0, 'conflicts': 0,
+                            'gap': None, 'alternates': None, 'problems': []}
+        return reports[key]
+
+    for year in years:
+        start, end = _year_start(year), _year_start(year + 1)
+        for t in year_columns[year][0]:
+            if t >= end:
+                report(year, year + 1)['overlap'] += 1
+            elif t < start:
+                report(year - 1, year)['overlap'] += 1
+
+    epochs, heights, types = array('i'), array('h'), array('B')
+    kept_year = None
+    for t, _, year, h, tide_type in events:
+        # Only events from different files are duplicates here; tide_validate.py reports those within a file
+        if epochs and epochs[-1] == t and kept_year != year:
+            entry = report(*sorted((kept_year, year)))
+            if heights[-1] == h and types[-1] == tide_type:
+                entry['duplicates'] += 1
+            else:
+                entry['conflicts'] += 1
+            continue
+        epochs.append(t)
+        heights.append(h)
+        types.append(tide_type)
+        kept_year = year
+
+    for old_year, new_year in zip(years, years[1:]):
+        entry = report(old_year, new_year)
+        if entry['conflicts']:
+            entry['problems'].append(f"{entry['conflicts']} conflicting events (kept the calendar year's file)")
+        if new_year != old_year + 1:
+            entry['problems'].append(f"no data for {old_year + 1}" if new_year == old_year + 2
+                                     else f"no data for {old_year + 1}-{new_year - 1}")
+            continue
+        i = bisect_left(epochs, _year_start(new_year))
+        if 0 < i < len(epochs):
+            entry['gap'] = epochs[i] - epochs[i - 1]
+            entry['alternates'] = types[i] != types[i - 1]
+            if not MIN_GAP <= entry['gap'] <= MAX_GAP:
+                entry['problems'].append(f"{entry['gap']} min between the last {old_year} and first "
+                                         f"{new_year} tide")
+            if not entry['alternates']:
+                entry['problems'].append("two HW or two LW in a row across New Year")
+        else:
+            entry['problems'].append(f"no tides on one side of {new_year}-01-01")
+
+    return (epochs, heights, types), sorted(reports.values(), key=lambda entry: entry['boundary'])
+
+
+def day_offsets(epochs):
+    """Return (first day, offsets) with offsets[i] the position of the first event on first day + i"""
+    if not epochs:
+        return 0, array('I', [0])
+    first_day = epochs[0] // MINUTES_PER_DAY
+    days = epochs[-1] // MINUTES_PER_DAY - first_day + 1
+    offsets = array('I', bytes(4 * (days + 1)))
+    for minutes in epochs:
+        offsets[minutes // MINUTES_PER_DAY - first_day + 1] += 1
+    for i in range(1, days + 1):
+        offsets[i] += offsets[i - 1]
+    return first_day, offsets
+
+
+def write_timeline(path, epochs, heights, types, first_year, last_year):
+    """Write a stitched series with its day index, via a temporary file"""
+    first_day, offsets = day_offsets(epochs)
+    columns = [offsets, epochs, heights]
+    if sys.byteorder != 'little':
+        columns = [array(column.typecode, column) for column in columns]
+        for column in columns:
+            column.byteswap()
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(epochs), first_day, len(offsets) - 1,
+                            first_year, last_year))
+        for column in columns:
+            f.write(column.tobytes())
+        f.write(types.tobytes())
+    os.replace(tmp_path, path)
+
+
+def build_station(station_name, paths, timeline_dir=TIMELINE_DIR):
+    """Stitch one station's year files into its timeline, returning (path, event count, boundary reports)"""
+    year_columns = {parse_output_name(path)[1]: load_columns(path) for path in paths}
+    (epochs, heights, types), reports = stitch(year_columns)
+    path = get_timeline_path(station_name, timeline_dir)
+    write_timeline(path, epochs, heights, types, min(year_columns), max(year_columns))
+    return path, len(epochs), reports
+
+
+def build_all(data_dir='../Data', timeline_dir=TIMELINE_DIR, stations=None):
+    """Stitch every station found under data_dir; returns {station: (path, event count, boundary reports)}"""
+    return {station: build_station(station, paths, timeline_dir)
+            for station, paths in find_outputs(data_dir).items() if not stations or station in stations}
+
+
+def print_build(results):
+    """Print one line per station and its boundaries; returns the number of boundaries with problems"""
+    problems = 0
+    for station, (path, count, reports) in results.items():
+        print(f"  🧵 {station}: {count} tides -> {path}")
+        for entry in reports:
+            status = '⚠️ ' if entry['problems'] else '✅'
+            gap = f"gap {entry['gap']} min" if entry['gap'] is not None else "no gap"
+            print(f"      {status} {entry['boundary']}: {gap}, {entry['overlap']} overlapping, "
+                  f"{entry['duplicates']} duplicates dropped, {entry['conflicts']} conflicts")
+            for problem in entry['problems']:
+                print(f"         {problem}")
+            problems += bool(entry['problems'])
+    return problems
+
+
+class Timeline:
+    """Range and day reads over a stitched timeline file, without loading it
+
+    A compressed timeline (see tide_compress.py) is decompressed into memory
+    instead of mapped.
+    """
+
+    def __init__(self, path):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._buffer = tide_compress.read_bytes(path)
+
+        (magic, version, self.flags, self.count, self.first_day, self.days,
+         self.first_year, self.last_year) = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a timeline file")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} has unsupported format version {version}")
+
+        view = memoryview(self._buffer)
+        self._view = view
+        offset_start = HEADER.size
+        epoch_start = offset_start + 4 * (self.days + 1)
+        height_start = epoch_start + 4 * self.count
+        type_start = height_start + 2 * self.count
+        self.day_offsets = self._column(view[offset_start:epoch_start], 'I')
+        self.epochs = self._column(view[epoch_start:height_start], 'i')
+        self.heights_cm = self._column(view[height_start:type_start], 'h')
+        self.types = view[type_start:type_start + self.count]
+
+    @staticmethod
+    def _column(raw, fmt):
+        if sys.byteorder == 'little':
+            return raw.cast(fmt)
+        values = array(fmt, raw.tobytes())
+        values.byteswap()
+        return values
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for name in ('day_offsets', 'epochs', 'heights_cm', 'types', '_view'):
+            column = getattr(self, name, None)
+            if isinstance(column, memoryview):
+                column.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def tide(self, i):
+        """Return tide i as a JSON entry"""
+        date_str, time_str = format_epoch_minutes(self.epochs[i])
+        return {
+            'date': date_str,
+            'time': time_str,
+            'height': self.heights_cm[i] / 100,
+            'type': 'high' if self.types[i] & TYPE_HIGH else 'low'
+        }
+
+    def _slice(self, lo, hi):
+        return [self.tide(i) for i in range(lo, hi)]
+
+    def _day_start(self, days):
+        """Position of the first event on or after a day (days since 1970-01-01), clamped to the series"""
+        i = min(max(days - self.first_day, 0), self.days)
+        return self.day_offsets[i]
+
+    def day_bounds(self, day):
+        """(lo, hi) positions of the tides on one day"""
+        days = day_number(day)
+        return self._day_start(days), self._day_start(days + 1)
+
+    def day(self, day):
+        """Tides on one calendar day"""
+        return self._slice(*self.day_bounds(day))
+
+    def range(self, start, end):
+        """Tides between start and end, inclusive; the day index narrows both searches to one day"""
+        start_epoch, end_epoch = as_epoch(start), as_epoch(end, end_of_day=True)
+        lo = bisect_left(self.epochs, start_epoch, *self.day_bounds(start_epoch))
+        hi = bisect_right(self.epochs, end_epoch, *self.day_bounds(end_epoch))
+        return self._slice(lo, hi)
+
+    def _position(self, t):
+        t = as_epoch(t)
+        lo, hi = self.day_bounds(t)
+        return bisect_left(self.epochs, t, lo, hi)
+
+    def next_tide(self, t):
+        """First tide at or after t, or None"""
+        i = self._position(t)
+        return self.tide(i) if i < self.count else None
+
+    def previous_tide(self, t):
+        """Last tide strictly before t, or None"""
+        i = self._position(t)
+        return self.tide(i - 1) if i > 0 else None
+
+    def surrounding(self, t):
+        """(previous_tide(t), next_tide(t)), the pair to interpolate the height at t between"""
+        return self.previous_tide(t), self.next_tide(t)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stitch station-years into continuous timelines and query them")
+    parser.add_argument("--timeline-dir", default=TIMELINE_DIR, help="Timeline folder")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = sub.add_parser('build', help="Stitch every available year per station")
+    build_parser.add_argument("stations", nargs='*', help="Stations (default: all in ../Data)")
+
+    query_parser = sub.add_parser('query', help="Read tides from a station's timeline")
+    query_parser.add_argument("station", help="Station name, e.g. oostende")
+    query_parser.add_argument("--day", help="Show all tides on this date")
+    query_parser.add_argument("--range", nargs=2, metavar=("START", "END"), help="Show tides in [START, END]")
+    query_parser.add_argument("--surrounding", metavar="TIME", help="Show the tides before and after this time")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        results = build_all(timeline_dir=args.timeline_dir, stations=args.stations)
+        elapsed = time.perf_counter() - start
+        if not results:
+            print("❌ No outputs found under ../Data; run extract_year_data.py first")
+            sys.exit(1)
+        print(f"🧵 STITCHING {len(results)} STATIONS")
+        problems = print_build(results)
+        print(f"{'✅' if not problems else '⚠️ '} {problems} boundaries with problems, built in {elapsed:.2f}s")
+        sys.exit(1 if problems else 0)
+
+    with Timeline(get_timeline_path(args.station, args.timeline_dir)) as timeline:
+        print(f"🧵 {args.station}: {len(timeline)} tides, {timeline.first_year}-{timeline.last_year}")
+        results = []
+        if args.day:
+            results.append((f"on {args.day}", timeline.day(args.day)))
+        if args.range:
+            results.append((f"from {args.range[0]} to {args.range[1]}", timeline.range(*args.range)))
+        if args.surrounding:
+            results.append((f"around {args.surrounding}", list(timeline.surrounding(args.surrounding))))
+
+        for label, tides in results:
+            print(f"  {label}:")
+            for tide in tides:
+                if tide is None:
+                    print("    (none)")
+                else:
+                    print(f"    {tide['date']} {tide['time']}: {tide['height']}m ({tide['type']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+tide_validate.py
+
+Quality checks for the station-year outputs.
+
+Each file is loaded into NumPy arrays (epoch minutes, height in cm, high
+flag) and every check runs as array operations over the whole series:
+
+  unsorted      events out of time order in the file
+  duplicates    more than one event at the same minute
+  missing_days  days of the year without any event
+  day_counts    days with events, but not 3 or 4 of them
+  gaps          time between consecutive events outside MIN_GAP..MAX_GAP
+  alternation   two HW or two LW in a row (only checked across gaps up to MAX_GAP)
+  outliers      heights more than MAX_Z rolling standard deviations from the mean
+                of the OUTLIER_WINDOW nearest events of the same type
+
+Files are validated concurrently, one process per file, and the report
+lists the number of findings per check and station-year.
+
+Usage:
+  python3 tide_validate.py                          # every ../Data/{year}/*.json
+  python3 tide_validate.py ../Data/nieuwpoort_2025_fixed.json -v
+  python3 tide_validate.py --ignore missing_days --json validation.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit("numpy is required: pip install numpy")
+
+from tide_binary import EPOCH_ORDINAL, MINUTES_PER_DAY, format_epoch_minutes
+from tide_store import find_outputs, load_columns, parse_output_name
+
+CHECKS = {
+    'unsorted': "events out of time order",
+    'duplicates': "duplicate timestamps",
+    'missing_days': "days without events",
+    'day_counts': "days without 3-4 events",
+    'gaps': "implausible gaps between events",
+    'alternation': "HW/LW not alternating",
+    'outliers': "height outliers",
+}
+
+MIN_EVENTS_PER_DAY = 3
+MAX_EVENTS_PER_DAY = 4
+MIN_GAP = 3 * 60     # HW->LW is ~6h12m, rarely under 4.5h
+MAX_GAP = 9 * 60     # a longer gap means an event is missing (as in tide_classify.py)
+OUTLIER_WINDOW = 14  # same-type neighbours, about a week, short of the spring-neap swing
+MAX_Z = 4.0
+MIN_STD_CM = 5.0     # floor so a flat stretch does not turn rounding into outliers
+
+EXAMPLES = 5
+
+
+def _rolling_z(h, window=OUTLIER_WINDOW):
+    """z-score of each value against the mean/std of its window nearest neighbours (itself excluded)"""
+    n = len(h)
+    h = h.astype(np.float64)
+    half = window // 2
+    i = np.arange(n)
+    lo = np.clip(i - half, 0, n)
+    hi = np.clip(i + half + 1, 0, n)
+    s1 = np.concatenate(([0.0], np.cumsum(h)))
+    s2 = np.concatenate(([0.0], np.cumsum(h * h)))
+    count = hi - lo - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (s1[hi] - s1[lo] - h) / count
+        var = (s2[hi] - s2[lo] - h * h) / count - mean * mean
+        z = (h - mean) / np.maximum(np.sqrt(np.maximum(var, 0.0)), MIN_STD_CM)
+    return np.where(count > 1, z, 0.0)
+
+
+def validate_arrays(t, h, high, year=None):
+    """Run every check on one series, returning {check: (epoch minutes, detail)} arrays of findings
+
+    The detail is the number of events for day checks, the gap in minutes for
+    gaps and alternation, the z-score for outliers and the height in cm
+    otherwise. Days are reported by their first minute.
+    """
+    t = np.asarray(t, dtype=np.int64)
+    h = np.asarray(h, dtype=np.int64)
+    high = np.asarray(high, dtype=bool)
+    findings = {}
+
+    backwards = np.flatnonzero(np.diff(t) < 0) + 1
+    findings['unsorted'] = (t[backwards], h[backwards])
+
+    order = np.argsort(t, kind='stable')
+    t, h, high = t[order], h[order], high[order]
+    gap = np.diff(t)
+
+    repeat = np.flatnonzero(gap == 0) + 1
+    findings['duplicates'] = (t[repeat], h[repeat])
+
+    # Per-day counts over the whole year (or the span of the data if the year is unknown)
+    days = t // MINUTES_PER_DAY
+    if year:
+        first = date(year, 1, 1).toordinal() - EPOCH_ORDINAL
+        last = date(year, 12, 31).toordinal() - EPOCH_ORDINAL
+    else:
+        first, last = (int(days[0]), int(days[-1])) if len(days) else (0, -1)
+    inside = (days >= first) & (days <= last)
+    counts = np.bincount(days[inside] - first, minlength=last - first + 1)
+    all_days = (np.arange(first, last + 1)) * MINUTES_PER_DAY
+    missing = counts == 0
+    findings['missing_days'] = (all_days[missing], counts[missing])
+    odd_count = ~missing & ((counts < MIN_EVENTS_PER_DAY) | (counts > MAX_EVENTS_PER_DAY))
+    findings['day_counts'] = (all_days[odd_count], counts[odd_count])
+
+    # Gaps are reported at the event that ends them; duplicates are already reported
+    bad_gap = np.flatnonzero((gap > 0) & ((gap < MIN_GAP) | (gap > MAX_GAP))) + 1
+    findings['gaps'] = (t[bad_gap], gap[bad_gap - 1])
+
+    same_type = np.flatnonzero((high[1:] == high[:-1]) & (gap <= MAX_GAP)) + 1
+    findings['alternation'] = (t[same_type], gap[same_type - 1])
+
+    z = np.zeros(len(t))
+    for mask in (high, ~high):
+        z[mask] = _rolling_z(h[mask])
+    outlier = np.flatnonzero(np.abs(z) > MAX_Z)
+    findings['outliers'] = (t[outlier], np.round(z[outlier], 1))
+
+    return findings
+
+
+def validate_path(path):
+    """Validate one station-year file, returning a JSON-serialisable report"""
+    start = time.perf_counter()
+    name = parse_output_name(path)
+    t, h, high = load_columns(path)
+    findings = validate_arrays(t, h, high, name[1] if name else None)
+
+    checks = {}
+    for check, (epochs, detail) in findings.items():
+        checks[check] = {
+            'count': len(epochs),
+            'examples': [[*format_epoch_minutes(int(epoch)), detail.item()]
+                         for epoch, detail in zip(epochs[:EXAMPLES], detail[:EXAMPLES])]
+        }
+    return {
+        'path': path,
+        'station': name[0] if name else os.path.basename(path),
+        'year': name[1] if name else None,
+        'events': len(t),
+        'checks': checks,
+        'seconds': round(time.perf_counter() - start, 4),
+    }
+
+
+def validate_paths(paths, jobs=None):
+    """Validate files concurrently, returning their reports in order"""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+            return list(pool.map(validate_path, paths))
+    return [validate_path(path) for path in paths]
+
+
+def default_paths(data_dir='../Data'):
+    return [path for paths in find_outputs(data_dir).values() for path in paths]
+
+
+def print_report(reports, ignore=(), verbose=False):
+    """Print one line per station-year and return the number of files with findings"""
+    checks = [check for check in CHECKS if check not in ignore]
+    print(f"{'station-year':<28}{'events':>7}" + ''.join(f"{check:>14}" for check in checks))
+    failed = 0
+    for report in reports:
+        label = f"{report['station']} {report['year'] or ''}".strip()
+        counts = [report['checks'][check]['count'] for check in checks]
+        status = '✅' if not any(counts) else '⚠️ '
+        failed += bool(any(counts))
+        print(f"{status} {label:<25}{report['events']:>7}" + ''.join(f"{count:>14}" for count in counts))
+        if verbose:
+            for check in checks:
+                found = report['checks'][check]
+                for date_str, time_str, detail in found['examples']:
+                    print(f"      {CHECKS[check]}: {date_str} {time_str} ({detail})")
+                if found['count'] > len(found['examples']):
+                    print(f"      {CHECKS[check]}: ... {found['count'] - len(found['examples'])} more")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate station-year tide outputs")
+    parser.add_argument("paths", nargs='*', help="Station-year files (default: every ../Data/{year}/*.json)")
+    parser.add_argument("--jobs", "-j", type=int, default=0, help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--ignore", nargs='+', choices=list(CHECKS), default=[],
+                        help="Checks to leave out of the report and the exit status")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report as JSON")
+    parser.add_argument("--verbose", "-v", action="store_true", help=f"Show up to {EXAMPLES} findings per check")
+    args = parser.parse_args()
+
+    paths = args.paths or default_paths()
+    start = time.perf_counter()
+    reports = validate_paths(paths, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    print(f"🔎 VALIDATING {len(paths)} STATION-YEARS")
+    print("=" * 50)
+    failed = print_report(reports, args.ignore, args.verbose)
+    print(f"{'✅' if not failed else '⚠️ '} {len(reports) - failed}/{len(reports)} clean in {elapsed:.2f}s")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'checks': CHECKS, 'ignored': args.ignore, 'reports': reports}, f, indent=2)
+        print(f"📊 Report saved: {args.json}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+xlsx_grid.py
+
+Cached cell-grid snapshots of the source workbooks.
+
+Parsing a workbook's XML takes far longer than reading back the few thousand
+values it holds, and investigating a layout or column mapping reloads the
+same workbooks again and again. The first time a workbook is opened here,
+every sheet is decoded once (via xlsx_reader.py) into a dense value grid and
+saved as ../SourceData/.grid_cache/{sha256}.grid, keyed by the SHA-256 of
+the .xlsx, so an edited or replaced workbook simply gets a new snapshot.
+Later opens only read the grid back.
+
+Layout (little-endian):
+  header   12 bytes   magic b'TGRD', version u16, sheet count u16, meta length u32
+  meta     JSON       {source, sha256, strings: [...], sheets: [{name, rows, cols}]},
+                      padded to a multiple of 8 bytes
+  per sheet, row-major over rows x cols (row 1, column 1 first):
+    value  8 * cells  float64  the number, 0/1 for booleans, or an index into strings
+    kind   1 * cells  uint8    KIND_* below, padded to a multiple of 8 bytes
+
+KIND_TIME marks a number openpyxl would read as a time of day (see
+xlsx_reader.py); iter_rows converts only those in time columns.
+
+GridWorkbook has the same sheetnames/iter_rows interface as XlsxReader, so
+the extractors can read from the snapshot (extract_year_data.py --reader
+grid), and gives debug tools random access to any cell via sheet(name).
+
+Usage (optional):
+  python3 xlsx_grid.py build                      # every workbook under ../SourceData
+  python3 xlsx_grid.py show ../SourceData/xlsx-getijtabellen-taw-2025/Nieuwpoort2025_mTAW.xlsx jan-feb --rows 4 12
+  python3 xlsx_grid.py prune                      # drop snapshots of workbooks that changed
+"""
+
+import argparse
+import glob
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+
+import build_cache
+from xlsx_reader import XlsxReader, fraction_to_minutes
+
+MAGIC = b'TGRD'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sHHI')
+
+KIND_EMPTY = 0
+KIND_INT = 1
+KIND_FLOAT = 2
+KIND_STRING = 3
+KIND_BOOL = 4
+KIND_TIME = 5
+
+CACHE_DIR = '../SourceData/.grid_cache'
+SOURCE_GLOB = '../SourceData/xlsx-getijtabellen-taw-*/*.xlsx'
+
+
+def _pad(length):
+    return -length % 8
+
+
+def snapshot_path(sha256, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f'{sha256}.grid')
+
+
+def build_snapshot(xlsx_path, out_path, sha256=None):
+    """Decode every sheet of a workbook into a grid file, returning the number of cells with a value"""
+    strings = []
+    string_ids = {}
+    sheets = []
+    filled = 0
+
+    with XlsxReader(xlsx_path) as book:
+        for name in book.sheetnames:
+            rows = cols = 0
+            cells = []
+            for row_idx, row_cells in book.iter_cells(name):
+                rows = max(rows, row_idx)
+                for col_idx, value, is_time in row_cells:
+                    cols = max(cols, col_idx)
+                    if value is not None:
+                        cells.append((row_idx, col_idx, value, is_time))
+
+            kinds = bytearray(rows * cols)
+            values = array('d', bytes(8 * rows * cols))
+            for row_idx, col_idx, value, is_time in cells:
+                i = (row_idx - 1) * cols + col_idx - 1
+                if is_time:
+                    kinds[i], values[i] = KIND_TIME, value
+                elif isinstance(value, bool):
+                    kinds[i], values[i] = KIND_BOOL, value
+                elif isinstance(value, int):
+                    kinds[i], values[i] = KIND_INT, value
+                elif isinstance(value, float):
+                    kinds[i], values[i] = KIND_FLOAT, value
+                else:
+                    if value not in string_ids:
+                        string_ids[value] = len(strings)
+                        strings.append(value)
+                    kinds[i], values[i] = KIND_STRING, string_ids[value]
+            filled += len(cells)
+            sheets.append(({'name': name, 'rows': rows, 'cols': cols}, values, kinds))
+
+    meta = json.dumps({
+        'source': os.path.basename(xlsx_path),
+        'sha256': sha256 or build_cache.file_sha256(xlsx_path),
+        'strings': strings,
+        'sheets': [sheet for sheet, _, _ in sheets]
+    }).encode()
+
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(sheets), len(meta)))
+        f.write(meta + b' ' * _pad(HEADER.size + len(meta)))
+        for _, values, kinds in sheets:
+            f.write(values.tobytes())
+            f.write(kinds + bytes(_pad(len(kinds))))
+    os.replace(tmp_path, out_path)
+    return filled
+
+
+class SheetGrid:
+    """One sheet's values; rows and columns are 1-based like in Excel"""
+
+    def __init__(self, name, rows, cols, values, kinds, strings):
+        self.name = name
+        self.rows = rows
+        self.cols = cols
+        self.values = values
+        self.kinds = kinds
+        self.strings = strings
+
+    def value(self, row, col):
+        """Return the cell value (int, float, str, bool) or None"""
+        if not (1 <= row <= self.rows and 1 <= col <= self.cols):
+            return None
+        i = (row - 1) * self.cols + col - 1
+        kind = self.kinds[i]
+        if kind == KIND_EMPTY:
+            return None
+        value = self.values[i]
+        if kind in (KIND_FLOAT, KIND_TIME):
+            return value
+        if kind == KIND_INT:
+            return int(value)
+        if kind == KIND_STRING:
+            return self.strings[int(value)]
+        return value != 0
+
+    def is_time(self, row, col):
+        """Whether openpyxl would read the cell as a time of day"""
+        if not (1 <= row <= self.rows and 1 <= col <= self.cols):
+            return False
+        return self.kinds[(row - 1) * self.cols + col - 1] == KIND_TIME
+
+    def row(self, row):
+        """Return one row as a tuple of cols values"""
+        return tuple(self.value(row, col) for col in range(1, self.cols + 1))
+
+    def to_numpy(self):
+        """Return the sheet as a (rows, cols) object array; index [row - 1, col - 1]"""
+        import numpy as np
+        grid = np.empty((self.rows, self.cols), dtype=object)
+        for row in range(1, self.rows + 1):
+            grid[row - 1] = self.row(row)
+        return grid
+
+
+class GridWorkbook:
+    """A workbook snapshot with XlsxReader's read interface"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, sheet_count, meta_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} grid snapshot")
+        meta = json.loads(data[HEADER.size:HEADER.size + meta_length])
+        self.path = path
+        self.source = meta['source']
+        self.sha256 = meta['sha256']
+        self.strings = meta['strings']
+
+        self._sheets = {}
+        offset = HEADER.size + meta_length + _pad(HEADER.size + meta_length)
+        for sheet in meta['sheets']:
+            cells = sheet['rows'] * sheet['cols']
+            values = array('d')
+            values.frombytes(data[offset:offset + 8 * cells])
+            offset += 8 * cells
+            kinds = data[offset:offset + cells]
+            offset += cells + _pad(cells)
+            self._sheets[sheet['name']] = SheetGrid(sheet['name'], sheet['rows'], sheet['cols'], values, kinds,
+                                                    self.strings)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        pass
+
+    @property
+    def sheetnames(self):
+        return list(self._sheets)
+
+    def sheet(self, name):
+        return self._sheets[name]
+
+    def iter_rows(self, sheet_name, columns, time_columns=(), min_row=1):
+        """Yield rows exactly as XlsxReader.iter_rows does for the same workbook"""
+        grid = self._sheets[sheet_name]
+        wanted = sorted(set(columns))
+        times = frozenset(time_columns)
+        width = wanted[-1]
+
+        for row in range(min_row, grid.rows + 1):
+            values = [None] * width
+            for col in wanted:
+                value = grid.value(row, col)
+                if col in times and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    value = fraction_to_minutes(value) if grid.is_time(row, col) else float(value)
+                values[col - 1] = value
+            yield tuple(values)
+
+
+def open_workbook(xlsx_path, cache_dir=CACHE_DIR):
+    """Return the GridWorkbook of an .xlsx, snapshotting it first if this version is not cached
+
+    A snapshot in an older grid format is rebuilt.
+    """
+    sha256 = build_cache.file_sha256(xlsx_path)
+    if sha256 is None:
+        raise FileNotFoundError(xlsx_path)
+    path = snapshot_path(sha256, cache_dir)
+    if os.path.exists(path):
+        try:
+            return GridWorkbook(path)
+        except ValueError:
+            pass
+    build_snapshot(xlsx_path, path, sha256)
+    return GridWorkbook(path)
+
+
+def prune(cache_dir=CACHE_DIR, sources=SOURCE_GLOB):
+    """Remove snapshots whose hash matches none of the current source workbooks, returning their paths"""
+    current = {build_cache.file_sha256(path) for path in glob.glob(sources)}
+    stale = [path for path in glob.glob(os.path.join(cache_dir, '*.grid'))
+             if os.path.basename(path)[:-len('.grid')] not in current]
+    for path in stale:
+        os.remove(path)
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cached cell-grid snapshots of the source workbooks")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Snapshot folder")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = sub.add_parser('build', help="Snapshot workbooks (re-snapshots even if cached)")
+    build_parser.add_argument("workbooks", nargs='*', help=f"Workbooks (default: {SOURCE_GLOB})")
+
+    show_parser = sub.add_parser('show', help="Print a sheet's grid")
+    show_parser.add_argument("workbook")
+    show_parser.add_argument("sheet")
+    show_parser.add_argument("--rows", nargs=2, type=int, metavar=("FIRST", "LAST"))
+    show_parser.add_argument("--columns", nargs='+', type=int, help="Columns to print (default: all)")
+
+    sub.add_parser('prune', help="Remove snapshots of workbooks that no longer exist or have changed")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        workbooks = args.workbooks or sorted(glob.glob(SOURCE_GLOB))
+        print(f"{'workbook':<32}{'cells':>7}{'xlsx ms':>9}{'grid ms':>9}")
+        for xlsx_path in workbooks:
+            sha256 = build_cache.file_sha256(xlsx_path)
+            start = time.perf_counter()
+            filled = build_snapshot(xlsx_path, snapshot_path(sha256, args.cache_dir), sha256)
+            parse_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            open_workbook(xlsx_path, args.cache_dir)
+            load_ms = (time.perf_counter() - start) * 1000
+            print(f"{os.path.basename(xlsx_path):<32}{filled:>7}{parse_ms:>9.1f}{load_ms:>9.1f}")
+
+    elif args.command == 'show':
+        book = open_workbook(args.workbook, args.cache_dir)
+        if args.sheet not in book.sheetnames:
+            print(f"No sheet {args.sheet!r}; sheets: {', '.join(book.sheetnames)}")
+            sys.exit(1)
+        grid = book.sheet(args.sheet)
+        first, last = args.rows or (1, grid.rows)
+        columns = args.columns or range(1, grid.cols + 1)
+        print(f"📄 {book.source} [{args.sheet}]: {grid.rows} rows x {grid.cols} columns")
+        for row in range(first, min(last, grid.rows) + 1):
+            print(f"{row:>4}: " + ' | '.join('' if grid.value(row, col) is None else str(grid.value(row, col))
+                                            for col in columns))
+
+    else:
+        stale = prune(args.cache_dir)
+        print(f"🧹 Removed {len(stale)} stale snapshot(s) from {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
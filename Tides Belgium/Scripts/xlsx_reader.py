@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+xlsx_reader.py
+
+Minimal .xlsx reader for the Belgian tide tables that bypasses openpyxl.
+
+The extractors only need raw values from a few known columns, so this opens the
+workbook zip directly, resolves shared strings once and streams
+xl/worksheets/sheetN.xml with an incremental parser. No cell or style objects
+are built; only the requested columns are decoded and Excel time fractions in
+the requested time columns are converted straight to minutes since midnight.
+
+Like openpyxl, a number only counts as a time when its cell style has a
+date/time number format (resolved once from xl/styles.xml) and its value is
+a time of day; any other number in a time column is returned as a float, so
+it can't be mistaken for minutes. synthetic_workbooks.py --check-readers
+compares both readers on a workbook with such cells.
+
+Usage (optional):
+  python3 xlsx_reader.py ../SourceData/xlsx-getijtabellen-taw-2025/Oostende2025_mTAW.xlsx jan-feb
+"""
+
+import posixpath
+import re
+import sys
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+MINUTES_PER_DAY = 24 * 60
+
+# Built-in number formats openpyxl reads as datetimes (46, '[h]:mm:ss', is a timedelta)
+BUILTIN_DATE_FORMATS = frozenset({14, 15, 16, 17, 18, 19, 20, 21, 22, 45, 47})
+
+# The tests of openpyxl.styles.numbers.is_date_format and is_timedelta_format
+LITERAL_OR_LOCALE = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+DATE_CODE = re.compile(r'(?<![_\\])[dmhysDMHYS]')
+ELAPSED_CODE = re.compile(r'\[hh?\](:mm(:ss(\.0*)?)?)?|\[mm?\](:ss(\.0*)?)?|\[ss?\](\.0*)?', re.I)
+
+
+def column_index(ref):
+    """Return the 1-based column of a cell reference like 'AA12'"""
+    col = 0
+    for ch in ref:
+        if 'A' <= ch <= 'Z':
+            col = col * 26 + (ord(ch) - 64)
+        else:
+            break
+    return col
+
+
+def fraction_to_minutes(value):
+    """Convert an Excel day fraction to whole minutes since midnight
+
+    Seconds are rounded first and then truncated to the minute, which matches
+    how openpyxl's datetime.time values are formatted with '%H:%M'.
+    """
+    seconds = int(round((value % 1) * 86400))
+    return (seconds // 60) % MINUTES_PER_DAY
+
+
+def is_time_format(format_code):
+    """Whether openpyxl reads numbers in this format as datetimes rather than numbers or timedeltas"""
+    section = format_code.split(';')[0]
+    return DATE_CODE.search(LITERAL_OR_LOCALE.sub('', section)) is not None and not ELAPSED_CODE.search(section)
+
+
+def is_time_of_day(number):
+    """Whether openpyxl turns a date-formatted number into a datetime.time (not a datetime)"""
+    return 0 <= number < 1 and round(number * 86400000) < 86400000
+
+
+class XlsxReader:
+    """Read-only access to the sheets of one .xlsx file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        self._shared_strings = None
+        self._time_styles = None
+        self._sheet_paths = self._read_sheet_paths()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.zip.close()
+
+    @property
+    def sheetnames(self):
+        return list(self._sheet_paths)
+
+    def _read_sheet_paths(self):
+        """Map sheet names to their worksheet part via workbook.xml and its rels"""
+        targets = {}
+        with self.zip.open('xl/_rels/workbook.xml.rels') as f:
+            for _, elem in iterparse(f):
+                if elem.tag == f'{NS_PKG_REL}Relationship':
+                    target = elem.get('Target')
+                    if target.startswith('/'):
+                        target = target[1:]
+                    else:
+                        target = posixpath.normpath(posixpath.join('xl', target))
+                    targets[elem.get('Id')] = target
+
+        sheets = {}
+        with self.zip.open('xl/workbook.xml') as f:
+            for _, elem in iterparse(f):
+                if elem.tag == f'{NS_MAIN}sheet':
+                    sheets[elem.get('name')] = targets.get(elem.get(f'{NS_REL}id'))
+        return sheets
+
+    @property
+    def shared_strings(self):
+        if self._shared_strings is None:
+            self._shared_strings = self._read_shared_strings()
+        return self._shared_strings
+
+    def _read_shared_strings(self):
+        strings = []
+        try:
+            f = self.zip.open('xl/sharedStrings.xml')
+        except KeyError:
+            return strings
+        with f:
+            for _, elem in iterparse(f):
+                if elem.tag == f'{NS_MAIN}si':
+                    # Rich text splits a string over several <r><t> runs
+                    strings.append(''.join(t.text or '' for t in elem.iter(f'{NS_MAIN}t')))
+                    elem.clear()
+        return strings
+
+    @property
+    def time_styles(self):
+        """Cell style ids (the 's' attribute) whose number format reads as a date/time"""
+        if self._time_styles is None:
+            self._time_styles = self._read_time_styles()
+        return self._time_styles
+
+    def _read_time_styles(self):
+        try:
+            f = self.zip.open('xl/styles.xml')
+        except KeyError:
+            return frozenset()
+        custom = {}
+        styles = set()
+        index = 0
+        in_cell_xfs = False
+        with f:
+            for event, elem in iterparse(f, events=('start', 'end')):
+                tag = elem.tag
+                if tag == f'{NS_MAIN}cellXfs':
+                    in_cell_xfs = event == 'start'
+                elif event == 'end' and tag == f'{NS_MAIN}numFmt':
+                    custom[int(elem.get('numFmtId'))] = elem.get('formatCode', '')
+                elif event == 'end' and tag == f'{NS_MAIN}xf' and in_cell_xfs:
+                    format_id = int(elem.get('numFmtId', 0))
+                    if format_id in custom:
+                        is_time = is_time_format(custom[format_id])
+                    else:
+                        is_time = format_id in BUILTIN_DATE_FORMATS
+                    if is_time:
+                        styles.add(str(index))
+                    index += 1
+        return frozenset(styles)
+
+    def is_time_cell(self, cell, value):
+        """Whether openpyxl would read this cell's value as a datetime.time"""
+        return (isinstance(value, (int, float)) and not isinstance(value, bool)
+                and cell.get('s', '0') in self.time_styles and is_time_of_day(value))
+
+    def _cell_value(self, cell, is_time):
+        cell_type = cell.get('t', 'n')
+        if cell_type == 'inlineStr':
+            return ''.join(t.text or '' for t in cell.iter(f'{NS_MAIN}t'))
+
+        v = cell.find(f'{NS_MAIN}v')
+        if v is None or v.text is None:
+            return None
+        text = v.text
+        if cell_type == 's':
+            return self.shared_strings[int(text)]
+        if cell_type in ('str', 'e'):
+            return text
+        if cell_type == 'b':
+            return text == '1'
+
+        number = float(text) if ('.' in text or 'E' in text or 'e' in text) else int(text)
+        if is_time:
+            return fraction_to_minutes(number) if self.is_time_cell(cell, number) else float(number)
+        return number
+
+    def iter_rows(self, sheet_name, columns, time_columns=(), min_row=1):
+        """Yield one tuple per row, from min_row to the last row with data
+
+        Each tuple is indexed like an openpyxl row (column N at index N - 1)
+        and is as long as the highest requested column. Columns that were not
+        requested are always None. Time cells in time_columns come back as
+        minutes since midnight, other numbers there as floats. Rows missing from the XML are yielded as
+        empty rows so row adjacency matches the sheet.
+        """
+        wanted = frozenset(columns)
+        times = frozenset(time_columns)
+        width = max(wanted)
+        empty = (None,) * width
+
+        next_row = min_row
+        values = None
+        row_idx = 0
+        col_idx = 0
+
+        with self.zip.open(self._sheet_paths[sheet_name]) as f:
+            for event, elem in iterparse(f, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == f'{NS_MAIN}row':
+                        r = elem.get('r')
+                        row_idx = int(r) if r else row_idx + 1
+                        col_idx = 0
+                        values = [None] * width
+                    continue
+
+                if tag == f'{NS_MAIN}c':
+                    ref = elem.get('r')
+                    col_idx = column_index(ref) if ref else col_idx + 1
+                    if col_idx in wanted and row_idx >= min_row:
+                        values[col_idx - 1] = self._cell_value(elem, col_idx in times)
+                    elem.clear()
+                elif tag == f'{NS_MAIN}row':
+                    if row_idx >= min_row:
+                        while next_row < row_idx:
+                            yield empty
+                            next_row += 1
+                        yield tuple(values)
+                        next_row = row_idx + 1
+                    elem.clear()
+
+    def iter_cells(self, sheet_name):
+        """Yield (row, [(column, value, is_time), ...]) for every row in the sheet XML, with every cell decoded
+
+        Values are raw: time fractions are not converted, but is_time tells
+        which cells openpyxl would read as a time. Used to snapshot whole
+        sheets (see xlsx_grid.py).
+        """
+        row_idx = 0
+        col_idx = 0
+        cells = []
+
+        with self.zip.open(self._sheet_paths[sheet_name]) as f:
+            for event, elem in iterparse(f, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == f'{NS_MAIN}row':
+                        r = elem.get('r')
+                        row_idx = int(r) if r else row_idx + 1
+                        col_idx = 0
+                        cells = []
+                    continue
+
+                if tag == f'{NS_MAIN}c':
+                    ref = elem.get('r')
+                    col_idx = column_index(ref) if ref else col_idx + 1
+                    value = self._cell_value(elem, False)
+                    cells.append((col_idx, value, self.is_time_cell(elem, value)))
+                    elem.clear()
+                elif tag == f'{NS_MAIN}row':
+                    yield row_idx, cells
+                    elem.clear()
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python3 xlsx_reader.py WORKBOOK.xlsx SHEET")
+        sys.exit(1)
+
+    with XlsxReader(sys.argv[1]) as book:
+        print(f"Sheets: {', '.join(book.sheetnames)}")
+        for row in book.iter_rows(sys.argv[2], columns=range(1, 28), time_columns=(3, 5, 10, 12, 17, 19, 24, 26)):
+            print(row)
+
+
+if __name__ == "__main__":
+    main()